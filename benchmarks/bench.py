@@ -0,0 +1,227 @@
+# benchmarks/bench.py
+
+"""
+Offline benchmark suite.
+
+Serves a corpus of Bulbapedia pages from a local stand-in server and times
+the scraping pipeline stage by stage. The corpus is either generated
+(see benchmarks/fixtures.py) or a real one recorded with `--archive`.
+
+    python -m benchmarks.bench [--corpus ARCHIVE] [--repeat N]
+                               [--output PATH] [--baseline PATH]
+
+Exits with status 1 when a stage exceeds benchmarks/thresholds.json or
+gets slower than the baseline results by more than --tolerance.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import build_corpus, load_archive
+from benchmarks.server import StandInServer
+from config.run_modes import crawl
+from utils.text_utils import count_words, update_wiki_dict
+from wiki.bulbapedia import BulbapediaClient
+
+THRESHOLDS_PATH = Path(__file__).with_name("thresholds.json")
+
+# pages timed one by one; the remaining stubs only feed the crawl
+_SAMPLE_STUBS = 20
+
+
+def measure(name, func, inputs, repeat, setup=None, size=len) -> dict:
+    """
+    Calls `func` on every input `repeat` times.
+    `setup` prepares a fresh argument outside of the timed region,
+    `size` gives the number of bytes an input stands for.
+    """
+
+    latencies = []
+    processed = 0
+
+    for _ in range(repeat):
+        for item in inputs:
+            arg = setup(item) if setup else item
+            start = time.perf_counter()
+            func(arg)
+            latencies.append(time.perf_counter() - start)
+            processed += size(item)
+
+    # memory is measured in a separate pass, tracing distorts timings
+    args = [setup(item) if setup else item for item in inputs]
+    tracemalloc.start()
+    for arg in args:
+        func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = np.array(latencies)
+    total = latencies.sum()
+    return {
+        "stage": name,
+        "calls": len(latencies),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 3),
+        "ops_per_s": round(len(latencies) / total, 1) if total else None,
+        "mb_per_s": round(processed / total / 2 ** 20, 2) if total else None,
+        "peak_mb": round(peak / 2 ** 20, 2),
+    }
+
+
+def run(corpus: dict[str, str], repeat: int) -> list[dict]:
+    stubs = [t for t, html in corpus.items() if len(html) < 8_000]
+    pages = [t for t in corpus if t not in stubs] + stubs[:_SAMPLE_STUBS]
+    html = {title: corpus[title] for title in pages}
+    results = []
+
+    with StandInServer(corpus) as server, \
+            BulbapediaClient(base_url=server.url) as client:
+
+        def parse(title):
+            return BeautifulSoup(html[title], "html.parser")
+
+        def size(title):
+            return len(html[title])
+
+        def with_title(title):
+            return title, parse(title)
+
+        texts = {}
+
+        def page_text(args):
+            title, soup = args
+            texts[title] = client.get_page_text(soup)
+
+        results.append(measure("search", client.search, pages, repeat, size=size))
+        results.append(measure("parse", parse, pages, repeat, size=size))
+        results.append(measure(
+            "get_page_text", page_text, pages, repeat,
+            setup=with_title, size=size
+        ))
+        results.append(measure(
+            "get_links", client.get_links, pages, repeat,
+            setup=parse, size=size
+        ))
+
+        with_tables = [
+            t for t in pages
+            if parse(t).select("#mw-content-text table:not(.navbox):not(.toc)")
+        ]
+        results.append(measure(
+            "get_tables", lambda soup: client.get_tables(soup, 0, True),
+            with_tables, repeat, setup=parse, size=size
+        ))
+
+        text_size = lambda t: len(texts[t])
+        results.append(measure(
+            "count_words", lambda t: count_words(texts[t]),
+            pages, repeat, size=text_size
+        ))
+
+        with tempfile.TemporaryDirectory() as workdir:
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                page_counts = {t: Counter(count_words(texts[t])) for t in pages}
+
+                results.append(measure(
+                    "update_wiki_dict",
+                    lambda t: update_wiki_dict(page_counts[t]),
+                    pages, repeat, size=text_size
+                ))
+
+                crawled = []
+
+                def crawl_run(seed):
+                    if os.path.exists("word-counts.json"):
+                        os.remove("word-counts.json")
+                    before = server.bytes_sent
+                    crawl(client, seed, 2, 0.0, max_pages=100)
+                    crawled.append(server.bytes_sent - before)
+
+                seed = "Team_Rocket" if "Team_Rocket" in corpus else pages[0]
+                results.append(measure(
+                    "crawl", crawl_run, [seed], repeat,
+                    size=lambda _: crawled[-1]
+                ))
+            finally:
+                os.chdir(cwd)
+
+    return results
+
+
+def check(results: list[dict], baseline: list[dict] | None, tolerance: float) -> list[str]:
+    with open(THRESHOLDS_PATH, "r", encoding="utf-8") as f:
+        thresholds = json.load(f)
+
+    previous = {r["stage"]: r for r in baseline or []}
+    failures = []
+
+    for result in results:
+        stage = result["stage"]
+        for key, limit in thresholds.get(stage, {}).items():
+            if result[key] > limit:
+                failures.append(f"{stage}: {key} {result[key]} > threshold {limit}")
+
+        old = previous.get(stage)
+        if old and result["p50_ms"] > old["p50_ms"] * (1 + tolerance):
+            failures.append(
+                f"{stage}: p50 {result['p50_ms']} ms, baseline {old['p50_ms']} ms"
+            )
+
+    return failures
+
+
+def report(results: list[dict]) -> str:
+    columns = ["stage", "calls", "p50_ms", "p95_ms", "p99_ms",
+               "ops_per_s", "mb_per_s", "peak_mb"]
+    lines = ["".join(f"{c:>14}" for c in columns)]
+    for r in results:
+        lines.append("".join(f"{str(r[c]):>14}" for c in columns))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="WikiScrapper offline benchmarks")
+    parser.add_argument("--corpus", metavar="ARCHIVE",
+                        help="Page archive recorded with --archive, generated if omitted")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", metavar="PATH", help="Saves results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Results of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed p50 slowdown relative to the baseline")
+    args = parser.parse_args()
+
+    corpus = load_archive(args.corpus) if args.corpus else build_corpus()
+    results = run(corpus, args.repeat)
+    print(report(results))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    failures = check(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# benchmarks/fixtures.py
+
+import random
+
+from wiki.archive import PageArchive
+
+TYPES = [
+    "Normal", "Fighting", "Flying", "Poison", "Ground", "Rock", "Bug",
+    "Ghost", "Steel", "Fire", "Water", "Grass", "Electric", "Psychic",
+    "Ice", "Dragon", "Dark", "Fairy"
+]
+
+_WORDS = (
+    "the of and to in a is that for it as was with be by on not he this "
+    "are or his from at which but have an they you were their one all we "
+    "pokémon trainer battle type move ability region gym leader evolves "
+    "rocket team giovanni jessie james meowth kanto johto hoenn sinnoh "
+    "islands league champion legendary attack defense special speed stats"
+).split()
+
+
+def _prose(rng: random.Random, sentences: int, links: list[str]) -> str:
+    out = []
+    for _ in range(sentences):
+        words = rng.choices(_WORDS, k=rng.randint(8, 24))
+        if links and rng.random() < 0.6:
+            title = rng.choice(links)
+            words[rng.randrange(len(words))] = (
+                f'<a href="/wiki/{title}" title="{title}">'
+                f'{title.replace("_", " ")}</a>'
+            )
+        sentence = " ".join(words)
+        out.append(sentence[:1].upper() + sentence[1:] + ".")
+    return " ".join(out)
+
+
+def _skeleton(title: str, content: str, revision: int) -> str:
+    """Wraps content in the parts of a MediaWiki page the scraper meets."""
+
+    navigation = "".join(
+        f'<li><a href="/wiki/{t}">{t}</a></li>' for t in TYPES
+    )
+    return (
+        f'<!DOCTYPE html><html><head><title>{title} - Bulbapedia</title>'
+        f'<script>RLCONF={{"wgPageName":"{title}",'
+        f'"wgRevisionId":{revision},"wgArticleId":{revision // 7}}};</script>'
+        f'<style>.mw-body{{margin:0}}</style></head><body>'
+        f'<div id="mw-head"><ul>{navigation}</ul>'
+        f'<a href="/wiki/Main_Page">Main Page</a>'
+        f'<a href="/w/index.php?title={title}&action=edit">Edit</a></div>'
+        f'<div id="content"><h1>{title.replace("_", " ")}</h1>'
+        f'<div id="mw-content-text"><div class="mw-parser-output">'
+        f'{content}</div></div></div>'
+        f'<div id="footer"><a href="/wiki/Bulbapedia:About">About</a></div>'
+        f'</body></html>'
+    )
+
+
+def _navbox(links: list[str]) -> str:
+    cells = "".join(f'<td><a href="/wiki/{t}">{t}</a></td>' for t in links)
+    return f'<table class="navbox"><tr>{cells}</tr></table>'
+
+
+def _infobox(title: str) -> str:
+    rows = "".join(
+        f'<tr><th>{key}</th><td><span>{value}</span></td></tr>'
+        for key, value in (("Name", title), ("Region", "Kanto"), ("Leader", "Giovanni"))
+    )
+    return f'<table class="infobox">{rows}</table>'
+
+
+def type_page(rng: random.Random) -> str:
+    """Article with two type charts using rowspan/colspan headers."""
+
+    header = (
+        '<tr><th rowspan="2" colspan="2">×</th>'
+        f'<th colspan="{len(TYPES)}">Defending type</th></tr><tr>'
+        + "".join(f'<th><a href="/wiki/{t}_(type)">{t}</a></th>' for t in TYPES)
+        + "</tr>"
+    )
+    rows = "".join(
+        "<tr>"
+        + (f'<th rowspan="{len(TYPES)}">Attacking&nbsp;type</th>' if i == 0 else "")
+        + f'<th><a href="/wiki/{t}_(type)">{t}</a></th>'
+        + "".join(f"<td>{rng.choice(['1×', '2×', '½×', '0×'])}</td>" for _ in TYPES)
+        + "</tr>"
+        for i, t in enumerate(TYPES)
+    )
+    listing = "".join(
+        f'<tr><td>{i + 1}</td><td><a href="/wiki/{t}_(type)">{t}</a></td>'
+        f'<td>{rng.randint(50, 200)}</td><td>{rng.choice(["Physical", "Special"])}</td></tr>'
+        for i, t in enumerate(TYPES + ["Stellar"] * 12)
+    )
+
+    links = [f"{t}_(type)" for t in TYPES]
+    return (
+        f"<p>{_prose(rng, 8, links)}</p>"
+        f'<div class="toc"><ul><li>Contents</li></ul></div>'
+        f"<table>{listing}</table>"
+        f"<p>{_prose(rng, 30, links)}</p>"
+        f"<table>{header}{rows}</table>"
+        f"<p>{_prose(rng, 30, links)}</p>"
+        + _navbox(links)
+    )
+
+
+def prose_page(rng: random.Random, title: str, links: list[str]) -> str:
+    """Long article, like Team Rocket: many paragraphs full of links."""
+
+    sections = "".join(
+        f'<h2><span class="mw-headline">Section {i}</span></h2>'
+        f"<p>{_prose(rng, rng.randint(5, 15), links)}<sup>[{i}]</sup></p>"
+        for i in range(120)
+    )
+    return f"{_infobox(title)}<p>{_prose(rng, 6, links)}</p>{sections}{_navbox(links[:40])}"
+
+
+def list_page(rng: random.Random, links: list[str]) -> str:
+    """List article linking to hundreds of Pokémon."""
+
+    rows = "".join(
+        f'<tr><td>#{i + 1:04d}</td><td><a href="/wiki/{title}">'
+        f'<img src="/media/{i}.png"></a></td>'
+        f'<td><a href="/wiki/{title}">{title.split("_")[0]}</a></td>'
+        f'<td><a href="/wiki/{rng.choice(TYPES)}_(type)">type</a></td></tr>'
+        for i, title in enumerate(links)
+    )
+    return f"<p>{_prose(rng, 4, links)}</p><table>{rows}</table>"
+
+
+def big_table_page(rng: random.Random, rows: int = 1500, cols: int = 12) -> str:
+    """Article dominated by one large data table."""
+
+    head = "<tr>" + "".join(f"<th>Col {c}</th>" for c in range(cols)) + "</tr>"
+    body = "".join(
+        "<tr>" + "".join(f"<td>{rng.randint(0, 999)}</td>" for _ in range(cols)) + "</tr>"
+        for _ in range(rows)
+    )
+    return f"<p>{_prose(rng, 3, [])}</p><table>{head}{body}</table>"
+
+
+def stub_page(rng: random.Random, links: list[str]) -> str:
+    return f"<p>{_prose(rng, rng.randint(2, 6), links)}</p>"
+
+
+def build_corpus(pokemon: int = 1000, seed: int = 0) -> dict[str, str]:
+    """
+    Deterministic corpus of Bulbapedia-like pages, title -> HTML.
+    Every linked title has a page, so crawls never hit missing articles.
+    """
+
+    rng = random.Random(seed)
+    species = [f"Pokemon{i:04d}_(Pokémon)" for i in range(pokemon)]
+    type_links = [f"{t}_(type)" for t in TYPES]
+    prose_links = species[:60] + type_links + ["Type", "Giovanni"]
+
+    contents = {
+        "Type": type_page(rng),
+        "Team_Rocket": prose_page(rng, "Team_Rocket", prose_links),
+        "Giovanni": prose_page(rng, "Giovanni", prose_links),
+        "List_of_Pokémon_by_National_Pokédex_number": list_page(rng, species),
+        "List_of_moves": big_table_page(rng),
+    }
+    for title in type_links + ["Stellar_(type)"]:
+        contents[title] = stub_page(rng, type_links + ["Type"])
+    for i, title in enumerate(species):
+        contents[title] = stub_page(rng, species[i + 1:i + 4] + ["Team_Rocket"])
+    for t in TYPES:
+        contents.setdefault(t, stub_page(rng, type_links))
+
+    return {
+        title: _skeleton(title, content, 1000 + i)
+        for i, (title, content) in enumerate(contents.items())
+    }
+
+
+def load_archive(path: str) -> dict[str, str]:
+    """Reads pages recorded by `--archive`, title -> HTML."""
+
+    with PageArchive(path, mode="r") as archive:
+        return {
+            url.rsplit("/wiki/", 1)[-1]: archive.read(url)
+            for url in archive.urls()
+        }
@@ -0,0 +1,67 @@
+# benchmarks/server.py
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+
+class StandInServer:
+    """
+    Local stand-in for Bulbapedia serving a fixed corpus at /wiki/<title>.
+    Unknown titles get a 404, like missing articles.
+    """
+
+    def __init__(self, corpus: dict[str, str]):
+        self.corpus = {
+            title: html.encode("utf-8") for title, html in corpus.items()
+        }
+        self.requests = 0
+        self.bytes_sent = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = unquote(urlsplit(self.path).path)
+                body = server.corpus.get(path.removeprefix("/wiki/"))
+                server.requests += 1
+
+                if not path.startswith("/wiki/") or body is None:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=UTF-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server.bytes_sent += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            daemon=True
+        )
+
+    def start(self) -> "StandInServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # ========================
+    # support for java-style
+    # "try with resources"
+    # ========================
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __enter__(self):
+        return self.start()
@@ -13,6 +13,89 @@ def validate_args(parser, args):
             parser.error(
                 "--analyze-relative-word-frequency requires --mode and --count options"
             )
+        if any(count < 1 for count in args.count):
+            parser.error("--count must be positive")
+        # wordfreq takes a while to import, only analyses need it
+        from wordfreq import available_languages
+
+        unsupported = set(args.lang) - set(available_languages())
+        if unsupported:
+            parser.error(
+                f"--lang languages not supported: {', '.join(sorted(unsupported))}"
+            )
+
+    if args.batch:
+        if args.batch_mode is None:
+            parser.error("--batch requires --batch-mode option")
+
+    if args.pages_top < 0:
+        parser.error("--pages-top can't be negative")
+
+    if args.workers < 1:
+        parser.error("--workers must be positive")
+
+    if args.recrawl:
+        if args.wait is None:
+            parser.error("--recrawl requires --wait option")
+
+    if args.max_pages is not None and args.max_pages < 1:
+        parser.error("--max-pages must be positive")
+
+    if args.profile_memory and not args.profile:
+        parser.error("--profile-memory requires --profile option")
+
+    if args.archive and args.replay:
+        parser.error("--archive and --replay can't be used together")
+
+    if args.missing_ttl < 0:
+        parser.error("--missing-ttl can't be negative")
+
+    if args.crawl_worker:
+        if args.coordinator is None:
+            parser.error("--crawl-worker requires --coordinator option")
+        if args.depth is None or args.wait is None:
+            parser.error("--crawl-worker requires --depth and --wait options")
+
+    if args.coordinator is not None and "://" in args.coordinator:
+        parser.error("--coordinator must be the path of an SQLite file")
+
+    if args.coordinator is not None and args.count_store != "json":
+        parser.error("--coordinator keeps the word counts, --count-store can't be used with it")
+
+    if args.rate_limit is not None and args.rate_limit <= 0:
+        parser.error("--rate-limit must be positive")
+
+    if args.lease_timeout <= 0:
+        parser.error("--lease-timeout must be positive")
+
+    if args.near_duplicates is not None:
+        if not args.dedup:
+            parser.error("--near-duplicates requires --dedup option")
+        if not 0 <= args.near_duplicates < 8:
+            parser.error("--near-duplicates must be between 0 and 7 bits")
+
+    if args.count_store == "sketch":
+        if args.recrawl:
+            parser.error("--recrawl requires exact counts, not --count-store sketch")
+        if args.analyze_relative_word_frequency:
+            if args.mode == "language":
+                parser.error(
+                    "--mode language ranks every stored word, not only the " +
+                    "top words of --count-store sketch")
+            if args.sketch_top is not None and max(args.count) > args.sketch_top:
+                parser.error("--count can't be larger than --sketch-top")
+    elif any(option is not None for option in (
+            args.sketch_error, args.sketch_delta, args.sketch_top)):
+        parser.error("--sketch-* options require --count-store sketch")
+
+    if args.sketch_error is not None and not 0 < args.sketch_error < 1:
+        parser.error("--sketch-error must be between 0 and 1")
+
+    if args.sketch_delta is not None and not 0 < args.sketch_delta < 1:
+        parser.error("--sketch-delta must be between 0 and 1")
+
+    if args.sketch_top is not None and args.sketch_top < 1:
+        parser.error("--sketch-top must be positive")
 
     if args.auto_count_words:
         if args.depth is None or args.wait is None:
@@ -58,7 +141,31 @@ def parse_args():
     mode.add_argument(
         "--auto-count-words",
         metavar="PHRASE",
-        help="Counts words in the searched and linked articles"
+        nargs="+",
+        help="Counts words in the searched and linked articles; seeds may " +
+             "also be article URLs of other MediaWiki sites, every wiki is " +
+             "then crawled in parallel"
+    )
+
+    mode.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Runs --batch-mode for every phrase listed in FILE, one per line " +
+             "('-' reads stdin), and saves the results to --output directory"
+    )
+
+    mode.add_argument(
+        "--recrawl",
+        metavar="GRAPH",
+        help="Refreshes word counts of a crawl saved with --link-graph, " +
+             "downloading only pages changed since"
+    )
+
+    mode.add_argument(
+        "--crawl-worker",
+        metavar="PHRASE",
+        help="Runs one worker of a crawl shared with other processes on " +
+             "this host through --coordinator; PHRASE seeds the shared frontier"
     )
 
     # ===== RELATED OPTIONS AND MODIFIERS =====
@@ -69,6 +176,34 @@ def parse_args():
         default=1
     )
 
+    parser.add_argument(
+        "--batch-mode",
+        choices=["summary", "table", "count-words"],
+        help="Mode applied to every phrase of --batch"
+    )
+
+    parser.add_argument(
+        "--output",
+        metavar="DIR",
+        default=".",
+        help="Directory for --batch results"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of concurrent page fetches, or of chart rendering " +
+             "processes for --analyze-relative-word-frequency"
+    )
+
+    parser.add_argument(
+        "--table-format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="File format of tables saved by --batch"
+    )
+
     parser.add_argument(
         "--first-row-is-header",
         action="store_true",
@@ -84,19 +219,47 @@ def parse_args():
     parser.add_argument(
         "--count",
         type=int,
-        help="Number of top words to include in analysis"
+        nargs="+",
+        metavar="N",
+        help="Number of top words to include in analysis; " +
+             "several numbers produce one analysis and chart each"
     )
 
     parser.add_argument(
         "--chart",
         metavar="PATH",
-        help="File path to produced chart"
+        help="File path to produced chart; with several --count numbers " +
+             "each chart's path is suffixed with _N"
+    )
+
+    parser.add_argument(
+        "--lang",
+        nargs="+",
+        default=["en"],
+        metavar="LANG",
+        help="Languages whose word frequencies the wiki counts are compared " +
+             "against, one analysis each; charts are suffixed with _LANG " +
+             "when several are given. Frequency tables are cached in the " +
+             "user cache directory, or in $WIKISCRAPPER_LANG_TABLES"
+    )
+
+    parser.add_argument(
+        "--chart-format",
+        choices=["png", "svg"],
+        default="png",
+        help="Image format of charts whose --chart path has no extension"
     )
 
     parser.add_argument(
         "--depth",
         type=int,
-        help="Depth of URL expansion"
+        help="Depth of URL expansion, 0 counts only the searched page"
+    )
+
+    parser.add_argument(
+        "--probe",
+        action="store_true",
+        help="Only checks existence of links beyond --depth instead of ignoring them"
     )
 
     parser.add_argument(
@@ -105,6 +268,213 @@ def parse_args():
         help="Timeout (sec)"
     )
 
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        metavar="N",
+        help="Maximal number of requests per second to each wiki of --auto-count-words"
+    )
+
+    parser.add_argument(
+        "--article-path",
+        default="/wiki/",
+        metavar="PATH",
+        help="Path of the articles of MediaWiki sites seeded by URL in --auto-count-words"
+    )
+
+    parser.add_argument(
+        "--api-path",
+        default="/w/api.php",
+        metavar="PATH",
+        help="Path of the API of MediaWiki sites seeded by URL in --auto-count-words"
+    )
+
+    parser.add_argument(
+        "--skip-namespace",
+        metavar="NAMESPACE",
+        action="append",
+        help="Skips links into NAMESPACE on MediaWiki sites seeded by URL (repeatable); " +
+             "without it, links to any title with a colon are skipped"
+    )
+
+    parser.add_argument(
+        "--frontier",
+        choices=["bfs", "priority"],
+        default="bfs",
+        help="Crawl order: plain BFS or best-first by in-links and vocabulary yield"
+    )
+
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        help="Maximal number of pages fetched by --auto-count-words"
+    )
+
+    parser.add_argument(
+        "--min-yield",
+        type=float,
+        help="Stops the crawl once the average share of new words per page drops below this value"
+    )
+
+    parser.add_argument(
+        "--title-penalty",
+        metavar="REGEX",
+        action="append",
+        help="Deprioritizes matching titles with --frontier priority (repeatable)"
+    )
+
+    parser.add_argument(
+        "--link-graph",
+        metavar="PATH",
+        help="Saves the crawled link graph with page revisions to .npz for --recrawl"
+    )
+
+    parser.add_argument(
+        "--pages-out",
+        metavar="PATH",
+        help="Streams one JSON record per crawled page to PATH (JSON Lines)"
+    )
+
+    parser.add_argument(
+        "--pages-top",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Most common words kept in --pages-out records, 0 keeps all word counts"
+    )
+
+    parser.add_argument(
+        "--doc-term-matrix",
+        metavar="PATH",
+        help="Saves per-page word counts of the crawl as a sparse CSR matrix (.npz)"
+    )
+
+    parser.add_argument(
+        "--coordinator",
+        metavar="PATH",
+        help="SQLite file with the shared frontier and word counts of " +
+             "--crawl-worker processes on one host (not on a network " +
+             "filesystem); other modes count into it and analyze its counts"
+    )
+
+    parser.add_argument(
+        "--lease-timeout",
+        type=float,
+        default=300.0,
+        metavar="SECONDS",
+        help="A page leased by a --crawl-worker and not counted within " +
+             "SECONDS is handed to another worker"
+    )
+
+    parser.add_argument(
+        "--dedup",
+        metavar="PATH",
+        help="Skips pages of --auto-count-words whose text duplicates an " +
+             "already counted page; fingerprints are kept in PATH (JSON) across runs"
+    )
+
+    parser.add_argument(
+        "--near-duplicates",
+        type=int,
+        metavar="BITS",
+        help="Also skips near-duplicate pages of --dedup whose SimHash " +
+             "fingerprints differ in at most BITS (0-7) bits"
+    )
+
+    parser.add_argument(
+        "--stats",
+        metavar="PATH",
+        help="Saves per-stage timings and counters of --auto-count-words as JSON"
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Serves OpenMetrics of --auto-count-words at http://127.0.0.1:PORT/metrics"
+    )
+
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Runs the selected mode under cProfile and writes the report to PATH"
+    )
+
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Adds top allocation sites traced with tracemalloc to the --profile report"
+    )
+
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=30,
+        help="Number of functions and allocation sites in the --profile report"
+    )
+
+    parser.add_argument(
+        "--archive",
+        metavar="PATH",
+        help="Appends raw HTML of every fetched page to a compressed archive"
+    )
+
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="Serves pages from an archive written with --archive, without network"
+    )
+
+    parser.add_argument(
+        "--title-cache",
+        metavar="PATH",
+        help="JSON cache of missing articles and redirect aliases, " +
+             "consulted before any request and updated by every run"
+    )
+
+    parser.add_argument(
+        "--missing-ttl",
+        type=float,
+        default=7.0,
+        metavar="DAYS",
+        help="Days a missing article stays in --title-cache"
+    )
+
+    parser.add_argument(
+        "--count-store",
+        choices=["json", "sqlite", "sketch"],
+        default="json",
+        help="Storage of word counts: exact counts in word-counts.json, " +
+             "exact counts in word-counts.sqlite3 (WAL mode, for several " +
+             "processes counting at once), or approximate counts in fixed " +
+             "memory (Count-Min sketch with Space-Saving top words) in " +
+             "word-counts.sketch.npz"
+    )
+
+    parser.add_argument(
+        "--sketch-error",
+        type=float,
+        metavar="EPS",
+        help="Sketch counts overestimate by at most EPS * total words " +
+             "(default 1e-5; the sketch takes about 150 / EPS bytes)"
+    )
+
+    parser.add_argument(
+        "--sketch-delta",
+        type=float,
+        metavar="P",
+        help="Probability of exceeding the --sketch-error bound (default 1e-3)"
+    )
+
+    parser.add_argument(
+        "--sketch-top",
+        type=int,
+        metavar="K",
+        help="Number of most frequent words tracked by the sketch, the " +
+             "largest --count it can analyze (default 1000, or the number " +
+             "an existing sketch file was built with)"
+    )
+
     args = parser.parse_args()
     validate_args(parser, args)
     return args
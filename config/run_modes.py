@@ -1,26 +1,78 @@
 # utils/run_modes.py
 
+import os
+import socket
+import sys
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from importlib.util import find_spec
+from urllib.parse import urlsplit
 
+from requests.adapters import HTTPAdapter
+
+from utils.coordinator import CrawlCoordinator
+from utils.count_store import (
+    BufferedCountStore,
+    CountStore,
+    JsonCountStore,
+    SynchronizedCountStore
+)
+from utils.doc_term import DocTermMatrix
+from utils.fingerprint import FingerprintIndex
+from utils.frontier import get_frontier
 from utils.graphic_utils import *
+from utils.jsonl import JsonlWriter
+from utils.link_graph import LinkGraph
+from utils.metrics import CrawlMetrics, MetricsServer
 from utils.path_utils import *
+from utils.stats import CrawlStats, timed
 from utils.text_utils import *
+from utils.vocabulary import Vocabulary
+from wiki.bulbapedia import BULBAPEDIA_URL
 from wiki.factory import get_wiki_client
+from wiki.title_cache import DEFAULT_MISSING_TTL
+
+# number of recent pages averaged for the vocabulary saturation check
+_YIELD_WINDOW = 20
 
 
-def handle_summary(phrase):
-    with get_wiki_client() as client:
-        summary = client.get_summary(
-            client.search(phrase))
+def handle_summary(
+    phrase,
+    archive=None,
+    replay=None,
+    title_cache=None,
+    missing_ttl=DEFAULT_MISSING_TTL
+):
+    with get_wiki_client(
+        archive=archive,
+        replay=replay,
+        title_cache=title_cache,
+        missing_ttl=missing_ttl
+    ) as client:
+        summary = client.search_summary(phrase)
         print(summary)
 
 
-def handle_table(phrase, number, header):
+def handle_table(
+    phrase,
+    number,
+    header,
+    archive=None,
+    replay=None,
+    title_cache=None,
+    missing_ttl=DEFAULT_MISSING_TTL
+):
     if number < 1:
         raise IndexError("Table number is 1-based")
 
-    with get_wiki_client() as client:
+    with get_wiki_client(
+        archive=archive,
+        replay=replay,
+        title_cache=title_cache,
+        missing_ttl=missing_ttl
+    ) as client:
         table: pd.DataFrame = client.get_tables(
             client.search(phrase),
             number - 1,
@@ -33,34 +85,270 @@ def handle_table(phrase, number, header):
         # table.to_csv(filename)
 
 
-def handle_count_words(phrase):
+def handle_count_words(
+    phrase,
+    archive=None,
+    replay=None,
+    title_cache=None,
+    missing_ttl=DEFAULT_MISSING_TTL,
+    store=None
+):
     # 1. Get text
-    with get_wiki_client() as client:
+    with get_wiki_client(
+        archive=archive,
+        replay=replay,
+        title_cache=title_cache,
+        missing_ttl=missing_ttl
+    ) as client:
         text: str = client.get_page_text(client.search(phrase))
 
     # 2. Count current words
     current_counts = Counter(count_words(text))
-    update_wiki_dict(current_counts)
+    update_wiki_dict(current_counts, store)
+
+
+def handle_batch(
+    path: str,
+    mode: str,
+    output: str = ".",
+    workers: int = 4,
+    number: int = 1,
+    header: bool = False,
+    table_format: str = "csv",
+    archive: str | None = None,
+    replay: str | None = None,
+    title_cache: str | None = None,
+    missing_ttl: float = DEFAULT_MISSING_TTL,
+    store: CountStore | None = None
+) -> None:
+    """
+    Runs `mode` ('summary', 'table' or 'count-words') for every phrase
+    listed in `path` (one per line, '-' reads stdin) through one client,
+    fetching `workers` pages concurrently. Results are streamed to
+    `output`: summaries.jsonl, one table file per phrase, or a single
+    merged word count update. Failed phrases are listed in errors.jsonl
+    without aborting the batch. Parquet tables need pyarrow or
+    fastparquet, checked before any page is fetched.
+    """
+
+    if mode not in ("summary", "table", "count-words"):
+        raise ValueError(
+            "The only supported batch modes are 'summary', 'table' and 'count-words'")
+
+    if workers < 1:
+        raise ValueError(f"Number of workers must be positive: {workers}")
+
+    if number < 1:
+        raise IndexError("Table number is 1-based")
+
+    if mode == "table" and table_format == "parquet" and \
+            find_spec("pyarrow") is None and find_spec("fastparquet") is None:
+        raise ImportError(
+            "Parquet tables require the 'pyarrow' or 'fastparquet' package")
+
+    phrases = _read_phrases(path)
+    os.makedirs(output, exist_ok=True)
+    merged_counts = Counter()
+    done = 0
+
+    with get_wiki_client(
+        archive=archive,
+        replay=replay,
+        title_cache=title_cache,
+        missing_ttl=missing_ttl
+    ) as client, \
+            JsonlWriter(os.path.join(output, "errors.jsonl")) as errors, \
+            (JsonlWriter(os.path.join(output, "summaries.jsonl"))
+             if mode == "summary" else nullcontext()) as summaries:
+
+        # replayed pages are read from the archive, without a session
+        if not replay:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+            client.session.mount("https://", adapter)
+            client.session.mount("http://", adapter)
+
+        # summaries are streamed, only up to their first paragraph
+        fetch = client.search_summary if mode == "summary" else client.search
+
+        for phrase, page, error in _search_concurrently(
+                fetch, phrases, workers):
+            try:
+                if error is not None:
+                    raise error
+
+                if mode == "summary":
+                    summaries.write({
+                        "phrase": phrase,
+                        "summary": page
+                    })
+                elif mode == "table":
+                    table = client.get_tables(page, number - 1, header)
+                    filename = os.path.join(
+                        output,
+                        f"{safe_filename(phrase)}_{number}.{table_format}"
+                    )
+                    if table_format == "parquet":
+                        table.to_parquet(filename)
+                    else:
+                        table.to_csv(filename, index=False)
+                else:
+                    merged_counts.update(
+                        count_words(client.get_page_text(page)))
+
+                done += 1
+            except Exception as exc:
+                errors.write({
+                    "phrase": phrase,
+                    "error": f"{type(exc).__name__}: {exc}"
+                })
+
+    if mode == "count-words":
+        update_wiki_dict(merged_counts, store)
+
+    print(
+        f"Processed {done} of {len(phrases)} phrases, "
+        f"{len(phrases) - done} failed (see errors.jsonl)"
+    )
+
+
+def _read_phrases(path: str) -> list[str]:
+    """Phrases listed one per line, skipping blank lines and # comments."""
+
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    return [
+        line.strip() for line in lines
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+
+def _search_concurrently(fetch, phrases: list[str], workers: int):
+    """
+    Yields (phrase, fetch(phrase), error) in input order while up to
+    `workers` fetches run in threads. At most 2 * `workers` results are
+    held at once.
+    """
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+
+        for phrase in phrases:
+            pending.append((phrase, pool.submit(fetch, phrase)))
+            if len(pending) >= 2 * workers:
+                yield _result_of(*pending.popleft())
+
+        while pending:
+            yield _result_of(*pending.popleft())
 
 
-def handle_analysis(mode, count, chart):
+def _result_of(phrase, future):
+    try:
+        return phrase, future.result(), None
+    except Exception as exc:
+        return phrase, None, exc
+
+
+def handle_analysis(
+    mode,
+    count,
+    chart,
+    chart_format="png",
+    workers=1,
+    langs=("en",),
+    store=None
+):
+    counts = [count] if isinstance(count, int) else list(count)
+    langs = [langs] if isinstance(langs, str) else list(langs)
+
     if mode == "article":
-        data = article_analysis(count)
+        analysis = article_analysis
     elif mode == "language":
-        data = language_analysis(count)
+        analysis = language_analysis
     else:
         raise ValueError(
             "The only supported analysis modes are 'article' and 'language'")
 
-    print(data)
-    if chart:
-        draw_chart(data, safe_filename(chart))
+    # stores listing only their top words can't rank by language frequency
+    limit = store.top_limit if store is not None else None
+    if limit is not None:
+        if mode == "language":
+            raise ValueError(
+                "Language analysis needs every stored word, not only the top ones")
+        if max(counts) > limit:
+            raise ValueError(
+                f"The count store only lists its top {limit} words: {max(counts)}")
+
+    charts = []
+    for lang in langs:
+        # top words of the largest count hold the top words of every smaller one
+        data = analysis(max(counts), lang, store)
+
+        for k in counts:
+            top = data.iloc[:k]
+            if len(langs) > 1:
+                print(f"[{lang}]")
+            print(top)
 
+            if chart:
+                stem, ext = os.path.splitext(safe_filename(chart))
+                suffix = "".join([
+                    f"_{lang}" if len(langs) > 1 else "",
+                    f"_{k}" if len(counts) > 1 else "",
+                ])
+                charts.append((top, f"{stem}{suffix}{ext}"))
 
-def handle_auto_count(phrase: str, depth: int, wait: float) -> None:
+    if charts:
+        ChartRenderer(chart_format).render_many(charts, workers)
+
+
+def handle_auto_count(
+    phrase: str | list[str],
+    depth: int,
+    wait: float,
+    archive: str | None = None,
+    replay: str | None = None,
+    title_cache: str | None = None,
+    missing_ttl: float = DEFAULT_MISSING_TTL,
+    frontier: str = "bfs",
+    max_pages: int | None = None,
+    min_yield: float | None = None,
+    title_penalties: list[str] | None = None,
+    probe: bool = False,
+    link_graph: str | None = None,
+    stats_path: str | None = None,
+    metrics_port: int | None = None,
+    pages_out: str | None = None,
+    pages_top: int = 20,
+    doc_term: str | None = None,
+    store: CountStore | None = None,
+    dedup: str | None = None,
+    near_duplicates: int | None = None,
+    rate_limit: float | None = None,
+    article_path: str = "/wiki/",
+    api_path: str = "/w/api.php",
+    skip_namespaces: list[str] | None = None
+) -> None:
     """
-    BFS traversal of Wikipedia article graph starting from `phrase`.
-    For each visited page, performs count_words(page_text).
+    Counts words in the article graph starting from `phrase`, see `crawl`.
+    Several seeds may be given, as phrases (Bulbapedia) or article URLs of
+    any MediaWiki site, whose articles are under `article_path`, API at
+    `api_path` and links into `skip_namespaces` are skipped (any title
+    with a colon if not given). Every wiki is crawled by a thread of its
+    own, with its own client, connection pool, `wait` between its pages
+    and `rate_limit` (requests per second), into the shared `store`; each
+    thread adds its counts to it in batches of pages. Live metrics of
+    several wikis are labelled by host.
+    When replaying from an archive, no waiting between pages is needed.
+    Progress is reported periodically; with `stats_path`, per-stage timings
+    and counters are saved there as JSON. With `metrics_port`, live metrics
+    are served at http://127.0.0.1:<port>/metrics during the crawl.
+    With `dedup`, pages duplicating another page's text (exactly, or within
+    `near_duplicates` SimHash bits) are skipped; their fingerprints are kept
+    in that JSON file across runs.
     """
 
     if depth < 0:
@@ -69,34 +357,515 @@ def handle_auto_count(phrase: str, depth: int, wait: float) -> None:
     if wait < 0:
         raise ValueError(f"Cant wait for negative time: {wait}")
 
-    visited: set[str] = set()
-    queue: deque[tuple[str, int]] = deque()
-    queue.append((phrase, 0))
-    visited.add(phrase)
+    if max_pages is not None and max_pages < 1:
+        raise ValueError(f"Page budget must be positive: {max_pages}")
+
+    seeds = _seeds_by_wiki([phrase] if isinstance(phrase, str) else phrase)
+    owned_store = None
+    if len(seeds) > 1:
+        # these write one file per crawl or key pages by title only
+        shared = {
+            "archive": archive, "replay": replay, "title_cache": title_cache,
+            "link_graph": link_graph, "pages_out": pages_out,
+            "doc_term": doc_term, "dedup": dedup,
+        }
+        used = [name for name, value in shared.items() if value]
+        if used:
+            raise ValueError(
+                f"Seeds of several wikis can't be crawled with: {', '.join(used)}")
+        if store is None:
+            store = owned_store = JsonCountStore()
+        store = SynchronizedCountStore(store)
+
+    metrics = CrawlMetrics() if metrics_port is not None else None
+    stats = {
+        wiki: CrawlStats(
+            metrics=metrics,
+            labels={"host": _wiki_host(wiki)} if len(seeds) > 1 else None
+        )
+        for wiki in seeds
+    }
+    server = MetricsServer(metrics, metrics_port).start() if metrics else None
+
+    def crawl_wiki(wiki: str) -> int:
+        with get_wiki_client(
+            wiki=wiki,
+            archive=archive,
+            replay=replay,
+            title_cache=title_cache,
+            missing_ttl=missing_ttl,
+            rate_limit=rate_limit,
+            article_path=article_path,
+            api_path=api_path,
+            skip_namespaces=skip_namespaces
+        ) as client, \
+                (FingerprintIndex(dedup, near_duplicates)
+                 if dedup else nullcontext()) as fingerprints, \
+                (BufferedCountStore(store)
+                 if len(seeds) > 1 else nullcontext(store)) as wiki_store:
+            client.stats = stats[wiki]
+            return crawl(
+                client,
+                seeds[wiki],
+                depth,
+                0.0 if replay else wait,
+                frontier=frontier,
+                max_pages=max_pages,
+                min_yield=min_yield,
+                title_penalties=title_penalties,
+                probe=probe,
+                link_graph=link_graph,
+                stats=stats[wiki],
+                pages_out=pages_out,
+                pages_top=pages_top,
+                doc_term=doc_term,
+                store=wiki_store,
+                fingerprints=fingerprints
+            )
+
+    try:
+        if len(seeds) == 1:
+            crawl_wiki(next(iter(seeds)))
+        else:
+            with ThreadPoolExecutor(max_workers=len(seeds)) as pool:
+                for future in [pool.submit(crawl_wiki, wiki) for wiki in seeds]:
+                    future.result()
+    finally:
+        if server is not None:
+            server.stop()
+        if owned_store is not None:
+            owned_store.close()
+
+    for wiki, wiki_stats in stats.items():
+        if len(stats) == 1:
+            print(wiki_stats.progress_line(), file=wiki_stats.out)
+            if stats_path:
+                wiki_stats.save(stats_path)
+            continue
+
+        host = _wiki_host(wiki)
+        print(f"[{host}] {wiki_stats.progress_line()}", file=wiki_stats.out)
+        if stats_path:
+            stem, ext = os.path.splitext(stats_path)
+            wiki_stats.save(f"{stem}_{safe_filename(host)}{ext}")
+
+
+def _wiki_host(wiki: str) -> str:
+    """Host of a wiki base URL, 'bulbapedia' as is."""
+    return urlsplit(wiki).netloc or wiki
+
 
-    with get_wiki_client() as client:
+def _seeds_by_wiki(phrases: list[str]) -> dict[str, list[str]]:
+    """
+    Groups crawl seeds by wiki: article URLs by the base URL of their
+    host, other phrases (and Bulbapedia URLs) under 'bulbapedia'.
+    """
+
+    bulbapedia_host = urlsplit(BULBAPEDIA_URL).netloc
+    seeds: dict[str, list[str]] = {}
+
+    for phrase in phrases:
+        url = urlsplit(phrase.strip())
+        host = url.netloc.lower().removeprefix("www.")
+        if url.scheme in ("http", "https") and host and host != bulbapedia_host:
+            wiki = f"{url.scheme}://{url.netloc}"
+        else:
+            wiki = "bulbapedia"
+        seeds.setdefault(wiki, []).append(phrase)
+
+    return seeds
+
+
+def wiki_urls(phrases: list[str]) -> list[str]:
+    """Base URLs of the wikis crawled from the seeds `phrases`."""
+    return [
+        BULBAPEDIA_URL if wiki == "bulbapedia" else wiki
+        for wiki in _seeds_by_wiki(phrases)
+    ]
+
+
+def crawl(
+    client,
+    phrase: str | list[str],
+    depth: int,
+    wait: float,
+    frontier: str = "bfs",
+    max_pages: int | None = None,
+    min_yield: float | None = None,
+    title_penalties: list[str] | None = None,
+    probe: bool = False,
+    link_graph: str | None = None,
+    stats: CrawlStats | None = None,
+    pages_out: str | None = None,
+    pages_top: int = 20,
+    doc_term: str | None = None,
+    store: CountStore | None = None,
+    fingerprints: FingerprintIndex | None = None
+) -> int:
+    """
+    Traversal of Wikipedia article graph starting from `phrase`, or from
+    every phrase of a list.
+    For each visited page, performs count_words(page_text).
+    Pages up to `depth` links away are fetched (fetch horizon), links are
+    expanded only on pages closer than `depth` (expand horizon). With
+    `probe`, links of the last fetched layer are only checked for
+    existence, in batched API queries, and never downloaded; links to
+    missing articles are then left out of the link graph, and with a
+    title cache the misses are remembered for later crawls.
+    With `link_graph`, the crawled graph, page revisions and per-page counts
+    are saved there for a later `handle_recrawl`.
+    The visiting order is decided by the `frontier` scheduler
+    ('bfs' or 'priority'). The crawl stops after `max_pages` pages, or once
+    the average share of new vocabulary over the last pages drops below
+    `min_yield`.
+    Links to missing articles are skipped and counted as 'missing' in
+    `stats`, with or without a title cache, which only spares requesting
+    them again in later crawls; a missing seed raises LookupError.
+    Links are scheduled under their canonical URL, so aliases known to the client's title cache to
+    redirect are not fetched next to their target.
+    Stages of the pipeline are timed into `stats`, if given.
+    With `pages_out`, one JSON record per page (URL, depth, fetch time,
+    token totals and the `pages_top` most common words, or all word counts
+    for 0) is streamed to that JSONL file while crawling.
+    With `doc_term`, per-page counts are also collected into a sparse
+    document-term matrix saved there as `.npz`.
+    Word counts are added to `store`, word-counts.json by default.
+    With `fingerprints`, pages whose cleaned text duplicates a page of
+    another URL are skipped before counting, links included.
+    Returns the number of fetched pages.
+    """
+
+    queue = get_frontier(
+        frontier,
+        {pattern: 10.0 for pattern in title_penalties or []},
+        article_path=client.article_path
+    )
+    # seeds are scheduled under their canonical URL, like the links to them
+    for seed in [phrase] if isinstance(phrase, str) else phrase:
+        queue.add(client.article_url(seed), 0)
+
+    graph = LinkGraph() if link_graph else None
+    matrix = DocTermMatrix() if doc_term else None
+    vocabulary = Vocabulary()
+    beyond_horizon: set[str] = set()
+    recent_yields: deque[float] = deque(maxlen=_YIELD_WINDOW)
+    fetched = 0
+
+    with (JsonlWriter(pages_out) if pages_out else nullcontext()) as records, \
+            (JsonCountStore() if store is None else nullcontext(store)) as store:
         while queue:
-            current_phrase, current_depth = queue.popleft()
+            if max_pages is not None and fetched >= max_pages:
+                break
 
-            # --- fetch page ---
-            page = client.search(current_phrase)
-            page_text = client.get_page_text(page)
-            counts = Counter(count_words(page_text))
-            update_wiki_dict(counts)
+            current_phrase, current_depth = queue.pop()
 
-            # --- depth limit ---
-            if current_depth > depth:
+            # --- fetch page ---
+            fetch_start = time.perf_counter()
+            try:
+                page = client.search(current_phrase)
+            except LookupError:
+                if current_depth == 0:
+                    raise
+                # dead link; with a title cache it's never requested again
+                if stats is not None:
+                    stats.count("missing")
                 continue
+            fetch_time = time.perf_counter() - fetch_start
+
+            # a redirect alias was fetched, its target mustn't be fetched again
+            url = client.article_url(current_phrase)
+            queue.seen.add(url)
+
+            # links are read first, as text cleanup unwraps the <a> tags
+            expand = current_depth < depth
+            with timed(stats, "links"):
+                links = (
+                    client.get_links(page) if expand or probe or graph is not None else []
+                )
+                revision = client.get_revision(page) if graph is not None else None
+
+            with timed(stats, "clean"):
+                page_text = client.get_page_text(page)
+
+            if fingerprints is not None:
+                with timed(stats, "dedup"):
+                    duplicate_of = fingerprints.check(url, page_text)
+
+                if duplicate_of is not None:
+                    fetched += 1
+                    if stats is not None:
+                        stats.count("duplicates")
+                    if wait:
+                        with timed(stats, "wait"):
+                            time.sleep(wait)
+                    continue
+
+            with timed(stats, "count"):
+                counts = Counter(count_words(page_text))
+
+            with timed(stats, "persist"):
+                update_wiki_dict(counts, store)
+
+            # --- vocabulary growth ---
+            known = len(vocabulary)
+            vocabulary.update(counts)
+            new_words = len(vocabulary) - known
+            page_yield = new_words / len(counts) if counts else 0.0
+            recent_yields.append(page_yield)
+
+            fetched += 1
+            if matrix is not None:
+                matrix.add_document(url, counts)
+
+            if records is not None:
+                records.write(_page_record(
+                    url,
+                    current_depth,
+                    fetch_time,
+                    counts,
+                    pages_top
+                ))
+
+            if stats is not None:
+                stats.count("pages")
+                stats.count("words", sum(counts.values()))
+                stats.gauge("queue", len(queue))
+                stats.gauge("visited", len(queue.seen))
+                stats.gauge("vocabulary", len(vocabulary))
+                stats.tick()
+
+            if graph is not None:
+                graph.add_page(
+                    url,
+                    links,
+                    revision,
+                    counts
+                )
+
+            if (
+                min_yield is not None
+                and len(recent_yields) == recent_yields.maxlen
+                and sum(recent_yields) / len(recent_yields) < min_yield
+            ):
+                break
 
             # --- wait before next network request ---
-            time.sleep(wait)
+            if wait:
+                with timed(stats, "wait"):
+                    time.sleep(wait)
 
-            # --- fetch links ---
-            links = client.get_links(page)
+            # --- expand horizon ---
+            if not expand:
+                beyond_horizon.update(links)
+                continue
 
             for link_phrase in links:
-                if link_phrase in visited:
-                    continue
+                queue.add(
+                    client.article_url(link_phrase),
+                    current_depth + 1,
+                    page_yield
+                )
+
+    if probe:
+        beyond_horizon -= queue.seen
+        existing = client.probe(list(beyond_horizon))
+        print(
+            f"Probed {len(existing)} links beyond depth {depth}, "
+            f"{sum(existing.values())} of them exist"
+        )
+        if graph is not None:
+            graph.drop_links(url for url, exists in existing.items() if not exists)
+
+    if graph is not None:
+        graph.save(link_graph)
+
+    if matrix is not None:
+        matrix.save(doc_term)
+
+    return fetched
+
+
+def handle_crawl_worker(
+    phrase: str,
+    depth: int,
+    wait: float,
+    coordinator: CrawlCoordinator,
+    archive: str | None = None,
+    replay: str | None = None,
+    title_cache: str | None = None,
+    missing_ttl: float = DEFAULT_MISSING_TTL,
+    max_pages: int | None = None,
+    stats_path: str | None = None,
+    poll: float = 1.0
+) -> int:
+    """
+    One worker of a crawl shared through `coordinator` by any number of
+    processes on one host. `phrase` seeds the shared frontier; seeds
+    already seen are ignored, so every worker may be started with the same
+    one. Pages are leased one at a time, shallowest first, up to `depth`
+    links from the seed, and their counts and links are pushed back to
+    the coordinator, which counts each page exactly once.
+    The worker stops after `max_pages` counted pages or once no URL is
+    queued or leased by anyone; while other workers still hold leases, it
+    polls every `poll` seconds. Returns the number of pages it counted.
+    """
+
+    if depth < 0:
+        raise ValueError(f"Can't travel negative path length: {depth}")
+
+    if wait < 0:
+        raise ValueError(f"Cant wait for negative time: {wait}")
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    stats = CrawlStats()
+    counted = 0
+
+    with get_wiki_client(
+        archive=archive,
+        replay=replay,
+        title_cache=title_cache,
+        missing_ttl=missing_ttl
+    ) as client:
+        client.stats = stats
+        coordinator.schedule([client.article_url(phrase)], 0)
+
+        while max_pages is None or counted < max_pages:
+            leased = coordinator.lease(worker)
+            if not leased:
+                if not coordinator.pending():
+                    break
+                # pages leased by other workers may still add links
+                time.sleep(poll)
+                continue
+
+            url, current_depth = leased[0]
+            try:
+                page = client.search(url)
+            except LookupError:
+                coordinator.complete(worker, url, {})
+                stats.count("missing")
+                continue
+            except ConnectionError:
+                coordinator.release(worker, url)
+                raise
+
+            # links are read first, as text cleanup unwraps the <a> tags
+            with timed(stats, "links"):
+                links = [
+                    client.article_url(link) for link in client.get_links(page)
+                ] if current_depth < depth else []
+
+            with timed(stats, "clean"):
+                page_text = client.get_page_text(page)
+
+            with timed(stats, "count"):
+                counts = Counter(count_words(page_text))
+
+            with timed(stats, "persist"):
+                completed = coordinator.complete(
+                    worker, url, counts, links, current_depth + 1)
+
+            if completed:
+                counted += 1
+                stats.count("pages")
+                stats.count("words", sum(counts.values()))
+            else:
+                # the lease expired and the page went to another worker
+                stats.count("lost_leases")
+            stats.tick()
+
+            if wait and not replay:
+                with timed(stats, "wait"):
+                    time.sleep(wait)
+
+    print(stats.progress_line(), file=stats.out)
+    if stats_path:
+        stats.save(stats_path)
+
+    return counted
+
+
+def _page_record(
+    url: str,
+    depth: int,
+    fetch_time: float,
+    counts: Counter,
+    top: int
+) -> dict:
+    record = {
+        "url": url,
+        "depth": depth,
+        "fetched_at": round(time.time(), 3),
+        "fetch_time": round(fetch_time, 4),
+        "tokens": sum(counts.values()),
+        "distinct": len(counts),
+    }
+    if top:
+        record["top"] = counts.most_common(top)
+    else:
+        record["counts"] = dict(counts)
+
+    return record
+
+
+def handle_recrawl(
+    link_graph: str,
+    wait: float,
+    archive: str | None = None,
+    replay: str | None = None,
+    title_cache: str | None = None,
+    missing_ttl: float = DEFAULT_MISSING_TTL,
+    store: CountStore | None = None
+) -> None:
+    """
+    Incremental recrawl of a graph saved by `handle_auto_count`.
+    Current revisions are compared in batched API queries; only changed
+    pages are downloaded again, their old counts are subtracted and the new
+    ones added to the stored word counts.
+    Changed pages keep their new links in the graph, but articles they
+    newly link to are not fetched; a new crawl is needed to count those.
+    """
+
+    if wait < 0:
+        raise ValueError(f"Cant wait for negative time: {wait}")
+
+    graph = LinkGraph.load(link_graph)
+    urls = graph.fetched()
+
+    with get_wiki_client(
+        archive=archive,
+        replay=replay,
+        title_cache=title_cache,
+        missing_ttl=missing_ttl
+    ) as client:
+        revisions = client.get_revisions(urls)
+        changed = [
+            url for url in urls
+            if revisions[url] is None or revisions[url] != graph.revision(url)
+        ]
+
+        for url in changed:
+            delta = Counter()
+            delta.subtract(graph.page_counts(url))
+
+            try:
+                page = client.search(url)
+            except LookupError:
+                # article was deleted, only its old counts are removed
+                update_wiki_dict(delta, store)
+                graph.add_page(url, [], revisions[url])
+                continue
+
+            links = client.get_links(page)
+            revision = client.get_revision(page) or revisions[url]
+            counts = Counter(count_words(client.get_page_text(page)))
+
+            delta.update(counts)
+            update_wiki_dict(delta, store)
+            graph.add_page(url, links, revision, counts)
+
+            if not replay:
+                time.sleep(wait)
 
-                visited.add(link_phrase)
-                queue.append((link_phrase, current_depth + 1))
+    graph.save(link_graph)
+    print(f"Recrawled {len(changed)} of {len(urls)} pages")
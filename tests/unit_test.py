@@ -1,13 +1,77 @@
 # tests/test_bulbapedia.py
 
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import time
 import unittest
-from unittest.mock import Mock, patch
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from importlib.util import find_spec
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
+from wordfreq import zipf_frequency
 
+from benchmarks.server import StandInServer
+from config.run_modes import (
+    _page_record,
+    _seeds_by_wiki,
+    crawl,
+    handle_analysis,
+    handle_auto_count,
+    handle_batch,
+    handle_crawl_worker,
+    handle_recrawl,
+    wiki_urls,
+)
+from utils.coordinator import SqliteCoordinator, get_coordinator
+from utils.count_store import (
+    BufferedCountStore,
+    JsonCountStore,
+    SqliteCountStore,
+    SynchronizedCountStore
+)
+from utils.doc_term import DocTermMatrix
+from utils.fingerprint import FingerprintIndex, simhash
+from utils.frontier import FifoFrontier, PriorityFrontier
+from utils.graphic_utils import ChartRenderer
+from utils.jsonl import JsonlWriter
+from utils.lang_tables import LanguageTable, get_language_table
+from utils.link_graph import LinkGraph
+from utils.metrics import CrawlMetrics, MetricsServer
+from utils.profiling import profiled
+from utils.sketch import CountMinSketch, SketchCountStore, SpaceSaving
+from utils.stats import CrawlStats
+from utils.text_utils import (
+    article_analysis,
+    count_words,
+    lang_confidence_score,
+    lang_confidence_scores,
+    update_wiki_dict,
+)
+from utils.vocabulary import Vocabulary
+from wiki.archive import PageArchive
+from wiki.async_bulbapedia import BACKENDS, AsyncBulbapediaClient
 from wiki.bulbapedia import BulbapediaClient, Cell
+from wiki.factory import get_wiki_client
+from wiki.mediawiki import MediaWikiClient
+from wiki.replay import ReplayClient
+from wiki.title_cache import TitleCache
+
+
+def _count_into_store(kind: str, path: str, worker: int) -> None:
+    # every JSON update is written, so the processes contend for the file lock
+    store = JsonCountStore(path, flush_every=1) if kind == "json" else SqliteCountStore(path)
+    with store:
+        for _ in range(25):
+            store.update(Counter({"shared": 1, f"worker{worker}": 2}))
 
 
 class BulbapediaUnitTests(unittest.TestCase):
@@ -117,7 +181,7 @@ class BulbapediaUnitTests(unittest.TestCase):
 
     # 8 sprawdza czy dobrze budowany jest url z podanej frazy
     def test_build_article_url_from_query(self):
-        url = self.client._BulbapediaClient__build_article_url("Mr Mime")
+        url = self.client._MediaWikiClient__build_article_url("Mr Mime")
         self.assertEqual(
             url,
             "https://bulbapedia.bulbagarden.net/wiki/Mr_Mime"
@@ -126,7 +190,7 @@ class BulbapediaUnitTests(unittest.TestCase):
     # 9 sprawda czy popranie buduje się linki do chodzenia po grafie
     def test_build_article_url_passthrough(self):
         url = "https://bulbapedia.bulbagarden.net/wiki/Pikachu"
-        result = self.client._BulbapediaClient__build_article_url(url)
+        result = self.client._MediaWikiClient__build_article_url(url)
         self.assertEqual(result, url)
 
     # 10 pusta strona
@@ -137,7 +201,7 @@ class BulbapediaUnitTests(unittest.TestCase):
         </div>
         """
         soup = BeautifulSoup(html, "html.parser")
-        missing = self.client._BulbapediaClient__is_missing_article(soup)
+        missing = self.client._MediaWikiClient__is_missing_article(soup)
 
         self.assertTrue(missing)
 
@@ -153,6 +217,1295 @@ class BulbapediaUnitTests(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual([c.value for c in result[0]], ["B", "C"])
 
+    # 12 strony pobrane przez search trafiaja do archiwum i sa z niego odtwarzane
+    @patch.object(requests.Session, "get")
+    def test_archive_replay_roundtrip(self, mock_get):
+        html = """
+        <div id="mw-content-text"><p>Pikachu is an Electric-type.</p></div>
+        """
+        mock_get.return_value = Mock(status_code=200, text=html)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pages.gz")
+
+            with BulbapediaClient(archive=PageArchive(path)) as client:
+                client.search("Pikachu")
+
+            with ReplayClient(path) as replay:
+                summary = replay.get_summary(replay.search("Pikachu"))
+
+                with self.assertRaises(LookupError):
+                    replay.search("Eevee")
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(summary, "Pikachu is an Electric-type.")
+
+    # 13 sprawdzanie istnienia artykulow bez pobierania ich tresci
+    @patch.object(requests.Session, "get")
+    def test_probe_uses_batched_api(self, mock_get):
+        mock_get.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"query": {
+                "normalized": [{"from": "pikachu", "to": "Pikachu"}],
+                "pages": {
+                    "25": {"title": "Pikachu"},
+                    "-1": {"title": "Missingno page", "missing": ""},
+                },
+            }}),
+        )
+
+        result = self.client.probe([
+            "pikachu",
+            "Pikachu",
+            "https://bulbapedia.bulbagarden.net/wiki/Missingno_page",
+        ])
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(result, {
+            "pikachu": True,
+            "Pikachu": True,
+            "https://bulbapedia.bulbagarden.net/wiki/Missingno_page": False,
+        })
+
+    # 14 linki tylko z tresci artykulu, deduplikowane po kanonicznym tytule
+    def test_iter_links_content_only_canonical(self):
+        html = """
+        <div id="mw-head"><a href="/wiki/Sidebar">menu</a></div>
+        <div id="mw-content-text">
+            <a href="/wiki/mr._Mime">a</a>
+            <a href="https://bulbapedia.bulbagarden.net/wiki/Mr._Mime">b</a>
+            <a href="/wiki/Pok%C3%A9mon">c</a>
+            <a href="/wiki/Eevee#Biology">bad</a>
+            <a href="/w/index.php?title=Eevee">bad</a>
+        </div>
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        links = self.client.iter_links(soup)
+
+        self.assertNotIsInstance(links, list)
+        self.assertEqual(
+            list(links),
+            [
+                "https://bulbapedia.bulbagarden.net/wiki/Mr._Mime",
+                "https://bulbapedia.bulbagarden.net/wiki/Pokémon",
+            ],
+        )
+
+    # 15 streszczenie pobierane strumieniowo, pobieranie konczy sie po pierwszym akapicie
+    @patch.object(requests.Session, "get")
+    def test_search_summary_stops_after_first_paragraph(self, mock_get):
+        head = (
+            '<div id="mw-content-text"><table><tr><td>x</td></tr></table>'
+            '<p>Pikachu is an <a href="/wiki/Electric">Electric</a>-type '
+            'Pokémon &amp; mascot. It evolves.</p>'
+        ).encode("utf-8")
+        chunks = [head[i:i + 7] for i in range(0, len(head), 7)]
+        chunks += [b"<p>Tail paragraph.</p>"] * 1000 + [b"</div>"]
+
+        read = []
+        response = Mock(status_code=200, encoding="utf-8")
+        response.__enter__ = Mock(return_value=response)
+        response.__exit__ = Mock(return_value=False)
+        response.iter_content = lambda size: (read.append(c) or c for c in chunks)
+        mock_get.return_value = response
+
+        summary = self.client.search_summary("Pikachu")
+        full = self.client.get_summary(
+            BeautifulSoup(b"".join(chunks).decode("utf-8"), "html.parser"))
+
+        self.assertEqual(summary, full)
+        self.assertEqual(summary, "Pikachu is an Electric-type Pokémon & mascot.\nIt evolves.")
+        self.assertLess(len(read), len(chunks) - 999)
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+
+    # 16 znane braki i przekierowania z cache tytulow omijaja siec
+    @patch.object(requests.Session, "get")
+    def test_title_cache_skips_known_misses_and_aliases(self, mock_get):
+        html = """
+        <link rel="canonical" href="https://bulbapedia.bulbagarden.net/wiki/Mr._Mime">
+        <div id="mw-content-text"><p>Mr. Mime.</p></div>
+        """
+        mock_get.side_effect = lambda url, **kwargs: (
+            Mock(status_code=404, text="") if url.endswith("Nope")
+            else Mock(status_code=200, text=html)
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "titles.json")
+
+            with BulbapediaClient(cache=TitleCache(path)) as client:
+                client.search("Mr Mime")
+                with self.assertRaises(LookupError):
+                    client.search("Nope")
+
+            with BulbapediaClient(cache=TitleCache(path)) as client:
+                client.search("Mr Mime")
+                with self.assertRaises(LookupError):
+                    client.search("Nope")
+
+        self.assertEqual(
+            [call.args[0] for call in mock_get.call_args_list],
+            [
+                "https://bulbapedia.bulbagarden.net/wiki/Mr_Mime",
+                "https://bulbapedia.bulbagarden.net/wiki/Nope",
+                "https://bulbapedia.bulbagarden.net/wiki/Mr._Mime",
+            ],
+        )
+
+    # 17 archiwum przerwanego crawla (bez close) da sie odtworzyc z logu indeksu
+    @patch.object(requests.Session, "get")
+    def test_archive_survives_interrupted_crawl(self, mock_get):
+        mock_get.side_effect = lambda url, **kwargs: Mock(
+            status_code=200,
+            text=f'<div id="mw-content-text"><p>{url.rsplit("/", 1)[-1]}.</p></div>'
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pages.gz")
+
+            archive = PageArchive(path)
+            client = BulbapediaClient(archive=archive)
+            client.search("Pikachu")
+            client.search("Eevee")
+            self.assertFalse(os.path.exists(archive.index_path))
+
+            with ReplayClient(path) as replay:
+                summary = replay.get_summary(replay.search("Eevee"))
+                self.assertIsNone(replay._session)
+
+            archive.close()
+            self.assertFalse(os.path.exists(archive.log_path))
+            with PageArchive(path, mode="r") as stored:
+                self.assertListEqual(stored.urls(), [
+                    "https://bulbapedia.bulbagarden.net/wiki/Pikachu",
+                    "https://bulbapedia.bulbagarden.net/wiki/Eevee",
+                ])
+
+        self.assertEqual(summary, "Eevee.")
+
+    # 18 rewizja aliasu to rewizja artykulu, na ktory przekierowuje
+    @patch.object(requests.Session, "get")
+    def test_revisions_follow_redirects(self, mock_get):
+        mock_get.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"query": {
+                "normalized": [{"from": "pikachu (Pokemon)", "to": "Pikachu (Pokemon)"}],
+                "redirects": [{"from": "Pikachu (Pokemon)", "to": "Pikachu (Pokémon)"}],
+                "pages": {"25": {
+                    "title": "Pikachu (Pokémon)",
+                    "revisions": [{"revid": 4242}],
+                }},
+            }}),
+        )
+        self.client.cache = TitleCache()
+
+        revisions = self.client.get_revisions([
+            "https://bulbapedia.bulbagarden.net/wiki/pikachu_(Pokemon)",
+        ])
+
+        self.assertEqual(mock_get.call_args.kwargs["params"]["redirects"], 1)
+        self.assertEqual(revisions, {
+            "https://bulbapedia.bulbagarden.net/wiki/pikachu_(Pokemon)": 4242,
+        })
+        self.assertEqual(
+            self.client.cache.resolve("Pikachu_(Pokemon)"), "Pikachu_(Pokémon)")
+
+
+class TitleCacheUnitTests(unittest.TestCase):
+
+    # 1. misses expire after the TTL
+    def test_missing_expires(self):
+        cache = TitleCache(ttl=60)
+        cache.add_missing("Nope")
+
+        self.assertTrue(cache.is_missing("Nope"))
+        with patch("wiki.title_cache.time.time", return_value=time.time() + 61):
+            self.assertFalse(cache.is_missing("Nope"))
+        self.assertFalse(cache.is_missing("Nope"))
+
+    # 2. chained redirects resolve to the final title, loops terminate
+    def test_resolve_chains_and_loops(self):
+        cache = TitleCache()
+        cache.add_redirect("A", "B")
+        cache.add_redirect("B", "C")
+        cache.add_redirect("X", "Y")
+        cache.add_redirect("Y", "X")
+
+        self.assertEqual(cache.resolve("A"), "C")
+        self.assertEqual(cache.resolve("C"), "C")
+        self.assertIn(cache.resolve("X"), ("X", "Y"))
+
+
+class BatchUnitTests(unittest.TestCase):
+
+    # 1. JSONL writer buffers records and writes one object per line
+    def test_jsonl_writer_buffers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.jsonl")
+
+            with JsonlWriter(path, buffer_size=2) as writer:
+                writer.write({"a": 1})
+                self.assertEqual(writer.written, 0)
+                writer.write({"b": "ą"})
+                self.assertEqual(writer.written, 2)
+                writer.write({"c": 3})
+
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(lines, ['{"a": 1}', '{"b": "ą"}', '{"c": 3}'])
+
+    # 2. batch of tables: one file per phrase, failures go to the error report
+    @patch.object(requests.Session, "get")
+    def test_batch_tables_and_errors(self, mock_get):
+        page = Mock(status_code=200, text="""
+        <div id="mw-content-text">
+            <table><tr><th>X</th></tr><tr><td>1</td></tr></table>
+        </div>
+        """)
+        mock_get.side_effect = lambda url, **kwargs: (
+            Mock(status_code=404, text="") if url.endswith("Nope") else page
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            phrases = os.path.join(tmp, "phrases.txt")
+            with open(phrases, "w", encoding="utf-8") as f:
+                f.write("Pikachu\nNope\n\nEevee\n")
+
+            handle_batch(phrases, "table", output=tmp, workers=2)
+
+            self.assertTrue(os.path.exists(os.path.join(tmp, "Pikachu_1.csv")))
+            self.assertTrue(os.path.exists(os.path.join(tmp, "Eevee_1.csv")))
+            with open(os.path.join(tmp, "errors.jsonl"), encoding="utf-8") as f:
+                errors = f.read().splitlines()
+
+        self.assertEqual(len(errors), 1)
+        self.assertIn('"phrase": "Nope"', errors[0])
+
+    # 3. per-page crawl record keeps top words or the full count vector
+    def test_page_record_top_and_full(self):
+        counts = Counter({"rocket": 3, "team": 2, "meowth": 1})
+
+        top = _page_record("url", 1, 0.5, counts, 2)
+        full = _page_record("url", 1, 0.5, counts, 0)
+
+        self.assertEqual(top["tokens"], 6)
+        self.assertEqual(top["top"], [("rocket", 3), ("team", 2)])
+        self.assertNotIn("counts", top)
+        self.assertEqual(full["counts"], dict(counts))
+
+    # 4. batch workers sharing one archive and title cache don't mix pages up
+    def test_shared_archive_and_cache_across_threads(self):
+        pages = {f"page{i}": f"<p>{i}</p>" * (i % 7 + 1) for i in range(200)}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pages.gz")
+            cache = TitleCache()
+
+            with PageArchive(path) as archive, ThreadPoolExecutor(8) as pool:
+                def store(url):
+                    archive.write(url, pages[url])
+                    cache.add_missing(f"gone_{url}")
+                    cache.add_redirect(f"alias_{url}", url)
+
+                list(pool.map(store, pages))
+
+            with PageArchive(path, mode="r") as archive:
+                stored = {url: archive.read(url) for url in archive.urls()}
+
+        self.assertDictEqual(stored, pages)
+        self.assertEqual(len(cache), 400)
+
+    # 5. crawl streams one record per counted page, not for duplicates or missing pages
+    def test_crawl_streams_page_records(self):
+        pages = {
+            "A": ("Pikachu is an Electric-type", ["B", "C", "Gone"]),
+            "B": ("Pikachu  is an Electric-type", []),
+            "C": ("Eevee is a Normal-type", []),
+        }
+
+        def search(phrase):
+            if phrase not in pages:
+                raise LookupError(phrase)
+            return phrase
+
+        client = Mock()
+        client.search.side_effect = search
+        client.article_url.side_effect = lambda phrase: phrase
+        client.get_links.side_effect = lambda page: pages[page][1]
+        client.get_page_text.side_effect = lambda page: pages[page][0]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pages.jsonl")
+            fetched = crawl(
+                client, "A", 1, 0.0,
+                pages_out=path,
+                pages_top=0,
+                store=JsonCountStore(os.path.join(tmp, "counts.json")),
+                fingerprints=FingerprintIndex()
+            )
+            with open(path, "r", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual(fetched, 3)
+        self.assertListEqual([(r["url"], r["depth"]) for r in records], [("A", 0), ("C", 1)])
+        self.assertEqual(records[1]["counts"], dict(count_words("Eevee is a Normal-type")))
+
+    # 6. parquet without an engine fails upfront, replayed batches open no session
+    @patch.object(requests, "Session")
+    def test_batch_checks_engine_and_replays_offline(self, mock_session):
+        with tempfile.TemporaryDirectory() as tmp:
+            phrases = os.path.join(tmp, "phrases.txt")
+            with open(phrases, "w", encoding="utf-8") as f:
+                f.write("Pikachu\n")
+
+            with patch("config.run_modes.find_spec", return_value=None), \
+                    self.assertRaisesRegex(ImportError, "pyarrow"):
+                handle_batch(phrases, "table", output=tmp, table_format="parquet")
+
+            replay = os.path.join(tmp, "pages.gz")
+            with PageArchive(replay) as archive:
+                archive.write(
+                    BulbapediaClient().article_url("Pikachu"),
+                    '<div id="mw-content-text"><p>Pikachu is a mouse.</p></div>'
+                )
+            with redirect_stdout(io.StringIO()):
+                handle_batch(phrases, "summary", output=tmp, replay=replay)
+
+            with open(os.path.join(tmp, "summaries.jsonl"), encoding="utf-8") as f:
+                summaries = f.read().splitlines()
+
+        mock_session.assert_not_called()
+        self.assertEqual(len(summaries), 1)
+        self.assertIn("Pikachu is a mouse.", summaries[0])
+
+
+class FrontierUnitTests(unittest.TestCase):
+
+    # 1. FIFO frontier keeps discovery order and accepts phrases once
+    def test_fifo_order_and_dedup(self):
+        frontier = FifoFrontier()
+
+        self.assertTrue(frontier.add("A", 0))
+        self.assertTrue(frontier.add("B", 1))
+        self.assertFalse(frontier.add("A", 1))
+
+        self.assertEqual(frontier.pop(), ("A", 0))
+        self.assertEqual(frontier.pop(), ("B", 1))
+        self.assertEqual(len(frontier), 0)
+
+    # 2. priority frontier prefers pages with more in-links
+    def test_priority_prefers_in_links(self):
+        frontier = PriorityFrontier()
+
+        frontier.add("Stub", 1)
+        frontier.add("Pikachu", 1)
+        frontier.add("Pikachu", 1)
+
+        self.assertEqual(frontier.pop(), ("Pikachu", 1))
+        self.assertEqual(frontier.pop(), ("Stub", 1))
+
+    # 3. title penalties push matching pages back
+    def test_priority_title_penalty(self):
+        frontier = PriorityFrontier(title_penalties={r"^List_of": 10.0})
+
+        frontier.add("https://bulbapedia.bulbagarden.net/wiki/List_of_moves", 1)
+        frontier.add("https://bulbapedia.bulbagarden.net/wiki/Eevee", 1)
+
+        self.assertTrue(frontier.pop()[0].endswith("Eevee"))
+
+        frontier = PriorityFrontier(title_penalties={r"^List_of": 10.0}, article_path="/w/")
+        frontier.add("https://example.org/w/List_of_moves", 1)
+        frontier.add("https://example.org/w/Eevee", 1)
+
+        self.assertTrue(frontier.pop()[0].endswith("Eevee"))
+
+    # 4. crawl without a title cache skips dead links, a missing seed aborts it
+    def test_crawl_skips_dead_links(self):
+        pages = {"A": ["B", "Gone"], "B": []}
+
+        def search(phrase):
+            if phrase not in pages:
+                raise LookupError(phrase)
+            return phrase
+
+        client = Mock(cache=None)
+        client.search.side_effect = search
+        client.article_url.side_effect = lambda phrase: phrase
+        client.get_links.side_effect = lambda page: pages[page]
+        client.get_page_text.return_value = "pikachu"
+        stats = CrawlStats()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonCountStore(os.path.join(tmp, "counts.json"))
+            fetched = crawl(client, "A", 1, 0.0, stats=stats, store=store)
+
+            with self.assertRaises(LookupError):
+                crawl(client, "Gone", 1, 0.0, store=store)
+
+        self.assertEqual(fetched, 2)
+        self.assertEqual(stats.counters["missing"], 1)
+
+
+class LinkGraphUnitTests(unittest.TestCase):
+
+    # 1. graph survives a save/load roundtrip as CSR arrays
+    def test_save_load_roundtrip(self):
+        graph = LinkGraph()
+        graph.add_page("A", ["B", "C"], 7, Counter({"rocket": 2}))
+        graph.add_page("B", ["C"], None, Counter())
+
+        indptr, indices = graph.to_csr()
+        self.assertEqual(indptr.tolist(), [0, 2, 3, 3])
+        self.assertEqual(indices.tolist(), [1, 2, 2])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.npz")
+            graph.save(path)
+            loaded = LinkGraph.load(path)
+
+        self.assertEqual(loaded.fetched(), ["A", "B"])
+        self.assertEqual(loaded.out_links("A"), ["B", "C"])
+        self.assertEqual(loaded.revision("A"), 7)
+        self.assertIsNone(loaded.revision("B"))
+        self.assertEqual(loaded.page_counts("A"), Counter({"rocket": 2}))
+
+    # 2. probed links to missing articles are left out of the saved graph
+    def test_probe_drops_missing_links(self):
+        links = {"A": ["B", "C"], "B": ["D", "E"], "C": []}
+        client = Mock()
+        client.search.side_effect = lambda phrase: phrase
+        client.article_url.side_effect = lambda phrase: phrase
+        client.get_links.side_effect = lambda page: links[page]
+        client.get_page_text.return_value = "pikachu"
+        client.get_revision.return_value = None
+        client.probe.side_effect = lambda urls: {url: url == "D" for url in urls}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.npz")
+            with redirect_stdout(io.StringIO()):
+                crawl(
+                    client, "A", 1, 0.0, probe=True, link_graph=path,
+                    store=JsonCountStore(os.path.join(tmp, "counts.json"))
+                )
+            graph = LinkGraph.load(path)
+
+        self.assertEqual(graph.out_links("A"), ["B", "C"])
+        self.assertEqual(graph.out_links("B"), ["D"])
+
+    # 3. recrawl downloads changed pages only and replaces their counts
+    def test_recrawl_updates_changed_pages(self):
+        pages = {
+            "A": ("Pikachu Pikachu", ["B", "C"], 1),
+            "B": ("Eevee", [], 1),
+            "C": ("Snorlax", [], 1),
+        }
+        searched = []
+
+        def search(phrase):
+            searched.append(phrase)
+            if phrase not in pages:
+                raise LookupError(phrase)
+            return phrase
+
+        client = MagicMock()
+        client.__enter__.return_value = client
+        client.search.side_effect = search
+        client.article_url.side_effect = lambda phrase: phrase
+        client.get_links.side_effect = lambda page: pages[page][1]
+        client.get_page_text.side_effect = lambda page: pages[page][0]
+        client.get_revision.side_effect = lambda page: pages[page][2]
+        client.get_revisions.side_effect = lambda urls: {
+            url: pages[url][2] if url in pages else None for url in urls
+        }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.npz")
+            store = JsonCountStore(os.path.join(tmp, "counts.json"))
+            crawl(client, "A", 1, 0.0, link_graph=path, store=store)
+            self.assertEqual(LinkGraph.load(path).revision("A"), 1)
+
+            pages["B"] = ("Raichu Raichu", [], 2)
+            del pages["C"]
+            searched.clear()
+            out = io.StringIO()
+            with patch("config.run_modes.get_wiki_client", return_value=client), \
+                    redirect_stdout(out):
+                handle_recrawl(path, 0.0, store=store)
+
+            stored = dict(store.items())
+            graph = LinkGraph.load(path)
+
+        self.assertListEqual(searched, ["B", "C"])
+        self.assertIn("Recrawled 2 of 3 pages", out.getvalue())
+        self.assertDictEqual(stored, {"Pikachu": 2, "Raichu": 2})
+        self.assertEqual(graph.revision("B"), 2)
+        self.assertEqual(graph.page_counts("C"), Counter())
+
+
+class CrawlStatsUnitTests(unittest.TestCase):
+
+    # 1. stage timers and counters end up in the report
+    def test_report_contains_stages_and_counters(self):
+        stats = CrawlStats(progress_every=0)
+
+        with stats.stage("network"):
+            pass
+        with stats.stage("network"):
+            pass
+        stats.count("pages", 2)
+
+        report = stats.report()
+
+        self.assertEqual(report["counters"], {"pages": 2})
+        self.assertEqual(report["stages"]["network"]["calls"], 2)
+        self.assertIn("pages 2", stats.progress_line())
+
+    # 2. measurements are exposed on the OpenMetrics endpoint
+    def test_metrics_endpoint(self):
+        metrics = CrawlMetrics()
+        stats = CrawlStats(progress_every=0, metrics=metrics)
+
+        with stats.stage("network"):
+            pass
+        stats.status(200)
+        stats.gauge("queue", 7)
+
+        with MetricsServer(metrics, 0) as server:
+            body = requests.get(
+                f"http://127.0.0.1:{server.port}/metrics", timeout=5
+            ).text
+
+        self.assertIn('wikiscrapper_http_responses_total{status="200"} 1', body)
+        self.assertIn('wikiscrapper_stage_seconds_count{stage="network"} 1', body)
+        self.assertIn("wikiscrapper_queue_depth 7", body)
+        self.assertTrue(body.endswith("# EOF\n"))
+
+    # 3. crawls of several wikis keep their own labelled series
+    def test_metrics_labelled_by_host(self):
+        metrics = CrawlMetrics()
+        for host, queue in (("example.org", 3), ("example.com", 5)):
+            stats = CrawlStats(progress_every=0, metrics=metrics, labels={"host": host})
+            stats.gauge("queue", queue)
+            stats.count("pages")
+
+        body = metrics.render()
+
+        self.assertIn('wikiscrapper_queue_depth{host="example.org"} 3', body)
+        self.assertIn('wikiscrapper_queue_depth{host="example.com"} 5', body)
+        self.assertIn('wikiscrapper_events_total{event="pages",host="example.com"} 1', body)
+
+
+class ProfilingUnitTests(unittest.TestCase):
+
+    # 1. profile report with allocation sites is written to the file
+    def test_profiled_writes_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.txt")
+
+            with profiled(path, memory=True, top=5):
+                sorted(str(i) for i in range(1000))
+
+            with open(path, "r", encoding="utf-8") as f:
+                report = f.read()
+
+            self.assertTrue(os.path.exists(path + ".prof"))
+
+        self.assertIn("BY CUMULATIVE TIME", report)
+        self.assertIn("ALLOCATION SITES", report)
+
+
+class DocTermMatrixUnitTests(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = DocTermMatrix()
+        self.matrix.add_document("A", {"the": 9000, "rocket": 3000, "zzxq": 50})
+        self.matrix.add_document("B", {})
+        self.matrix.add_document("C", {"rocket": 1000, "and": 8000})
+
+    # 1. documents are stored as CSR rows over shared term IDs
+    def test_csr_layout_and_roundtrip(self):
+        data, indices, indptr = self.matrix.csr()
+
+        self.assertEqual(self.matrix.shape, (3, 4))
+        self.assertEqual(indptr.tolist(), [0, 3, 3, 5])
+        self.assertEqual(indices.tolist(), [0, 1, 2, 1, 3])
+        self.assertEqual(self.matrix.term_totals().tolist(), [9000, 4000, 50, 8000])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "matrix.npz")
+            self.matrix.save(path)
+            loaded = DocTermMatrix.load(path)
+
+        self.assertEqual(loaded.docs, ["A", "B", "C"])
+        self.assertEqual(loaded.csr()[0].tolist(), data.tolist())
+
+    # 2. per-document scores match the score of each document's own top-k
+    def test_lang_confidence_scores_match_reference(self):
+        scores = self.matrix.lang_confidence_scores(2, mode="article")
+        zipf = dict(zip(self.matrix.terms, self.matrix.zipf().tolist()))
+
+        def reference(top):
+            matched = sum(min(zipf[w], c / 1000) for w, c in top)
+            return 100 * matched / sum(c / 1000 for _, c in top)
+
+        self.assertAlmostEqual(
+            scores[0], reference([("the", 9000), ("rocket", 3000)]), places=4)
+        self.assertEqual(scores[1], 0.0)
+        self.assertAlmostEqual(
+            scores[2], reference([("and", 8000), ("rocket", 1000)]), places=4)
+
+    # 3. corpus-wide analysis keeps the text_utils column layout
+    def test_article_analysis_columns(self):
+        data = self.matrix.article_analysis(2)
+
+        self.assertListEqual(list(data.columns), ["word", "rel_freq", "wiki_freq"])
+        self.assertListEqual(data["word"].tolist(), ["the", "and"])
+        self.assertEqual(data.loc[0, "wiki_freq"], 9.0)
+
+    # 4. arrays are consolidated once per change, ties at the cutoff keep term order
+    def test_csr_cached_and_stable_cutoff(self):
+        data, _, _ = self.matrix.csr()
+        self.assertIs(self.matrix.csr()[0], data)
+        self.assertFalse(data.flags.writeable)
+
+        matrix = DocTermMatrix()
+        for i in range(40):
+            matrix.add_document(f"doc{i}", {f"w{i}": 5, "the": 100})
+        self.assertIsNot(matrix.csr()[0], data)
+
+        words = matrix.article_analysis(11)["word"].tolist()
+        self.assertListEqual(words, ["the"] + [f"w{i}" for i in range(10)])
+
+
+class LangConfidenceUnitTests(unittest.TestCase):
+
+    # 1. one-pass k sweep matches scoring each sorted prefix separately
+    def test_scores_match_per_k_reference(self):
+        data = pd.DataFrame({
+            "word": ["a", "b", "c", "d", "e", "f"],
+            "rel_freq": [7.0, 2.0, 5.0, 0.0, 5.0, 3.0],
+            "wiki_freq": [1.5, 4.0, 0.2, 3.0, 4.0, 0.1],
+        })
+
+        for mode, key in (("article", "wiki_freq"), ("language", "rel_freq")):
+            scores = lang_confidence_scores((1, 2, 3, 5, 100), mode, data)
+            ordered = data.sort_values(key, ascending=False, kind="mergesort")
+
+            for k, score in scores.items():
+                self.assertAlmostEqual(
+                    score, lang_confidence_score(ordered.iloc[:k]))
+
+
+class ChartRendererUnitTests(unittest.TestCase):
+
+    # 1. charts get the format's extension and share one reused figure
+    def test_render_many_reuses_figure(self):
+        data = pd.DataFrame({
+            "word": [f"w{i}" for i in range(40)],
+            "rel_freq": [float(i) for i in range(40)],
+            "wiki_freq": [1.5] * 40,
+        })
+        renderer = ChartRenderer("svg", label_limit=10)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = renderer.render_many([
+                (data, os.path.join(tmp, "all")),
+                (data.iloc[:5], os.path.join(tmp, "top.png")),
+            ])
+            figure = renderer._figure
+            renderer.render(data, os.path.join(tmp, "again"))
+
+            self.assertTrue(all(os.path.exists(path) for path in paths))
+
+        self.assertListEqual(
+            [os.path.basename(path) for path in paths], ["all.svg", "top.png"])
+        self.assertIs(renderer._figure, figure)
+        self.assertListEqual(figure.axes, [])
+
+    # 2. value labels are decimated above the label limit
+    def test_labels_decimated(self):
+        labels = ChartRenderer._ChartRenderer__labels([1.0, 2.5, 3.0, 4.0], 2)
+        self.assertListEqual(labels, ["1", "", "3", ""])
+
+
+class LanguageTableUnitTests(unittest.TestCase):
+
+    # 1. table is built once, saved, and agrees with zipf_frequency
+    def test_table_matches_wordfreq(self):
+        words = ["the", "The", "Pikachu", "qwzxv", "straße"]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            table = get_language_table("en", tmp)
+            self.assertIs(get_language_table("en", tmp), table)
+
+            loaded = LanguageTable.load(os.path.join(tmp, "en.npz"))
+
+        expected = [zipf_frequency(word, "en") for word in words]
+        self.assertListEqual(table.lookup(words).tolist(), expected)
+        self.assertListEqual(loaded.lookup(words).tolist(), expected)
+
+    # 2. unsupported languages are rejected
+    def test_unsupported_language(self):
+        with self.assertRaises(ValueError):
+            LanguageTable.build("xx")
+
+
+class AsyncBulbapediaUnitTests(unittest.TestCase):
+
+    HTML = (
+        '<div id="mw-content-text"><p>Pikachu is an '
+        '<a href="/wiki/Electric_(type)">Electric</a> Pokémon.</p></div>'
+    )
+
+    # 1. concurrent searches share the synchronous client's extractors
+    def test_gathered_searches(self):
+        async def run():
+            async with AsyncBulbapediaClient(backend="httpx") as client:
+                client._fetch = AsyncMock(return_value=self.HTML)
+                soups = await asyncio.gather(
+                    *(client.search(f"Pikachu {i}") for i in range(200))
+                )
+                return client, soups
+
+        client, soups = asyncio.run(run())
+
+        self.assertEqual(len(soups), 200)
+        self.assertEqual(client._fetch.await_count, 200)
+        self.assertEqual(
+            client.get_summary(soups[0]), "Pikachu is an Electric Pokémon.")
+        self.assertListEqual(
+            client.get_links(soups[-1]),
+            ["https://bulbapedia.bulbagarden.net/wiki/Electric_(type)"])
+
+    # 2. missing article and empty query errors match the sync client
+    def test_search_errors(self):
+        missing = '<div id="mw-content-text">There is currently no text in this page</div>'
+
+        async def run():
+            async with AsyncBulbapediaClient(backend="httpx") as client:
+                client._fetch = AsyncMock(return_value=missing)
+                with self.assertRaises(LookupError):
+                    await client.search("Nonexistent")
+                with self.assertRaises(ValueError):
+                    await client.search("  ")
+
+        asyncio.run(run())
+
+    # 3. pages come over HTTP through every installed backend, aiohttp by default
+    def test_backends_fetch_pages(self):
+        corpus = {f"Pokemon_{i}": self.HTML for i in range(20)}
+        backends = [backend for backend in BACKENDS
+                    if backend == "requests" or find_spec(backend) is not None]
+
+        async def run(url, backend):
+            async with AsyncBulbapediaClient(base_url=url, backend=backend) as client:
+                soups = await asyncio.gather(
+                    *(client.search(f"Pokemon {i}") for i in range(20)))
+                with self.assertRaises(LookupError):
+                    await client.search("Missingno")
+                return client, soups
+
+        async def unreachable(url, backend):
+            async with AsyncBulbapediaClient(base_url=url, backend=backend) as client:
+                await client.search("Pikachu")
+
+        self.assertIn("aiohttp", backends)
+        self.assertEqual(AsyncBulbapediaClient().backend, "aiohttp")
+
+        for backend in backends:
+            with self.subTest(backend=backend):
+                with StandInServer(corpus) as server:
+                    client, soups = asyncio.run(run(server.url, backend))
+
+                self.assertEqual(server.requests, 21)
+                self.assertEqual(
+                    client.get_summary(soups[7]), "Pikachu is an Electric Pokémon.")
+                with self.assertRaises(ConnectionError):
+                    asyncio.run(unreachable(server.url, backend))
+
+    # 4. options the asynchronous client can't honour are rejected
+    def test_factory_rejects_unsupported_options(self):
+        for options in ({"title_cache": "titles.json"}, {"rate_limit": 5.0}):
+            with self.subTest(**options), self.assertRaises(ValueError):
+                get_wiki_client(asynchronous=True, **options)
+
+
+class VocabularyUnitTests(unittest.TestCase):
+
+    # 1. dense IDs in insertion order, unknown terms without adding are -1
+    def test_dense_ids(self):
+        vocabulary = Vocabulary(capacity=2)
+        words = [f"word{i}" for i in range(100)] + ["ą", "word7", "ą"]
+
+        ids = vocabulary.ids(words)
+
+        self.assertListEqual(ids[:100].tolist(), list(range(100)))
+        self.assertListEqual(ids[100:].tolist(), [100, 7, 100])
+        self.assertEqual(vocabulary.term(100), "ą")
+        self.assertListEqual(
+            vocabulary.ids(["word3", "missing"], add=False).tolist(), [3, -1])
+        self.assertEqual(len(vocabulary), 101)
+
+    # 2. merges by ID sum repeats, subtract negatives and stop at zero
+    def test_merge_and_roundtrip(self):
+        vocabulary = Vocabulary.from_dict({"rocket": 3, "team": 2})
+        vocabulary.merge([1, 1, 0], [5, -1, -10])
+        vocabulary.update({"meowth": 1, "team": 1})
+
+        self.assertDictEqual(vocabulary.to_dict(), {"team": 7, "meowth": 1})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vocabulary.npz")
+            vocabulary.save(path)
+            loaded = Vocabulary.load(path)
+
+        self.assertDictEqual(loaded.to_dict(), {"team": 7, "meowth": 1})
+        self.assertEqual(loaded.count("team"), 7)
+        self.assertNotIn("jessie", loaded)
+
+    # 3. stored counts are reread only when the file changes on disk
+    def test_update_wiki_dict_keeps_counts_in_memory(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                update_wiki_dict(Counter({"rocket": 2}))
+                with patch("utils.text_utils.json.load") as load:
+                    update_wiki_dict(Counter({"rocket": 1, "team": 1}))
+                load.assert_not_called()
+
+                with open("word-counts.json", "w", encoding="utf-8") as f:
+                    f.write('{"meowth": 10}')
+                update_wiki_dict(Counter({"meowth": -4}))
+
+                with open("word-counts.json", "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+            finally:
+                os.chdir(cwd)
+
+        self.assertDictEqual(stored, {"meowth": 6})
+
+
+
+class SketchUnitTests(unittest.TestCase):
+
+    # 1. estimates never undercount and stay within epsilon * total
+    def test_count_min_bounds_and_merge(self):
+        counts = Counter({f"word{i}": i % 13 + 1 for i in range(3000)})
+        first, second = CountMinSketch(epsilon=0.01), CountMinSketch(epsilon=0.01)
+        first.add(counts)
+        second.add(Counter({"word1": 100}))
+        first.merge(second)
+        counts["word1"] += 100
+
+        terms = list(counts)
+        overcount = first.estimate(terms) - [counts[term] for term in terms]
+
+        self.assertGreaterEqual(overcount.min(), 0)
+        self.assertLessEqual(overcount.max(), first.error)
+        self.assertEqual(first.total, sum(counts.values()))
+        with self.assertRaises(ValueError):
+            first.merge(CountMinSketch(epsilon=0.1))
+        with self.assertRaises(ValueError):
+            first.add({"word1": -1})
+
+    # 2. heavy hitters survive eviction and merging of summaries
+    def test_space_saving_keeps_heavy_hitters(self):
+        first, second = SpaceSaving(k=3), SpaceSaving(k=3)
+        first.update({"pikachu": 50, "eevee": 20})
+        for i in range(20):
+            first.update({f"rare{i}": 1})
+            second.update({f"other{i}": 1})
+        second.update({"pikachu": 30, "eevee": 25})
+
+        first.merge(second)
+        top = first.top(2)
+
+        self.assertListEqual([term for term, _, _ in top], ["pikachu", "eevee"])
+        for term, count, error in top:
+            true = {"pikachu": 80, "eevee": 45}[term]
+            self.assertLessEqual(count - error, true)
+            self.assertGreaterEqual(count, true)
+
+    # 3. worker stores of one file merge on close, analysis reads the top words
+    def test_store_merges_processes_and_feeds_analysis(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "counts.npz")
+            first = SketchCountStore(path, epsilon=0.001, top=10)
+            second = SketchCountStore(path, epsilon=0.001, top=10)
+            first.update(Counter({"the": 40, "pokemon": 15}))
+            second.update(Counter({"the": 10, "trainer": 5}))
+            first.close()
+            second.close()
+
+            with SketchCountStore(path) as store:
+                data = article_analysis(2, store=store)
+
+            with self.assertRaises(ValueError):
+                SketchCountStore(path, top=5)
+
+        self.assertListEqual(list(data["word"]), ["the", "pokemon"])
+        self.assertListEqual(list(data["wiki_freq"]), [0.05, 0.01])
+
+    # 4. analyses needing more than the tracked top words are rejected
+    def test_analysis_limited_to_top_words(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with SketchCountStore(os.path.join(tmp, "counts.npz"), top=10) as store:
+                store.update(Counter({"the": 40}))
+                for mode, count in (("article", 11), ("language", 5)):
+                    with self.assertRaises(ValueError):
+                        handle_analysis(mode, count, None, store=store)
+
+
+class CountStoreUnitTests(unittest.TestCase):
+
+    # 1. parallel processes lose no updates in either exact store
+    def test_parallel_processes_lose_no_updates(self):
+        for kind, name in (("json", "counts.json"), ("sqlite", "counts.sqlite3")):
+            with self.subTest(kind=kind), tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, name)
+                workers = [
+                    multiprocessing.Process(
+                        target=_count_into_store, args=(kind, path, i))
+                    for i in range(4)
+                ]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+
+                store = JsonCountStore(path) if kind == "json" else SqliteCountStore(path)
+                with store:
+                    stored = dict(store.items())
+
+                self.assertDictEqual(
+                    stored, {"shared": 100, **{f"worker{i}": 50 for i in range(4)}})
+
+    # 2. sqlite counts subtract, drop zeros and feed the analysis
+    def test_sqlite_store_subtracts_and_feeds_analysis(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "counts.sqlite3")
+            with SqliteCountStore(path) as first, SqliteCountStore(path) as second:
+                first.update(Counter({"the": 3000, "pokemon": 2000}))
+                second.update(Counter({"pokemon": -2500, "trainer": 1000, "gym": -1}))
+                data = article_analysis(5, store=first)
+
+        self.assertListEqual(list(data["word"]), ["the", "trainer"])
+        self.assertListEqual(list(data["wiki_freq"]), [3.0, 1.0])
+
+    # 3. json updates are batched, the streamed file keeps the json.dump layout
+    def test_json_store_batches_writes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "counts.json")
+            store = JsonCountStore(path, flush_every=3)
+
+            store.update(Counter({"pikachu": 2, "ash": 1}))
+            store.update(Counter({"ash": -1, "żółw": 1}))
+            self.assertFalse(os.path.exists(path))
+            self.assertDictEqual(dict(store.items()), {"pikachu": 2, "żółw": 1})
+
+            store.update(Counter({"pikachu": 1}))
+            store.update(Counter({"brock": 1}))
+            with open(path, "r", encoding="utf-8") as f:
+                written = f.read()
+
+            store.close()
+            with open(path, "r", encoding="utf-8") as f:
+                closed = json.load(f)
+
+        self.assertEqual(written, json.dumps(
+            {"pikachu": 2, "żółw": 1}, ensure_ascii=False, indent=2))
+        self.assertDictEqual(closed, {"pikachu": 3, "żółw": 1, "brock": 1})
+
+    # 4. analysis of a store without counts fails instead of printing nothing
+    def test_empty_store_analysis_fails(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for store in (
+                JsonCountStore(os.path.join(tmp, "counts.json")),
+                SqliteCountStore(os.path.join(tmp, "counts.sqlite3")),
+            ):
+                with store, self.assertRaises(FileNotFoundError):
+                    article_analysis(5, store=store)
+
+    # 5. buffered updates reach the shared store in batches and on close
+    def test_buffered_store_batches_updates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "counts.sqlite3")
+            with SqliteCountStore(path) as shared:
+                synchronized = SynchronizedCountStore(shared)
+                with patch.object(shared, "update", wraps=shared.update) as update:
+                    with BufferedCountStore(synchronized, flush_every=2) as first, \
+                            BufferedCountStore(synchronized, flush_every=2) as second:
+                        first.update({"pikachu": 1})
+                        second.update({"eevee": 2})
+                        first.update({"pikachu": 1, "ash": 1})
+                        self.assertEqual(update.call_count, 1)
+                        second.update({"eevee": -1})
+
+                    self.assertEqual(update.call_count, 2)
+                stored = dict(shared.items())
+
+        self.assertDictEqual(stored, {"pikachu": 2, "ash": 1, "eevee": 1})
+
+
+class FingerprintUnitTests(unittest.TestCase):
+
+    def setUp(self):
+        self.text = " ".join(f"word{i}" for i in range(300))
+
+    # 1. exact and near duplicates of other URLs are found, unrelated texts aren't
+    def test_exact_and_near_duplicates(self):
+        index = FingerprintIndex(near_distance=3)
+        edited = self.text.replace("word150", "changed")
+        other = " ".join(f"other{i}" for i in range(300))
+
+        self.assertIsNone(index.check("A", self.text))
+        self.assertIsNone(index.check("A", self.text))
+        self.assertEqual(index.check("B", "  " + self.text.replace(" ", "\n")), "A")
+        self.assertLessEqual((simhash(self.text) ^ simhash(edited)).bit_count(), 3)
+        self.assertEqual(index.check("C", edited), "A")
+        self.assertIsNone(index.check("D", other))
+        self.assertIsNone(FingerprintIndex().check("C", edited))
+
+    # 2. indexes saved by several processes are merged in the file
+    def test_saved_indexes_merge(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fingerprints.json")
+            first, second = FingerprintIndex(path, 3), FingerprintIndex(path, 3)
+            first.check("A", self.text)
+            second.check("B", "Eevee evolves into many Pokemon")
+            first.close()
+            second.close()
+
+            with FingerprintIndex(path, 3) as index:
+                self.assertEqual(index.check("C", self.text + " word300"), "A")
+                self.assertEqual(index.check("D", "Eevee evolves into many Pokemon"), "B")
+
+    # 3. crawl skips duplicated pages before counting and doesn't expand them
+    def test_crawl_skips_duplicates(self):
+        pages = {
+            "A": ("Pikachu is an Electric-type", ["B", "C"]),
+            "B": ("Pikachu  is an Electric-type", ["D"]),
+            "C": ("Eevee is a Normal-type", []),
+        }
+        client = Mock()
+        client.search.side_effect = lambda phrase: phrase
+        client.article_url.side_effect = lambda phrase: phrase
+        client.get_links.side_effect = lambda page: pages[page][1]
+        client.get_page_text.side_effect = lambda page: pages[page][0]
+        stats = CrawlStats()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonCountStore(os.path.join(tmp, "counts.json"))
+            fetched = crawl(
+                client, "A", 2, 0.0,
+                stats=stats, store=store, fingerprints=FingerprintIndex()
+            )
+            stored = dict(store.items())
+
+        self.assertEqual(fetched, 3)
+        self.assertEqual(stats.counters["duplicates"], 1)
+        self.assertEqual(stored["Pikachu"], 1)
+        self.assertNotIn("D", [call.args[0] for call in client.search.call_args_list])
+
+    # 4. re-checked URLs keep one near entry, replaced when their text changes
+    def test_recheck_keeps_one_entry(self):
+        index = FingerprintIndex(near_distance=3)
+        other = " ".join(f"other{i}" for i in range(300))
+
+        index.check("A", self.text)
+        index.check("A", self.text)
+        self.assertEqual(len(index.near), 1)
+
+        index.check("A", other)
+        self.assertEqual(index.near, [(simhash(other), "A")])
+        self.assertIsNone(index.check("B", self.text + " word300"))
+        self.assertEqual(index.check("C", other), "A")
+
+
+class CoordinatorUnitTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "crawl.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # 1. an expired lease goes to another worker and only its holder counts the page
+    def test_expired_lease_counted_once(self):
+        with SqliteCoordinator(self.path, lease_timeout=10) as coordinator:
+            self.assertEqual(coordinator.schedule(["A", "A"], 0), 1)
+            self.assertListEqual(coordinator.lease("first"), [("A", 0)])
+            self.assertListEqual(coordinator.lease("second"), [])
+
+            with patch("utils.coordinator.time.time", return_value=time.time() + 11):
+                self.assertListEqual(coordinator.lease("second"), [("A", 0)])
+
+            self.assertFalse(coordinator.complete("first", "A", {"pikachu": 1}, ["B"], 1))
+            self.assertTrue(coordinator.complete("second", "A", {"pikachu": 1}, ["B", "A"], 1))
+
+            self.assertListEqual(coordinator.lease("first", limit=5), [("B", 1)])
+            coordinator.release("first", "B")
+            self.assertEqual(coordinator.pending(), 1)
+            self.assertListEqual(list(coordinator.items()), [("pikachu", 1)])
+
+    # 2. workers sharing the coordinator count the link graph like a single crawl
+    @patch("config.run_modes.get_wiki_client")
+    def test_workers_share_frontier(self, mock_factory):
+        pages = {
+            "A": ("Pikachu Eevee", ["B", "C"]),
+            "B": ("Pikachu", ["A", "D"]),
+            "C": ("Eevee", ["D"]),
+            "D": ("Snorlax", ["E"]),
+        }
+        client = mock_factory.return_value.__enter__.return_value
+        client.search.side_effect = lambda phrase: phrase
+        client.article_url.side_effect = lambda phrase: phrase
+        client.get_links.side_effect = lambda page: pages[page][1]
+        client.get_page_text.side_effect = lambda page: pages[page][0]
+
+        with SqliteCoordinator(self.path) as coordinator:
+            first = handle_crawl_worker("A", 2, 0.0, coordinator, max_pages=2)
+            second = handle_crawl_worker("A", 2, 0.0, coordinator)
+            stored = dict(coordinator.items())
+            pending = coordinator.pending()
+
+        self.assertEqual((first, second), (2, 2))
+        self.assertEqual(pending, 0)
+        self.assertDictEqual(stored, {"Pikachu": 2, "Eevee": 2, "Snorlax": 1})
+
+    # 3. coordinators are SQLite files, server URLs are rejected
+    def test_coordinator_urls(self):
+        with get_coordinator(self.path) as coordinator:
+            self.assertIsInstance(coordinator, SqliteCoordinator)
+            coordinator.update({"pikachu": 2})
+            coordinator.update({"pikachu": -1})
+            self.assertListEqual(list(coordinator.items()), [("pikachu", 1)])
+
+        with self.assertRaises(ValueError):
+            get_coordinator("redis://localhost:6379/0")
+
+
+class MediaWikiUnitTests(unittest.TestCase):
+
+    # 1. article path, host and namespace rules of a configured wiki
+    def test_links_follow_site_rules(self):
+        html = """
+        <div id="mw-content-text">
+            <a href="/w/Pikachu">a</a>
+            <a href="https://WWW.Example.org/w/Star_Wars:_Episode_I">b</a>
+            <a href="/w/Category:Pokemon">c</a>
+            <a href="/wiki/Eevee">d</a>
+            <a href="https://other.org/w/Snorlax">e</a>
+        </div>
+        """
+        client = MediaWikiClient(
+            "https://www.example.org",
+            article_path="w",
+            skip_namespaces=("category",)
+        )
+        links = client.get_links(BeautifulSoup(html, "html.parser"))
+
+        self.assertListEqual(links, [
+            "https://www.example.org/w/Pikachu",
+            "https://www.example.org/w/Star_Wars:_Episode_I",
+        ])
+        self.assertEqual(
+            client.article_url("https://example.org/w/Mr_Mime"),
+            "https://example.org/w/Mr_Mime")
+        self.assertEqual(client.article_url("Mr Mime"), "https://www.example.org/w/Mr_Mime")
+        self.assertEqual(client.api_url, "https://www.example.org/w/api.php")
+        self.assertListEqual(
+            BulbapediaClient().get_links(BeautifulSoup(html, "html.parser")),
+            ["https://bulbapedia.bulbagarden.net/wiki/Eevee"])
+
+    # 2. requests of one client are spaced by its rate limit
+    @patch.object(requests.Session, "get")
+    def test_rate_limit_spaces_requests(self, mock_get):
+        mock_get.return_value = Mock(status_code=200, text="<p>x</p>", content=b"x")
+        client = MediaWikiClient("https://example.org", rate_limit=50)
+
+        start = time.monotonic()
+        for _ in range(5):
+            client._fetch("https://example.org/wiki/A", "A")
+
+        self.assertGreaterEqual(time.monotonic() - start, 4 / 50 - 0.005)
+        with self.assertRaises(ValueError):
+            MediaWikiClient("https://example.org", rate_limit=0)
+
+    # 3. seeds are grouped by wiki, per-crawl files need a single wiki
+    def test_seeds_grouped_by_wiki(self):
+        seeds = _seeds_by_wiki([
+            "Pikachu",
+            "https://bulbapedia.bulbagarden.net/wiki/Eevee",
+            "https://en.wikipedia.org/wiki/Pikachu",
+            "https://en.wikipedia.org/wiki/Eevee",
+        ])
+
+        self.assertDictEqual(seeds, {
+            "bulbapedia": ["Pikachu", "https://bulbapedia.bulbagarden.net/wiki/Eevee"],
+            "https://en.wikipedia.org": [
+                "https://en.wikipedia.org/wiki/Pikachu",
+                "https://en.wikipedia.org/wiki/Eevee",
+            ],
+        })
+        self.assertListEqual(
+            wiki_urls(["Pikachu", "https://en.wikipedia.org/wiki/Eevee"]),
+            ["https://bulbapedia.bulbagarden.net", "https://en.wikipedia.org"])
+        with self.assertRaisesRegex(ValueError, "link_graph"):
+            handle_auto_count(
+                ["Pikachu", "https://en.wikipedia.org/wiki/Pikachu"], 1, 0.0,
+                link_graph="graph.npz"
+            )
+
+    # 4. lowercase and percent-encoded seeds are the article their links point to
+    def test_seeds_match_links(self):
+        corpus = {
+            "Pokémon": '<div id="mw-content-text"><p>Pokemon are creatures.</p>'
+                       '<a href="/wiki/Pikachu">a</a></div>',
+            "Pikachu": '<div id="mw-content-text"><p>Pikachu is a Pokemon.</p>'
+                       '<a href="/wiki/Pok%C3%A9mon">a</a><a href="/wiki/Eevee">b</a></div>',
+            "Eevee": '<div id="mw-content-text"><p>Eevee evolves.</p>'
+                     '<a href="/wiki/pok%C3%A9mon">a</a></div>',
+        }
+
+        with StandInServer(corpus) as server, tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "counts.json")
+            encoded = f"{server.url}/wiki/Pok%C3%A9mon"
+            for seeds in ("pokémon", encoded, ["pokémon", encoded]):
+                with self.subTest(seeds=seeds):
+                    server.requests = 0
+                    with MediaWikiClient(server.url) as client, \
+                            JsonCountStore(path) as store:
+                        fetched = crawl(client, seeds, 2, 0.0, store=store)
+                        stored = dict(store.items())
+                    os.remove(path)
+
+                    self.assertEqual((fetched, server.requests), (3, 3))
+                    self.assertEqual(stored["pokemon"], 2)
+
+    # 5. site paths and namespaces reach clients of configured wikis
+    def test_factory_applies_site_rules(self):
+        client = get_wiki_client(
+            "https://example.org",
+            article_path="/w/",
+            api_path="/api.php",
+            skip_namespaces=["Category"]
+        )
+
+        self.assertEqual(client.article_url("Mr Mime"), "https://example.org/w/Mr_Mime")
+        self.assertEqual(client.api_url, "https://example.org/api.php")
+        html = """
+        <div id="mw-content-text">
+            <a href="/w/Category:Pokemon">a</a>
+            <a href="/w/Star_Wars:_Episode_I">b</a>
+        </div>
+        """
+        self.assertListEqual(
+            client.get_links(BeautifulSoup(html, "html.parser")),
+            ["https://example.org/w/Star_Wars:_Episode_I"])
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,178 @@
+# utils/coordinator.py
+
+import time
+from abc import abstractmethod
+from collections.abc import Iterable, Mapping
+
+from utils.count_store import CountStore, SqliteCountStore
+
+# a leased page not completed within this many seconds is handed to another worker
+DEFAULT_LEASE_TIMEOUT = 300.0
+
+_QUEUED, _LEASED, _DONE = 0, 1, 2
+
+
+class CrawlCoordinator(CountStore):
+    """
+    Shared state of a crawl run by several worker processes:
+    the frontier of discovered URLs with their depth, the visited set
+    (every URL ever scheduled) and the word counts of completed pages.
+
+    Workers lease URLs, shallowest first. A lease not completed within
+    `lease_timeout` seconds expires and the URL may be leased by another
+    worker. Completing a page merges its counts, marks it done and
+    schedules its links in one atomic step, only while the lease is still
+    the worker's own, so each page is counted exactly once.
+    """
+
+    def __init__(self, lease_timeout: float = DEFAULT_LEASE_TIMEOUT):
+        if lease_timeout <= 0:
+            raise ValueError(f"Lease timeout must be positive: {lease_timeout}")
+
+        self.lease_timeout = lease_timeout
+
+    @abstractmethod
+    def schedule(self, urls: Iterable[str], depth: int) -> int:
+        """Adds unseen `urls` to the frontier. Returns how many were new."""
+        pass
+
+    @abstractmethod
+    def lease(self, worker: str, limit: int = 1) -> list[tuple[str, int]]:
+        """Up to `limit` (url, depth) pairs, leased to `worker`."""
+        pass
+
+    @abstractmethod
+    def complete(
+        self,
+        worker: str,
+        url: str,
+        counts: Mapping[str, int],
+        links: Iterable[str] = (),
+        depth: int = 0
+    ) -> bool:
+        """
+        Merges the counts of a leased page and schedules its `links` at
+        `depth`. Returns False, changing nothing, if the lease was lost.
+        """
+        pass
+
+    @abstractmethod
+    def release(self, worker: str, url: str) -> None:
+        """Returns a leased URL to the frontier, e.g. after a failed fetch."""
+        pass
+
+    @abstractmethod
+    def pending(self) -> int:
+        """Number of URLs queued or leased, not done yet."""
+        pass
+
+
+class SqliteCoordinator(CrawlCoordinator, SqliteCountStore):
+    """
+    Coordinator in one SQLite file (WAL mode), for workers on one host:
+    WAL needs shared memory, so the file can't be on a network
+    filesystem. Counts are kept in the table of `SqliteCountStore`, so
+    the file can be analyzed like word-counts.sqlite3.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+        timeout: float = 60
+    ):
+        CrawlCoordinator.__init__(self, lease_timeout)
+        SqliteCountStore.__init__(self, path, timeout)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            "url TEXT PRIMARY KEY, depth INTEGER NOT NULL, "
+            "state INTEGER NOT NULL DEFAULT 0, worker TEXT, lease_until REAL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state, depth)")
+
+    def schedule(self, urls: Iterable[str], depth: int) -> int:
+        with self._transaction():
+            return self.__schedule(urls, depth)
+
+    def lease(self, worker: str, limit: int = 1) -> list[tuple[str, int]]:
+        now = time.time()
+        with self._transaction() as db:
+            leased = db.execute(
+                "SELECT url, depth FROM frontier "
+                "WHERE state = ? OR (state = ? AND lease_until < ?) "
+                "ORDER BY depth LIMIT ?",
+                (_QUEUED, _LEASED, now, limit)
+            ).fetchall()
+            db.executemany(
+                "UPDATE frontier SET state = ?, worker = ?, lease_until = ? WHERE url = ?",
+                [(_LEASED, worker, now + self.lease_timeout, url) for url, _ in leased]
+            )
+
+        return leased
+
+    def complete(
+        self,
+        worker: str,
+        url: str,
+        counts: Mapping[str, int],
+        links: Iterable[str] = (),
+        depth: int = 0
+    ) -> bool:
+        with self._transaction() as db:
+            held = db.execute(
+                "SELECT 1 FROM frontier WHERE url = ? AND state = ? AND worker = ?",
+                (url, _LEASED, worker)
+            ).fetchone()
+            if held is None:
+                return False
+
+            self._add_counts(counts)
+            db.execute(
+                "UPDATE frontier SET state = ?, worker = NULL, lease_until = NULL "
+                "WHERE url = ?",
+                (_DONE, url)
+            )
+            self.__schedule(links, depth)
+
+        return True
+
+    def release(self, worker: str, url: str) -> None:
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE frontier SET state = ?, worker = NULL, lease_until = NULL "
+                "WHERE url = ? AND state = ? AND worker = ?",
+                (_QUEUED, url, _LEASED, worker)
+            )
+
+    def pending(self) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM frontier WHERE state != ?", (_DONE,)
+        ).fetchone()[0]
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __schedule(self, urls: Iterable[str], depth: int) -> int:
+        before = self._db.total_changes
+        self._db.executemany(
+            "INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)",
+            [(url, depth) for url in urls]
+        )
+        return self._db.total_changes - before
+
+
+def get_coordinator(
+    path: str,
+    lease_timeout: float = DEFAULT_LEASE_TIMEOUT
+) -> CrawlCoordinator:
+    """
+    Coordinator in the SQLite file at `path`, shared by the workers of
+    one host.
+    """
+
+    if "://" in path:
+        raise ValueError(f"Coordinator not supported: {path}")
+
+    return SqliteCoordinator(path, lease_timeout)
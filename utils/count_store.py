@@ -0,0 +1,303 @@
+# utils/count_store.py
+
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from contextlib import contextmanager
+
+from utils.file_lock import FileLock
+from utils.vocabulary import Vocabulary
+
+WORD_COUNTS_PATH = "word-counts.json"
+WORD_COUNTS_DB = "word-counts.sqlite3"
+
+# stored word counts kept in memory between updates: path -> (file stamp, vocabulary)
+_json_vocabularies: dict[str, tuple[tuple, Vocabulary]] = {}
+
+
+class CountStore(ABC):
+    """Stored word counts, updated with per-page counts."""
+
+    @abstractmethod
+    def update(self, counts: Mapping[str, int]) -> None:
+        """Adds `counts`; negative counts subtract, if the store supports it."""
+        pass
+
+    @abstractmethod
+    def items(self) -> Iterable[tuple[str, int]]:
+        """(word, count) of the stored words."""
+        pass
+
+    @property
+    def top_limit(self) -> int | None:
+        """
+        Number of most frequent words `items` is limited to, or None if
+        it lists every stored word.
+        """
+        return None
+
+    def close(self) -> None:
+        pass
+
+    # ========================
+    # support for java-style
+    # "try with resources"
+    # ========================
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+
+class JsonCountStore(CountStore):
+    """
+    Exact counts in a JSON object file, word -> count.
+    Words dropping to zero are removed. The counts stay in memory as a
+    `Vocabulary` between writes, also across instances for one path;
+    the file is only read again when something else has changed it.
+
+    Updates are summed in memory and merged into the file every
+    `flush_every` updates (pages), on `flush`, before `items` and on
+    close, so a crawl rewrites the file once per batch of pages instead
+    of once per page. The file is streamed from the vocabulary without
+    a dict of all words. Merges hold a lock file next to `path` from
+    reading to writing, and the file is replaced by an atomic rename, so
+    processes sharing it neither lose updates nor read it half-written;
+    see `SqliteCountStore` for many writers.
+    """
+
+    def __init__(self, path: str = WORD_COUNTS_PATH, flush_every: int = 100):
+        if flush_every < 1:
+            raise ValueError(f"Flush interval must be positive: {flush_every}")
+
+        self.path = path
+        self.flush_every = flush_every
+        self._pending = Counter()
+        self._updates = 0
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        self._pending.update(counts)
+        self._updates += 1
+        if self._updates >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Merges the buffered updates into the file."""
+
+        if not self._updates:
+            return
+
+        with FileLock(f"{self.path}.lock"):
+            vocabulary = self.__vocabulary()
+            vocabulary.update(self._pending)
+
+            temp = f"{self.path}.tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                self.__write(vocabulary, f)
+            os.replace(temp, self.path)
+
+            _json_vocabularies[os.path.abspath(self.path)] = (
+                self.__file_stamp(), vocabulary
+            )
+
+        self._pending = Counter()
+        self._updates = 0
+
+    def items(self) -> Iterable[tuple[str, int]]:
+        self.flush()
+        return self.__vocabulary().items()
+
+    def close(self) -> None:
+        self.flush()
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    @staticmethod
+    def __write(vocabulary: Vocabulary, f) -> None:
+        """Writes the layout of json.dump(..., indent=2), item by item."""
+
+        separator = "{"
+        for term, count in vocabulary.items():
+            f.write(f"{separator}\n  {json.dumps(term, ensure_ascii=False)}: {count}")
+            separator = ","
+        f.write("{}" if separator == "{" else "\n}")
+
+    def __vocabulary(self) -> Vocabulary:
+        cached = _json_vocabularies.get(os.path.abspath(self.path))
+        stamp = self.__file_stamp()
+        if cached is not None and stamp is not None and cached[0] == stamp:
+            return cached[1]
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return Vocabulary.from_dict(json.load(f))
+        except (FileNotFoundError, IOError):
+            return Vocabulary()
+
+    def __file_stamp(self) -> tuple | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        # a rename by another process gives a new inode, even within one mtime tick
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class SqliteCountStore(CountStore):
+    """
+    Exact counts in an SQLite table in WAL mode, for many processes
+    counting into one store at once.
+
+    Each update is one short write transaction upserting only the words
+    it has, instead of a rewrite of all counts, and readers aren't
+    blocked by writers. Words dropping to zero are removed.
+    """
+
+    def __init__(self, path: str = WORD_COUNTS_DB, timeout: float = 60):
+        self.path = path
+        # may be handed to other threads, e.g. inside a SynchronizedCountStore
+        self._db = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS counts "
+            "(word TEXT PRIMARY KEY, count INTEGER NOT NULL) WITHOUT ROWID"
+        )
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        if any(counts.values()):
+            with self._transaction():
+                self._add_counts(counts)
+
+    def items(self) -> Iterable[tuple[str, int]]:
+        return self._db.execute(
+            "SELECT word, count FROM counts WHERE count > 0").fetchall()
+
+    def close(self) -> None:
+        self._db.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction, committed unless the block raises."""
+
+        # IMMEDIATE takes the write lock upfront, a read lock can't be upgraded while waiting
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _add_counts(self, counts: Mapping[str, int]) -> None:
+        """Upserts `counts` inside an open `_transaction`."""
+
+        rows = [(word, count) for word, count in counts.items() if count]
+        self._db.executemany(
+            "INSERT INTO counts (word, count) VALUES (?1, MAX(?2, 0)) "
+            "ON CONFLICT (word) DO UPDATE SET count = MAX(count + ?2, 0)",
+            rows
+        )
+        if any(count < 0 for _, count in rows):
+            self._db.execute("DELETE FROM counts WHERE count = 0")
+
+
+class SynchronizedCountStore(CountStore):
+    """Serializes the use of `store` by several threads."""
+
+    def __init__(self, store: CountStore):
+        self.store = store
+        self._lock = threading.Lock()
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        with self._lock:
+            self.store.update(counts)
+
+    def items(self) -> Iterable[tuple[str, int]]:
+        with self._lock:
+            return list(self.store.items())
+
+    def close(self) -> None:
+        with self._lock:
+            self.store.close()
+
+
+class BufferedCountStore(CountStore):
+    """
+    Sums updates in memory and adds them to `store` every `flush_every`
+    updates (pages), on `flush`, before `items` and on close, e.g. one per
+    crawl thread in front of a shared `SynchronizedCountStore`, so the
+    threads take its lock once per batch of pages. `store` isn't closed.
+    """
+
+    def __init__(self, store: CountStore, flush_every: int = 100):
+        if flush_every < 1:
+            raise ValueError(f"Flush interval must be positive: {flush_every}")
+
+        self.store = store
+        self.flush_every = flush_every
+        self._pending = Counter()
+        self._updates = 0
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        self._pending.update(counts)
+        self._updates += 1
+        if self._updates >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Adds the buffered updates to `store`."""
+
+        if self._updates:
+            self.store.update(self._pending)
+            self._pending = Counter()
+            self._updates = 0
+
+    def items(self) -> Iterable[tuple[str, int]]:
+        self.flush()
+        return self.store.items()
+
+    @property
+    def top_limit(self) -> int | None:
+        return self.store.top_limit
+
+    def close(self) -> None:
+        self.flush()
+
+
+def get_count_store(
+    kind: str = "json",
+    path: str | None = None,
+    epsilon: float | None = None,
+    delta: float | None = None,
+    top: int | None = None
+) -> CountStore:
+    """
+    Creates a word count store: 'json' (exact, word-counts.json),
+    'sqlite' (exact, word-counts.sqlite3, for parallel processes) or
+    'sketch' (approximate in fixed memory, word-counts.sketch.npz).
+    `epsilon`, `delta` and `top` only configure the sketch,
+    see `SketchCountStore`.
+    """
+
+    if kind == "json":
+        return JsonCountStore(path or WORD_COUNTS_PATH)
+
+    if kind == "sqlite":
+        return SqliteCountStore(path or WORD_COUNTS_DB)
+
+    if kind == "sketch":
+        from utils.sketch import SKETCH_PATH, SketchCountStore
+        return SketchCountStore(path or SKETCH_PATH, epsilon, delta, top)
+
+    raise ValueError(
+        "The only supported count stores are 'json', 'sqlite' and 'sketch'")
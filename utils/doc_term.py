@@ -0,0 +1,256 @@
+# utils/doc_term.py
+
+import json
+from array import array
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from utils.lang_tables import get_language_table
+
+
+class DocTermMatrix:
+    """
+    Sparse document-term count matrix in CSR layout.
+
+    Rows are documents (crawled pages), columns are integer term IDs.
+    Documents are appended one by one into growable typed arrays
+    (int32 term IDs and counts, int64 row pointers), so a large crawl is
+    never held as Python dicts. The `.npz` layout is the one of
+    `scipy.sparse.save_npz`, with `terms` and `docs` stored alongside.
+    """
+
+    def __init__(self):
+        self.terms: list[str] = []
+        self.term_ids: dict[str, int] = {}
+        self.docs: list[str] = []
+
+        self._indptr = array("q", [0])
+        self._indices = array("i")
+        self._data = array("i")
+        self._zipf: dict[str, np.ndarray] = {}
+
+        # consolidated arrays, valid until the next document is added
+        self._csr: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+        self._rows: np.ndarray | None = None
+
+    def add_document(self, doc: str, counts: Mapping[str, int]) -> None:
+        self._csr = self._rows = None
+        for term, value in counts.items():
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                term_id = len(self.terms)
+                self.term_ids[term] = term_id
+                self.terms.append(term)
+
+            self._indices.append(term_id)
+            self._data.append(value)
+
+        self._indptr.append(len(self._indices))
+        self.docs.append(doc)
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "DocTermMatrix":
+        """
+        Builds the matrix from page records streamed with --pages-out.
+        Full count vectors (--pages-top 0) are needed for exact analysis,
+        records with top words only contribute those words.
+        """
+
+        matrix = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                counts = record.get("counts") or dict(record.get("top", []))
+                matrix.add_document(record["url"], counts)
+
+        return matrix
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.docs), len(self.terms)
+
+    def csr(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (data, indices, indptr) arrays, read-only.
+        They're copies, as the growable buffers can't be resized while
+        NumPy views of them are alive, made once and reused by every
+        analysis until the next `add_document`.
+        """
+
+        if self._csr is None:
+            arrays = (
+                np.array(self._data, dtype=np.int32),
+                np.array(self._indices, dtype=np.int32),
+                np.array(self._indptr, dtype=np.int64),
+            )
+            for a in arrays:
+                a.setflags(write=False)
+            self._csr = arrays
+
+        return self._csr
+
+    def to_scipy(self):
+        """Counts as scipy.sparse.csr_matrix; requires SciPy."""
+
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError as exc:
+            raise ImportError("to_scipy requires the 'scipy' package") from exc
+
+        return csr_matrix(self.csr(), shape=self.shape)
+
+    def term_totals(self) -> np.ndarray:
+        """Corpus-wide count of every term."""
+        data, indices, _ = self.csr()
+        return np.bincount(
+            indices, weights=data, minlength=len(self.terms)
+        ).astype(np.int64)
+
+    def document_frequencies(self) -> np.ndarray:
+        _, indices, _ = self.csr()
+        return np.bincount(indices, minlength=len(self.terms))
+
+    def tfidf(self) -> np.ndarray:
+        """TF-IDF weights as float32, aligned with the CSR `data` array."""
+
+        data, indices, _ = self.csr()
+        rows = self.__rows()
+        doc_lengths = np.bincount(rows, weights=data, minlength=len(self.docs))
+
+        idf = np.log(len(self.docs) / self.document_frequencies().clip(min=1))
+        return (data / doc_lengths[rows] * idf[indices]).astype(np.float32)
+
+    def zipf(self, lang: str = "en") -> np.ndarray:
+        """Language frequency (zipf scale) of every term, cached per language."""
+
+        cached = self._zipf.get(lang)
+        if cached is None or len(cached) < len(self.terms):
+            table = get_language_table(lang)
+            cached = table.lookup(self.terms).astype(np.float32)
+            self._zipf[lang] = cached
+
+        return cached[:len(self.terms)]
+
+    def article_analysis(self, count: int, lang: str = "en") -> pd.DataFrame:
+        """Corpus-wide top `count` words by wiki frequency."""
+        wiki_freq = self.term_totals() / 1000
+        return self.__top_words(wiki_freq, wiki_freq, count, lang)
+
+    def language_analysis(self, count: int, lang: str = "en") -> pd.DataFrame:
+        """Corpus-wide top `count` words by language frequency."""
+        wiki_freq = self.term_totals() / 1000
+        return self.__top_words(self.zipf(lang), wiki_freq, count, lang)
+
+    def lang_confidence_scores(
+        self,
+        k: int,
+        mode: str = "article",
+        lang: str = "en"
+    ) -> np.ndarray:
+        """
+        Language confidence score (0-100) of every document at once:
+        100 * sum(min(rel_freq, wiki_freq)) / sum(wiki_freq) over the top `k`
+        words of the document, ordered by wiki count ('article') or by
+        language frequency ('language').
+        """
+
+        if mode not in ("article", "language"):
+            raise ValueError(
+                "The only supported analysis modes are 'article' and 'language'")
+
+        data, indices, indptr = self.csr()
+        rows = self.__rows()
+        wiki_freq = data / 1000
+        rel_freq = self.zipf(lang)[indices]
+        key = wiki_freq if mode == "article" else rel_freq
+
+        # one sort for all documents: by row, then by descending key
+        order = np.lexsort((-key, rows))
+        rank = np.arange(len(order)) - indptr[rows[order]]
+        keep = order[rank < k]
+
+        matched = np.bincount(
+            rows[keep],
+            weights=np.minimum(rel_freq[keep], wiki_freq[keep]),
+            minlength=len(self.docs)
+        )
+        total = np.bincount(
+            rows[keep], weights=wiki_freq[keep], minlength=len(self.docs)
+        )
+
+        scores = np.zeros(len(self.docs), dtype=np.float64)
+        np.divide(100.0 * matched, total, out=scores, where=total > 1e-11)
+        return scores
+
+    def save(self, path: str) -> None:
+        data, indices, indptr = self.csr()
+        np.savez_compressed(
+            path,
+            data=data,
+            indices=indices,
+            indptr=indptr,
+            shape=np.array(self.shape),
+            format=np.array("csr"),
+            terms=np.array(self.terms, dtype=str),
+            docs=np.array(self.docs, dtype=str)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "DocTermMatrix":
+        matrix = cls()
+
+        with np.load(path) as stored:
+            matrix.terms = stored["terms"].tolist()
+            matrix.docs = stored["docs"].tolist()
+            matrix._data = array("i", stored["data"].astype(np.int32).tobytes())
+            matrix._indices = array("i", stored["indices"].astype(np.int32).tobytes())
+            matrix._indptr = array("q", stored["indptr"].astype(np.int64).tobytes())
+
+        matrix.term_ids = {term: i for i, term in enumerate(matrix.terms)}
+        return matrix
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __rows(self) -> np.ndarray:
+        """Row index of every stored entry."""
+
+        if self._rows is None:
+            _, _, indptr = self.csr()
+            self._rows = np.repeat(
+                np.arange(len(self.docs), dtype=np.int64), np.diff(indptr)
+            )
+            self._rows.setflags(write=False)
+
+        return self._rows
+
+    def __top_words(
+        self,
+        key: np.ndarray,
+        wiki_freq: np.ndarray,
+        count: int,
+        lang: str
+    ) -> pd.DataFrame:
+        count = min(count, len(self.terms))
+        top = []
+        if count:
+            # words tied at the cutoff are taken in term ID order, like the
+            # stable mergesort in text_utils, not as argpartition leaves them
+            cutoff = -np.partition(-key, count - 1)[count - 1]
+            above = np.flatnonzero(key > cutoff)
+            ties = np.flatnonzero(key == cutoff)[:count - len(above)]
+            top = np.concatenate([above, ties])
+
+        top = sorted(top, key=lambda i: (-key[i], i))
+        words = [self.terms[i] for i in top]
+
+        return pd.DataFrame({
+            "word": words,
+            "rel_freq": get_language_table(lang).lookup(words),
+            "wiki_freq": [round(float(wiki_freq[i]), 2) for i in top],
+        })
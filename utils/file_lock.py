@@ -0,0 +1,68 @@
+# utils/file_lock.py
+
+import os
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    Exclusive lock shared by processes through the lock file `path`,
+    created if missing. `acquire` blocks until every other holder has
+    released it. The lock is advisory: it only orders code that takes it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        if self._fd is not None:
+            raise RuntimeError(f"Lock '{self.path}' is already held")
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.name == "nt":
+                # LK_LOCK gives up after ~10 s of retrying, so it's retried again
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+
+        try:
+            if os.name == "nt":
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    # ========================
+    # support for java-style
+    # "try with resources"
+    # ========================
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
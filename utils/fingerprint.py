@@ -0,0 +1,200 @@
+# utils/fingerprint.py
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from utils.file_lock import FileLock
+
+# SimHash features are shingles of this many consecutive words
+_SHINGLE = 3
+
+
+def content_hash(text: str) -> str:
+    """Hex BLAKE2b digest of `text` with whitespace runs collapsed."""
+    normalized = " ".join(text.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash of the word shingles of `text`. Texts differing in a
+    few words get fingerprints differing in a few bits.
+    """
+
+    words = text.split()
+    shingles = [
+        " ".join(words[i:i + _SHINGLE])
+        for i in range(max(len(words) - _SHINGLE + 1, 1))
+    ]
+    digests = b"".join(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        for shingle in shingles
+    )
+    bits = np.unpackbits(
+        np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8),
+        axis=1,
+        bitorder="little"
+    )
+
+    # every bit set by more than half of the shingles is set in the fingerprint
+    majority = 2 * bits.sum(axis=0, dtype=np.int64) > len(bits)
+    return int.from_bytes(np.packbits(majority, bitorder="little").tobytes(), "little")
+
+
+class FingerprintIndex:
+    """
+    Fingerprints of page texts, to skip duplicate pages before counting.
+
+    A page duplicates an earlier page of another URL if its text is equal
+    up to whitespace (content hash) or, with `near_distance`, if their
+    SimHashes differ in at most that many bits. Near duplicates are found
+    through `near_distance + 1` bands of the 64 bits: fingerprints that
+    close are equal in at least one band. Every URL has one SimHash, the
+    one of its latest checked text.
+
+    The index is loaded from `path` (JSON) if it exists and saved there on
+    close, merged under a lock with what other processes have saved since.
+    """
+
+    def __init__(self, path: str | None = None, near_distance: int | None = None):
+        if near_distance is not None and not 0 <= near_distance < 8:
+            raise ValueError(
+                f"Near-duplicate distance must be between 0 and 7 bits: {near_distance}")
+
+        self.path = path
+        self.near_distance = near_distance
+        self.exact: dict[str, str] = {}         # content hash -> URL
+        self.near: list[tuple[int, str]] = []   # (SimHash, URL)
+        self._near_ids: dict[str, int] = {}     # URL -> index into `near`
+        self._bands: list[dict[int, list[int]]] = []
+        self._band_masks = self.__band_masks()
+
+        if path and os.path.exists(path):
+            self.__merge(self.__read(path))
+
+    def check(self, url: str, text: str) -> str | None:
+        """
+        URL of an earlier page `text` duplicates, or None; then the page
+        is added to the index. A page never duplicates its own URL.
+        """
+
+        digest = content_hash(text)
+        first = self.exact.setdefault(digest, url)
+        if first != url:
+            return first
+
+        if self.near_distance is None:
+            return None
+
+        fingerprint = simhash(text)
+        similar = self.__similar(fingerprint, url)
+        if similar is None:
+            self.__set_near(fingerprint, url)
+        return similar
+
+    def save(self) -> None:
+        """Writes the index atomically, merged with the file as it is now."""
+
+        if not self.path:
+            return
+
+        with FileLock(f"{self.path}.lock"):
+            if os.path.exists(self.path):
+                self.__merge(self.__read(self.path))
+
+            temp = f"{self.path}.tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump({
+                    "exact": self.exact,
+                    "near": [[f"{fingerprint:016x}", url] for fingerprint, url in self.near],
+                }, f, ensure_ascii=False)
+            os.replace(temp, self.path)
+
+    def close(self) -> None:
+        self.save()
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __band_masks(self) -> list[tuple[int, int]]:
+        """(shift, mask) of each band, 64 bits split as evenly as possible."""
+
+        if self.near_distance is None:
+            return []
+
+        bands = self.near_distance + 1
+        bounds = [64 * i // bands for i in range(bands + 1)]
+        return [
+            (start, (1 << (end - start)) - 1)
+            for start, end in zip(bounds, bounds[1:])
+        ]
+
+    def __similar(self, fingerprint: int, url: str) -> str | None:
+        for band, (shift, mask) in zip(self._bands, self._band_masks):
+            for index in band.get((fingerprint >> shift) & mask, []):
+                other, other_url = self.near[index]
+                if (
+                    other_url != url
+                    and (fingerprint ^ other).bit_count() <= self.near_distance
+                ):
+                    return other_url
+
+        return None
+
+    def __set_near(self, fingerprint: int, url: str) -> None:
+        """Indexes the SimHash of `url`, replacing its previous one."""
+
+        if not self._bands:
+            self._bands = [{} for _ in self._band_masks]
+
+        index = self._near_ids.get(url)
+        if index is None:
+            index = self._near_ids[url] = len(self.near)
+            self.near.append((fingerprint, url))
+        else:
+            previous, _ = self.near[index]
+            if previous == fingerprint:
+                return
+
+            for band, (shift, mask) in zip(self._bands, self._band_masks):
+                key = (previous >> shift) & mask
+                band[key].remove(index)
+                if not band[key]:
+                    del band[key]
+            self.near[index] = (fingerprint, url)
+
+        for band, (shift, mask) in zip(self._bands, self._band_masks):
+            band.setdefault((fingerprint >> shift) & mask, []).append(index)
+
+    def __merge(self, data: dict) -> None:
+        """Adds entries of a saved index; URLs indexed here keep their entry."""
+
+        for digest, url in data.get("exact", {}).items():
+            self.exact.setdefault(digest, url)
+
+        for fingerprint, url in data.get("near", []):
+            if url not in self._near_ids:
+                self.__set_near(int(fingerprint, 16), url)
+
+    @staticmethod
+    def __read(path: str) -> dict:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # ========================
+    # support for java-style
+    # "try with resources"
+    # ========================
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __enter__(self):
+        return self
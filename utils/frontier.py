@@ -0,0 +1,163 @@
+# utils/frontier.py
+
+import heapq
+import re
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import count
+
+
+class Frontier(ABC):
+    """
+    Crawl frontier - decides which discovered page is fetched next.
+    Every phrase is accepted only once; repeated links are reported
+    to the scheduler as additional in-links.
+    """
+
+    def __init__(self):
+        self.seen: set[str] = set()
+
+    @abstractmethod
+    def add(self, phrase: str, depth: int, parent_yield: float = 0.0) -> bool:
+        """
+        Schedules `phrase` found at `depth`.
+        `parent_yield` is the share of new vocabulary of the linking page.
+        Returns True if the phrase was not seen before.
+        """
+        pass
+
+    @abstractmethod
+    def pop(self) -> tuple[str, int]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class FifoFrontier(Frontier):
+    """Plain BFS order."""
+
+    def __init__(self):
+        super().__init__()
+        self.queue: deque[tuple[str, int]] = deque()
+
+    def add(self, phrase: str, depth: int, parent_yield: float = 0.0) -> bool:
+        if phrase in self.seen:
+            return False
+
+        self.seen.add(phrase)
+        self.queue.append((phrase, depth))
+        return True
+
+    def pop(self) -> tuple[str, int]:
+        return self.queue.popleft()
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+
+class PriorityFrontier(Frontier):
+    """
+    Best-first order. A page score grows with its in-link count and with
+    the vocabulary yield of the pages linking to it; titles matching a
+    penalty pattern are pushed back. Ties are broken by depth, then by
+    discovery order, so with no signal it degrades to BFS. Titles are
+    read from URLs after `article_path`.
+    """
+
+    def __init__(
+        self,
+        in_link_weight: float = 1.0,
+        yield_weight: float = 10.0,
+        title_penalties: dict[str, float] | None = None,
+        article_path: str = "/wiki/"
+    ):
+        super().__init__()
+        self.in_link_weight = in_link_weight
+        self.yield_weight = yield_weight
+        self.article_path = article_path
+        self.title_penalties = [
+            (re.compile(pattern, re.IGNORECASE), penalty)
+            for pattern, penalty in (title_penalties or {}).items()
+        ]
+
+        self.heap: list[tuple[float, int, int, str]] = []
+        self.pending: dict[str, list] = {}  # phrase -> [depth, in_links, best_yield, penalty]
+        self.order = count()
+
+    def add(self, phrase: str, depth: int, parent_yield: float = 0.0) -> bool:
+        entry = self.pending.get(phrase)
+
+        if entry is not None:
+            entry[1] += 1
+            entry[2] = max(entry[2], parent_yield)
+            self.__push(phrase)
+            return False
+
+        if phrase in self.seen:
+            return False
+
+        self.seen.add(phrase)
+        self.pending[phrase] = [depth, 1, parent_yield, self.__penalty(phrase)]
+        self.__push(phrase)
+        return True
+
+    def pop(self) -> tuple[str, int]:
+        while self.heap:
+            neg_score, depth, _, phrase = heapq.heappop(self.heap)
+            entry = self.pending.get(phrase)
+
+            # stale heap entry of an already popped or re-scored page
+            if entry is None or -neg_score != self.score(phrase):
+                continue
+
+            del self.pending[phrase]
+            return phrase, depth
+
+        raise IndexError("pop from an empty frontier")
+
+    def score(self, phrase: str) -> float:
+        _, in_links, best_yield, penalty = self.pending[phrase]
+        return (
+            self.in_link_weight * in_links
+            + self.yield_weight * best_yield
+            - penalty
+        )
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __push(self, phrase: str) -> None:
+        depth = self.pending[phrase][0]
+        heapq.heappush(
+            self.heap,
+            (-self.score(phrase), depth, next(self.order), phrase)
+        )
+
+    def __penalty(self, phrase: str) -> float:
+        title = phrase.rsplit(self.article_path, 1)[-1]
+        return sum(
+            penalty for pattern, penalty in self.title_penalties
+            if pattern.search(title)
+        )
+
+
+def get_frontier(
+    kind: str = "bfs",
+    title_penalties: dict[str, float] | None = None,
+    article_path: str = "/wiki/"
+) -> Frontier:
+    if kind == "bfs":
+        return FifoFrontier()
+    elif kind == "priority":
+        return PriorityFrontier(
+            title_penalties=title_penalties,
+            article_path=article_path
+        )
+    else:
+        raise ValueError("The only supported frontiers are 'bfs' and 'priority'")
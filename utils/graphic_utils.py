@@ -1,16 +1,165 @@
 # utils/graphic_utils.py
 
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
+
+CHART_FORMATS = ("png", "svg")
+
+# renderer of a ProcessPoolExecutor worker, created by its initializer
+_worker_renderer = None
+
+
+class ChartRenderer:
+    """
+    Headless renderer of word frequency charts.
+
+    Matplotlib is imported on first use with the Agg backend, and charts
+    are drawn on an Agg canvas directly, so no GUI backend is loaded and
+    no figures pile up in pyplot. One figure is reused for every chart.
+    Above `label_limit` bars, only every n-th pair of bars gets value labels.
+    """
+
+    def __init__(
+        self,
+        fmt: str = "png",
+        label_limit: int = 30,
+        dpi: int = 100
+    ):
+        if fmt not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format: {fmt}")
+        if label_limit < 1:
+            raise ValueError(f"Label limit must be positive: {label_limit}")
+
+        self.fmt = fmt
+        self.label_limit = label_limit
+        self.dpi = dpi
+        self._figure = None
+
+    def render(
+        self,
+        data: pd.DataFrame,
+        path: str,
+        title: str = "Frequencies of some words from the wiki"
+    ) -> str:
+        """
+        Draws the chart of the data and saves it to `path`.
+        The format's extension is appended when `path` has none.
+        Returns the path written.
+        """
+
+        _validate(data)
+        if not os.path.splitext(path)[1]:
+            path = f"{path}.{self.fmt}"
+
+        words = data["word"].to_numpy()
+        wiki_counts = data["wiki_freq"].to_numpy()
+        rel_counts = data["rel_freq"].to_numpy()
+
+        x = np.arange(len(words))
+        width = 0.35
+
+        fig = self.__figure()
+        fig.set_size_inches(max(10, len(words) * 0.6), 6)
+        ax = fig.add_subplot()
+
+        rects1 = ax.bar(
+            x - width / 2,
+            wiki_counts,
+            width,
+            label="wiki",
+            color="#fdba45"
+        )
+
+        rects2 = ax.bar(
+            x + width / 2,
+            rel_counts,
+            width,
+            label="language",
+            color="#1e7a3a"
+        )
+
+        step = -(-len(words) // self.label_limit)
+        ax.bar_label(rects1, labels=self.__labels(wiki_counts, step), padding=3)
+        ax.bar_label(rects2, labels=self.__labels(rel_counts, step), padding=3)
+
+        ax.set_ylabel("Counts")
+        ax.set_title(title)
+        ax.set_xticks(x)
+        ax.set_xticklabels(words, rotation=60, ha="right")
+
+        ax.grid(True, which="major", axis="y", linestyle="--", alpha=0.6)
+        ax.legend(
+            loc="upper left",
+            bbox_to_anchor=(0, 1.07),
+            ncols=2,
+            frameon=False
+        )
+
+        fig.savefig(path, format=os.path.splitext(path)[1][1:] or self.fmt)
+        fig.clear()
+        return path
+
+    def render_many(
+        self,
+        charts: Iterable[tuple[pd.DataFrame, str]],
+        workers: int = 1
+    ) -> list[str]:
+        """
+        Renders (data, path) pairs, in this process or, with `workers` > 1,
+        in a pool of processes each reusing its own renderer.
+        Returns the paths written, in input order.
+        """
+
+        charts = list(charts)
+        workers = min(workers, len(charts))
+        if workers <= 1:
+            return [self.render(data, path) for data, path in charts]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.fmt, self.label_limit, self.dpi)
+        ) as pool:
+            return list(pool.map(_render_in_worker, charts))
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __figure(self):
+        if self._figure is None:
+            import matplotlib
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            matplotlib.use("Agg")
+            self._figure = Figure(layout="constrained", dpi=self.dpi)
+            FigureCanvasAgg(self._figure)
+
+        return self._figure
+
+    @staticmethod
+    def __labels(values: np.ndarray, step: int) -> list[str]:
+        return [
+            f"{value:g}" if i % step == 0 else ""
+            for i, value in enumerate(values)
+        ]
 
 
 def draw_chart(data: pd.DataFrame, path: str) -> None:
     """
     Draws and saves a chart of the data.
-    Expects DataFrame columns: 'word', 'rel_count', 'wiki_count'
+    Expects DataFrame columns: 'word', 'rel_freq', 'wiki_freq'
     """
 
+    ChartRenderer().render(data, path)
+
+
+def _validate(data: pd.DataFrame) -> None:
     if data.empty:
         raise ValueError("Empty DataFrame")
 
@@ -18,49 +167,11 @@ def draw_chart(data: pd.DataFrame, path: str) -> None:
     if not required_cols.issubset(data.columns):
         raise ValueError(f"DataFrame must contain columns: {required_cols}")
 
-    words = data["word"].to_numpy()
-    wiki_counts = data["wiki_freq"].to_numpy()
-    rel_counts = data["rel_freq"].to_numpy()
-
-    x = np.arange(len(words))
-    width = 0.35
-
-    fig, ax = plt.subplots(
-        layout="constrained",
-        figsize=(max(10, len(words) * 0.6), 6)
-    )
-
-    rects1 = ax.bar(
-        x - width / 2,
-        wiki_counts,
-        width,
-        label="wiki",
-        color="#fdba45"
-    )
-
-    rects2 = ax.bar(
-        x + width / 2,
-        rel_counts,
-        width,
-        label="language",
-        color="#1e7a3a"
-    )
-
-    ax.bar_label(rects1, padding=3)
-    ax.bar_label(rects2, padding=3)
-
-    ax.set_ylabel("Counts")
-    ax.set_title("Frequencies of some words from the wiki")
-    ax.set_xticks(x)
-    ax.set_xticklabels(words, rotation=60, ha="right")
-
-    ax.grid(True, which="major", axis="y", linestyle="--", alpha=0.6)
-    ax.legend(
-        loc="upper left",
-        bbox_to_anchor=(0, 1.07),
-        ncols=2,
-        frameon=False
-    )
-
-    plt.savefig(path)
-    plt.close()
+
+def _init_worker(fmt: str, label_limit: int, dpi: int) -> None:
+    global _worker_renderer
+    _worker_renderer = ChartRenderer(fmt, label_limit, dpi)
+
+
+def _render_in_worker(chart: tuple[pd.DataFrame, str]) -> str:
+    return _worker_renderer.render(*chart)
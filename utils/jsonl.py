@@ -0,0 +1,51 @@
+# utils/jsonl.py
+
+import json
+
+
+class JsonlWriter:
+    """
+    Streams records as JSON Lines (one JSON object per line).
+    Records are buffered and written every `buffer_size` records,
+    so memory stays bounded however long the stream gets.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 100, mode: str = "w"):
+        if buffer_size < 1:
+            raise ValueError(f"Buffer size must be positive: {buffer_size}")
+
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer: list[str] = []
+        self.written = 0
+        self._file = open(path, mode, encoding="utf-8")
+
+    def write(self, record: dict) -> None:
+        self.buffer.append(json.dumps(record, ensure_ascii=False))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self._file.write("\n".join(self.buffer) + "\n")
+            self.written += len(self.buffer)
+            self.buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+
+        self.flush()
+        self._file.close()
+
+    # ========================
+    # support for java-style
+    # "try with resources"
+    # ========================
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __enter__(self):
+        return self
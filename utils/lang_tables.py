@@ -0,0 +1,167 @@
+# utils/lang_tables.py
+
+import hashlib
+import os
+from collections.abc import Iterable
+from functools import lru_cache
+
+import numpy as np
+
+
+def _user_cache_dir() -> str:
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/AppData/Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "wikiscrapper", "lang-tables")
+
+
+# tables are shared by every run, so they're cached per user, not per directory
+LANG_TABLE_DIR = os.environ.get("WIKISCRAPPER_LANG_TABLES") or _user_cache_dir()
+
+# wordfreq lowercases these with dotted/dotless i rules instead of casefold()
+_SPECIAL_CASE_LANGS = ("tr", "az")
+
+
+def _word_hashes(words: list[bytes]) -> np.ndarray:
+    """64-bit BLAKE2b hashes of UTF-8 words, equal in every process."""
+    digests = b"".join(hashlib.blake2b(word, digest_size=8).digest() for word in words)
+    return np.frombuffer(digests, dtype="<u8")
+
+
+class LanguageTable:
+    """
+    Zipf frequencies of a language's whole wordfreq word list.
+
+    Words are kept as one UTF-8 blob with offsets, ordered by a 64-bit
+    hash, and frequencies as centi-zipf uint16 (zipf_frequency rounds to
+    2 decimals), so the `.npz` file of a language is a few MB, loads in a
+    fraction of a second and stays that size in memory. A word is found
+    by binary search of its hash and compared with the stored bytes.
+    Words missing from the list, which wordfreq may still split into
+    known tokens, fall back to zipf_frequency.
+    """
+
+    def __init__(
+        self,
+        lang: str,
+        hashes: np.ndarray,
+        offsets: np.ndarray,
+        blob: bytes,
+        centi_zipf: np.ndarray
+    ):
+        self.lang = lang
+        self.hashes = hashes            # sorted word hashes
+        self.offsets = offsets          # word i is blob[offsets[i]:offsets[i + 1]]
+        self.blob = blob
+        self.centi_zipf = centi_zipf
+        self._misses: dict[str, int] = {}
+        self._casefold = lang not in _SPECIAL_CASE_LANGS
+
+    @classmethod
+    def from_words(
+        cls,
+        lang: str,
+        words: list[str],
+        centi_zipf: np.ndarray
+    ) -> "LanguageTable":
+        encoded = [word.encode("utf-8") for word in words]
+        hashes = _word_hashes(encoded)
+        order = np.argsort(hashes, kind="stable")
+
+        encoded = [encoded[i] for i in order.tolist()]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(
+            np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)),
+            out=offsets[1:]
+        )
+
+        return cls(lang, hashes[order], offsets, b"".join(encoded), centi_zipf[order])
+
+    @classmethod
+    def build(cls, lang: str) -> "LanguageTable":
+        from wordfreq import available_languages, get_frequency_dict
+
+        if lang not in available_languages():
+            raise ValueError(f"Unsupported language: {lang}")
+
+        frequencies = get_frequency_dict(lang)
+        words = list(frequencies)
+        freqs = np.fromiter(frequencies.values(), dtype=np.float64, count=len(words))
+        centi_zipf = np.round((np.log10(freqs) + 9) * 100).clip(min=0)
+
+        return cls.from_words(lang, words, centi_zipf.astype(np.uint16))
+
+    def lookup(self, words: Iterable[str]) -> np.ndarray:
+        """Zipf frequency of every word, 0 for unknown words."""
+
+        words = list(words)
+        keys = [word.casefold() if self._casefold else word for word in words]
+        encoded = [key.encode("utf-8") for key in keys]
+        hashes = _word_hashes(encoded)
+
+        centi = np.zeros(len(words), dtype=np.float64)
+        if len(self.hashes):
+            slots = np.searchsorted(self.hashes, hashes).clip(max=len(self.hashes) - 1)
+            candidates = np.flatnonzero(self.hashes[slots] == hashes)
+            starts = self.offsets[slots[candidates]].tolist()
+            ends = self.offsets[slots[candidates] + 1].tolist()
+
+            found = np.zeros(len(words), dtype=bool)
+            for i, start, end in zip(candidates.tolist(), starts, ends):
+                found[i] = self.blob[start:end] == encoded[i]
+            centi[found] = self.centi_zipf[slots[found]]
+        else:
+            found = np.zeros(len(words), dtype=bool)
+
+        for i in np.flatnonzero(~found).tolist():
+            value = self._misses.get(keys[i])
+            if value is None:
+                from wordfreq import zipf_frequency
+                value = round(zipf_frequency(words[i], self.lang) * 100)
+                self._misses[keys[i]] = value
+            centi[i] = value
+
+        return centi / 100
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path,
+            lang=np.array(self.lang),
+            hashes=self.hashes,
+            offsets=self.offsets,
+            blob=np.frombuffer(self.blob, dtype=np.uint8),
+            centi_zipf=self.centi_zipf
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LanguageTable":
+        with np.load(path) as stored:
+            return cls(
+                str(stored["lang"]),
+                stored["hashes"],
+                stored["offsets"],
+                stored["blob"].tobytes(),
+                stored["centi_zipf"]
+            )
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+
+@lru_cache(maxsize=None)
+def get_language_table(lang: str, directory: str = LANG_TABLE_DIR) -> LanguageTable:
+    """
+    Table of `lang`, loaded once per process and shared by all analyses.
+    It's built from wordfreq and saved to `directory` on first use, by
+    default the user's cache directory or $WIKISCRAPPER_LANG_TABLES.
+    """
+
+    path = os.path.join(directory, f"{lang}.npz")
+    if os.path.exists(path):
+        return LanguageTable.load(path)
+
+    table = LanguageTable.build(lang)
+    os.makedirs(directory, exist_ok=True)
+    table.save(path)
+    return table
@@ -0,0 +1,197 @@
+# utils/link_graph.py
+
+from collections import Counter
+from collections.abc import Iterable
+
+import numpy as np
+
+
+class LinkGraph:
+    """
+    Link graph of a crawl, with the data needed to refresh it later.
+
+    Pages are keyed by dense integer IDs in discovery order. Outgoing links
+    and per-page word counts are kept as CSR arrays (row pointers + column
+    indices) when saved to `.npz`, together with page revisions, so an
+    incremental recrawl can subtract the old counts of a changed page.
+    """
+
+    NO_REVISION = -1
+
+    def __init__(self):
+        self.urls: list[str] = []
+        self.ids: dict[str, int] = {}
+        self.terms: list[str] = []
+        self.term_ids: dict[str, int] = {}
+
+        self.links: dict[int, np.ndarray] = {}
+        self.revisions: dict[int, int] = {}
+        self.counts: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    def page_id(self, url: str) -> int:
+        """Returns ID of the page, registering unknown pages."""
+
+        page_id = self.ids.get(url)
+        if page_id is None:
+            page_id = len(self.urls)
+            self.ids[url] = page_id
+            self.urls.append(url)
+
+        return page_id
+
+    def add_page(
+        self,
+        url: str,
+        links: list[str],
+        revision: int | None = None,
+        counts: Counter | None = None
+    ) -> None:
+        """Records a fetched page, replacing its previous state."""
+
+        page_id = self.page_id(url)
+        self.links[page_id] = np.fromiter(
+            (self.page_id(link) for link in links),
+            dtype=np.int32,
+            count=len(links)
+        )
+        self.revisions[page_id] = (
+            self.NO_REVISION if revision is None else revision
+        )
+
+        counts = counts or Counter()
+        self.counts[page_id] = (
+            np.fromiter(
+                (self.__term_id(term) for term in counts),
+                dtype=np.int32,
+                count=len(counts)
+            ),
+            np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        )
+
+    def fetched(self) -> list[str]:
+        """URLs of pages that were downloaded, in ID order."""
+        return [self.urls[page_id] for page_id in sorted(self.links)]
+
+    def revision(self, url: str) -> int | None:
+        revision = self.revisions.get(self.ids.get(url), self.NO_REVISION)
+        return None if revision == self.NO_REVISION else revision
+
+    def page_counts(self, url: str) -> Counter:
+        term_ids, values = self.counts.get(
+            self.ids.get(url),
+            (np.empty(0, np.int32), np.empty(0, np.int64))
+        )
+        return Counter({
+            self.terms[term_id]: int(value)
+            for term_id, value in zip(term_ids, values)
+        })
+
+    def out_links(self, url: str) -> list[str]:
+        return [
+            self.urls[page_id]
+            for page_id in self.links.get(self.ids.get(url), [])
+        ]
+
+    def drop_links(self, urls: Iterable[str]) -> None:
+        """Removes links to `urls`, e.g. to articles found to be missing."""
+
+        dropped = np.fromiter(
+            (self.ids[url] for url in urls if url in self.ids), dtype=np.int32)
+        if not len(dropped):
+            return
+
+        for page_id, links in self.links.items():
+            self.links[page_id] = links[~np.isin(links, dropped)]
+
+    def to_csr(self) -> tuple[np.ndarray, np.ndarray]:
+        """Adjacency of all pages as CSR (indptr, indices) arrays."""
+        return self.__rows_to_csr(self.links, np.int32)
+
+    def save(self, path: str) -> None:
+        indptr, indices = self.to_csr()
+
+        count_rows = {page_id: ids for page_id, (ids, _) in self.counts.items()}
+        value_rows = {page_id: vals for page_id, (_, vals) in self.counts.items()}
+        count_indptr, count_terms = self.__rows_to_csr(count_rows, np.int32)
+        _, count_values = self.__rows_to_csr(value_rows, np.int64)
+
+        revisions = np.full(len(self.urls), self.NO_REVISION, dtype=np.int64)
+        fetched = np.zeros(len(self.urls), dtype=bool)
+        for page_id, revision in self.revisions.items():
+            revisions[page_id] = revision
+            fetched[page_id] = True
+
+        np.savez_compressed(
+            path,
+            urls=np.array(self.urls, dtype=str),
+            terms=np.array(self.terms, dtype=str),
+            indptr=indptr,
+            indices=indices,
+            revisions=revisions,
+            fetched=fetched,
+            count_indptr=count_indptr,
+            count_terms=count_terms,
+            count_values=count_values
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LinkGraph":
+        graph = cls()
+
+        with np.load(path) as data:
+            graph.urls = data["urls"].tolist()
+            graph.terms = data["terms"].tolist()
+            indptr, indices = data["indptr"], data["indices"]
+            count_indptr = data["count_indptr"]
+            count_terms, count_values = data["count_terms"], data["count_values"]
+            revisions, fetched = data["revisions"], data["fetched"]
+
+        graph.ids = {url: i for i, url in enumerate(graph.urls)}
+        graph.term_ids = {term: i for i, term in enumerate(graph.terms)}
+
+        for page_id in np.flatnonzero(fetched).tolist():
+            start, end = indptr[page_id], indptr[page_id + 1]
+            graph.links[page_id] = indices[start:end].copy()
+            graph.revisions[page_id] = int(revisions[page_id])
+
+            start, end = count_indptr[page_id], count_indptr[page_id + 1]
+            graph.counts[page_id] = (
+                count_terms[start:end].copy(),
+                count_values[start:end].copy()
+            )
+
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __term_id(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.term_ids[term] = term_id
+            self.terms.append(term)
+
+        return term_id
+
+    def __rows_to_csr(
+        self,
+        rows: dict[int, np.ndarray],
+        dtype
+    ) -> tuple[np.ndarray, np.ndarray]:
+        lengths = np.zeros(len(self.urls), dtype=np.int64)
+        for page_id, row in rows.items():
+            lengths[page_id] = len(row)
+
+        indptr = np.zeros(len(self.urls) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+
+        data = np.empty(indptr[-1], dtype=dtype)
+        for page_id, row in rows.items():
+            data[indptr[page_id]:indptr[page_id + 1]] = row
+
+        return indptr, data
@@ -0,0 +1,210 @@
+# utils/metrics.py
+
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# fetch and flush latencies, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """Base of labelled metrics in OpenMetrics text exposition format."""
+
+    kind = "unknown"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        return [
+            f"# TYPE {self.name} {self.kind}",
+            f"# HELP {self.name} {self.help_text}",
+        ]
+
+    @staticmethod
+    def _labels(labels: tuple, extra: str = "") -> str:
+        parts = [f'{key}="{value}"' for key, value in labels]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def render(self) -> list[str]:
+        with self.lock:
+            values = dict(self.values)
+        return super().render() + [
+            f"{self.name}_total{self._labels(key)} {value}"
+            for key, value in values.items()
+        ]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self.values: dict[tuple, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = value
+
+    def render(self) -> list[str]:
+        with self.lock:
+            values = dict(self.values) or {(): 0.0}
+        return super().render() + [
+            f"{self.name}{self._labels(key)} {value}"
+            for key, value in values.items()
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets)
+        self.series: dict[tuple, list] = {}  # labels -> [bucket counts, sum, count]
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.series.setdefault(
+                key, [[0] * len(self.buckets), 0.0, 0]
+            )
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self.lock:
+            series = {key: (list(b), s, c) for key, (b, s, c) in self.series.items()}
+
+        for key, (buckets, total, count) in series.items():
+            cumulative = 0
+            for bound, hits in zip(self.buckets, buckets):
+                cumulative += hits
+                labels = self._labels(key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = self._labels(key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {total}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+
+        return lines
+
+
+class CrawlMetrics:
+    """Metrics of a running crawl, fed by `CrawlStats`."""
+
+    def __init__(self):
+        self.stage_seconds = Histogram(
+            "wikiscrapper_stage_seconds",
+            "Duration of crawl stages; 'network' is fetch latency, " +
+            "'persist' is count store update latency, batched writes included"
+        )
+        self.http_responses = Counter(
+            "wikiscrapper_http_responses",
+            "HTTP responses by status code"
+        )
+        self.events = Counter(
+            "wikiscrapper_events",
+            "Crawl counters: pages, bytes, words"
+        )
+        self.queue_depth = Gauge(
+            "wikiscrapper_queue_depth",
+            "Pages waiting in the crawl frontier"
+        )
+        self.visited = Gauge(
+            "wikiscrapper_visited_pages",
+            "Size of the visited set"
+        )
+        self.vocabulary = Gauge(
+            "wikiscrapper_vocabulary_size",
+            "Distinct words seen by the crawl"
+        )
+        self.metrics: list[Metric] = [
+            self.stage_seconds, self.http_responses, self.events,
+            self.queue_depth, self.visited, self.vocabulary
+        ]
+
+    def gauge(self, name: str) -> Gauge:
+        return {
+            "queue": self.queue_depth,
+            "visited": self.visited,
+            "vocabulary": self.vocabulary,
+        }[name]
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n# EOF\n"
+
+
+class MetricsServer:
+    """Serves `metrics` at http://host:port/metrics from a daemon thread."""
+
+    CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+    def __init__(self, metrics: CrawlMetrics, port: int, host: str = "127.0.0.1"):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", MetricsServer.CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            daemon=True
+        )
+
+    def start(self) -> "MetricsServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # ========================
+    # support for java-style
+    # "try with resources"
+    # ========================
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __enter__(self):
+        return self.start()
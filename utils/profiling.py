@@ -0,0 +1,64 @@
+# utils/profiling.py
+
+import cProfile
+import io
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+
+
+@contextmanager
+def profiled(path: str, memory: bool = False, top: int = 30):
+    """
+    Runs the block under cProfile and writes a text report to `path`:
+    the `top` functions by cumulative and by own time. Raw stats are saved
+    to `path`.prof for pstats/snakeviz. With `memory`, the `top` allocation
+    sites traced by tracemalloc are appended to the report.
+    """
+
+    if memory:
+        tracemalloc.start()
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot() if memory else None
+        peak = tracemalloc.get_traced_memory()[1] if memory else 0
+        if memory:
+            tracemalloc.stop()
+
+        profiler.dump_stats(f"{path}.prof")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(__cpu_report(profiler, top))
+            if snapshot is not None:
+                f.write(__memory_report(snapshot, peak, top))
+
+
+def __cpu_report(profiler: cProfile.Profile, top: int) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out).strip_dirs()
+
+    out.write(f"===== TOP {top} BY CUMULATIVE TIME =====\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    out.write(f"===== TOP {top} BY OWN TIME =====\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+
+    return out.getvalue()
+
+
+def __memory_report(snapshot: tracemalloc.Snapshot, peak: int, top: int) -> str:
+    lines = [
+        f"===== TOP {top} ALLOCATION SITES =====",
+        f"peak traced memory: {peak / 2 ** 20:.2f} MB",
+    ]
+    for i, stat in enumerate(snapshot.statistics("lineno")[:top], 1):
+        frame = stat.traceback[0]
+        lines.append(
+            f"{i:3}. {frame.filename}:{frame.lineno}: "
+            f"{stat.size / 1024:.1f} KiB in {stat.count} blocks"
+        )
+
+    return "\n".join(lines) + "\n"
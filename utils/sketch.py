@@ -0,0 +1,360 @@
+# utils/sketch.py
+
+import hashlib
+import heapq
+import math
+import os
+from collections.abc import Iterable, Mapping, Sequence
+
+import numpy as np
+
+from utils.count_store import CountStore
+from utils.file_lock import FileLock
+
+SKETCH_PATH = "word-counts.sketch.npz"
+
+DEFAULT_EPSILON = 1e-5
+DEFAULT_DELTA = 1e-3
+DEFAULT_TOP = 1000
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch of word counts in a fixed `depth` x `width` uint64
+    table, width = ceil(e / epsilon) and depth = ceil(ln(1 / delta)).
+
+    Estimates never undercount and, with probability 1 - delta, overcount
+    by at most epsilon * total. Words are hashed with keyed BLAKE2b rather
+    than Python's per-process salted hash, so sketches with equal
+    parameters built in different processes can be merged by adding
+    their tables.
+    """
+
+    def __init__(
+        self,
+        epsilon: float = DEFAULT_EPSILON,
+        delta: float = DEFAULT_DELTA,
+        seed: int = 0
+    ):
+        if not 0 < epsilon < 1:
+            raise ValueError(f"Sketch error must be between 0 and 1: {epsilon}")
+
+        if not 0 < delta < 1:
+            raise ValueError(f"Sketch failure probability must be between 0 and 1: {delta}")
+
+        self.epsilon = epsilon
+        self.delta = delta
+        self.seed = seed
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.table = np.zeros((self.depth, self.width), dtype=np.uint64)
+        self.total = 0
+
+    @property
+    def error(self) -> int:
+        """Overcount bound of every estimate, holding with probability 1 - delta."""
+        return math.ceil(self.epsilon * self.total)
+
+    def add(self, counts: Mapping[str, int]) -> None:
+        terms = list(counts)
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(terms))
+        if not len(terms):
+            return
+
+        if (values < 0).any():
+            raise ValueError("Approximate word counts can't be subtracted")
+
+        flat = self.table.reshape(-1)
+        columns = self.__columns(terms)
+        np.add.at(flat, columns.reshape(-1), np.tile(values, self.depth).astype(np.uint64))
+        self.total += int(values.sum())
+
+    def estimate(self, terms: Sequence[str]) -> np.ndarray:
+        """Estimated counts of `terms` as int64."""
+
+        if not len(terms):
+            return np.zeros(0, dtype=np.int64)
+
+        flat = self.table.reshape(-1)
+        return flat[self.__columns(terms)].min(axis=0).astype(np.int64)
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Only sketches with equal parameters can be merged")
+
+        self.table += other.table
+        self.total += other.total
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __columns(self, terms: Sequence[str]) -> np.ndarray:
+        """(depth, len(terms)) indices into the flattened table."""
+
+        key = self.seed.to_bytes(8, "little")
+        digests = b"".join(
+            hashlib.blake2b(term.encode("utf-8"), digest_size=16, key=key).digest()
+            for term in terms
+        )
+        hashes = np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+
+        # double hashing: row i uses h1 + i * h2
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        columns = (hashes[:, 0] + rows * (hashes[:, 1] | np.uint64(1))) % np.uint64(self.width)
+        return (columns + rows * np.uint64(self.width)).astype(np.int64)
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary of the `k` most frequent words.
+
+    A word not tracked yet replaces the tracked word with the smallest
+    count and inherits that count as its error, so tracked counts never
+    undercount and overcount by at most `error`. Every word more frequent
+    than total / k is tracked. Summaries are mergeable: words missing from
+    a full summary are assumed to have its smallest count.
+    """
+
+    def __init__(self, k: int = DEFAULT_TOP):
+        if k < 1:
+            raise ValueError(f"Number of tracked words must be positive: {k}")
+
+        self.k = k
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @classmethod
+    def from_counts(
+        cls,
+        k: int,
+        counts: Mapping[str, int],
+        errors: Mapping[str, int]
+    ) -> "SpaceSaving":
+        summary = cls(k)
+        summary.counts = dict(counts)
+        summary.errors = dict(errors)
+        summary.__rebuild()
+        return summary
+
+    @property
+    def floor(self) -> int:
+        """Upper bound of the count of every untracked word."""
+        if len(self.counts) < self.k:
+            return 0
+        return self.__minimum()[0]
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        for term, count in counts.items():
+            if count < 0:
+                raise ValueError("Approximate word counts can't be subtracted")
+            if count == 0:
+                continue
+
+            if term in self.counts:
+                self.counts[term] += count
+            elif len(self.counts) < self.k:
+                self.counts[term] = count
+                self.errors[term] = 0
+            else:
+                smallest, evicted = self.__minimum()
+                heapq.heappop(self._heap)
+                del self.counts[evicted]
+                del self.errors[evicted]
+                self.counts[term] = smallest + count
+                self.errors[term] = smallest
+
+            heapq.heappush(self._heap, (self.counts[term], term))
+
+        # entries of words counted again since are stale, they're dropped now and then
+        if len(self._heap) > 4 * self.k:
+            self.__rebuild()
+
+    def top(self, n: int | None = None) -> list[tuple[str, int, int]]:
+        """(word, count, error) of the `n` (default all) most frequent words."""
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return [(term, count, self.errors[term]) for term, count in ranked[:n]]
+
+    def merge(self, other: "SpaceSaving") -> None:
+        floor, other_floor = self.floor, other.floor
+
+        merged = {}
+        for term in self.counts.keys() | other.counts.keys():
+            merged[term] = (
+                self.counts.get(term, floor) + other.counts.get(term, other_floor),
+                self.errors.get(term, floor) + other.errors.get(term, other_floor)
+            )
+
+        kept = sorted(merged.items(), key=lambda item: (-item[1][0], item[0]))[:self.k]
+        self.counts = {term: count for term, (count, _) in kept}
+        self.errors = {term: error for term, (_, error) in kept}
+        self.__rebuild()
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __minimum(self) -> tuple[int, str]:
+        while self.counts.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def __rebuild(self) -> None:
+        self._heap = [(count, term) for term, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+
+class SketchCountStore(CountStore):
+    """
+    Approximate word counts in fixed memory: a `CountMinSketch` of every
+    word plus a `SpaceSaving` summary of the `top` most frequent ones.
+
+    Only the tracked words are listed by `items`, each with the smaller
+    of its two overcounting estimates, which is enough for the top `top`
+    words of the article analysis. Counts can't be subtracted.
+
+    The store is loaded from `path` (.npz) if it exists, taking its
+    parameters from there. On close, only the counts added by this
+    process are merged into the file as it is then, under a lock file,
+    so several worker processes can share one sketch file.
+    """
+
+    def __init__(
+        self,
+        path: str = SKETCH_PATH,
+        epsilon: float | None = None,
+        delta: float | None = None,
+        top: int | None = None
+    ):
+        self.path = path
+
+        if os.path.exists(path):
+            self.sketch, self.heavy = self.__load(path)
+            self.__check_parameters(epsilon, delta, top)
+        else:
+            self.sketch = CountMinSketch(epsilon or DEFAULT_EPSILON, delta or DEFAULT_DELTA)
+            self.heavy = SpaceSaving(top or DEFAULT_TOP)
+
+        # counts of this process only, merged into the file on close
+        self._added = self.__empty_like()
+        self._dirty = False
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        for sketch, heavy in (self._added, (self.sketch, self.heavy)):
+            sketch.add(counts)
+            heavy.update(counts)
+        self._dirty = True
+
+    def items(self) -> Iterable[tuple[str, int]]:
+        ranked = self.heavy.top()
+        estimates = self.sketch.estimate([term for term, _, _ in ranked])
+        items = [
+            (term, min(count, int(estimate)))
+            for (term, count, _), estimate in zip(ranked, estimates)
+        ]
+        return sorted(items, key=lambda item: -item[1])
+
+    @property
+    def top_limit(self) -> int:
+        return self.heavy.k
+
+    def merge(self, other: "SketchCountStore") -> None:
+        """Adds the counts of another store, e.g. one of another worker."""
+
+        self.sketch.merge(other.sketch)
+        self.heavy.merge(other.heavy)
+        self._added[0].merge(other.sketch)
+        self._added[1].merge(other.heavy)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Merges this process's counts into the file, written atomically."""
+
+        if not self._dirty:
+            return
+
+        with FileLock(f"{self.path}.lock"):
+            self.__merge_into_file()
+
+        self._added = self.__empty_like()
+        self._dirty = False
+
+    def close(self) -> None:
+        self.save()
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __merge_into_file(self) -> None:
+        if os.path.exists(self.path):
+            sketch, heavy = self.__load(self.path)
+            sketch.merge(self._added[0])
+            heavy.merge(self._added[1])
+        else:
+            sketch, heavy = self._added
+
+        temp = f"{self.path}.tmp.npz"
+        terms, counts, errors = zip(*heavy.top()) if len(heavy) else ((), (), ())
+        np.savez_compressed(
+            temp,
+            table=sketch.table,
+            total=np.array(sketch.total, dtype=np.uint64),
+            epsilon=np.array(sketch.epsilon),
+            delta=np.array(sketch.delta),
+            seed=np.array(sketch.seed),
+            k=np.array(heavy.k),
+            terms=np.frombuffer("\n".join(terms).encode("utf-8"), dtype=np.uint8),
+            counts=np.array(counts, dtype=np.int64),
+            errors=np.array(errors, dtype=np.int64)
+        )
+        os.replace(temp, self.path)
+
+        self.sketch, self.heavy = sketch, heavy
+
+    @staticmethod
+    def __load(path: str) -> tuple[CountMinSketch, SpaceSaving]:
+        with np.load(path) as stored:
+            sketch = CountMinSketch(
+                float(stored["epsilon"]),
+                float(stored["delta"]),
+                int(stored["seed"])
+            )
+            sketch.table = stored["table"].astype(np.uint64)
+            sketch.total = int(stored["total"])
+
+            blob = stored["terms"].tobytes().decode("utf-8")
+            terms = blob.split("\n") if blob else []
+            heavy = SpaceSaving.from_counts(
+                int(stored["k"]),
+                dict(zip(terms, stored["counts"].tolist())),
+                dict(zip(terms, stored["errors"].tolist()))
+            )
+
+        return sketch, heavy
+
+    def __check_parameters(
+        self,
+        epsilon: float | None,
+        delta: float | None,
+        top: int | None
+    ) -> None:
+        stored = {
+            "epsilon": (epsilon, self.sketch.epsilon),
+            "delta": (delta, self.sketch.delta),
+            "top": (top, self.heavy.k),
+        }
+        for name, (given, value) in stored.items():
+            if given is not None and given != value:
+                raise ValueError(
+                    f"Sketch '{self.path}' was built with {name}={value}, not {given}")
+
+    def __empty_like(self) -> tuple[CountMinSketch, SpaceSaving]:
+        return (
+            CountMinSketch(self.sketch.epsilon, self.sketch.delta, self.sketch.seed),
+            SpaceSaving(self.heavy.k)
+        )
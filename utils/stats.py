@@ -0,0 +1,120 @@
+# utils/stats.py
+
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from utils.metrics import CrawlMetrics
+
+
+class CrawlStats:
+    """
+    Stage timers and counters of a crawl.
+    Prints a progress line every `progress_every` seconds (0 disables it)
+    and produces a machine-readable report at the end.
+    Every measurement is also forwarded to `metrics`, if given, with
+    `labels` (e.g. the host of one of several crawled wikis).
+    """
+
+    def __init__(
+        self,
+        progress_every: float = 10.0,
+        out=sys.stderr,
+        metrics: CrawlMetrics | None = None,
+        labels: dict[str, str] | None = None
+    ):
+        self.progress_every = progress_every
+        self.metrics = metrics
+        self.labels = labels or {}
+        self.out = out
+        self.started = time.perf_counter()
+        self.last_progress = self.started
+
+        self.times: Counter = Counter()
+        self.calls: Counter = Counter()
+        self.counters: Counter = Counter()
+        self.gauges: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            spent = time.perf_counter() - start
+            self.times[name] += spent
+            self.calls[name] += 1
+            if self.metrics is not None:
+                self.metrics.stage_seconds.observe(spent, stage=name, **self.labels)
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+        if self.metrics is not None:
+            self.metrics.events.inc(value, event=name, **self.labels)
+
+    def status(self, code: int) -> None:
+        """Counts an HTTP response status."""
+        self.counters[f"http_{code}"] += 1
+        if self.metrics is not None:
+            self.metrics.http_responses.inc(status=str(code), **self.labels)
+
+    def gauge(self, name: str, value: float) -> None:
+        """Sets 'queue', 'visited' or 'vocabulary' size."""
+        self.gauges[name] = value
+        if self.metrics is not None:
+            self.metrics.gauge(name).set(value, **self.labels)
+
+    def tick(self) -> None:
+        """Prints the progress line if it is due."""
+
+        if not self.progress_every:
+            return
+
+        now = time.perf_counter()
+        if now - self.last_progress >= self.progress_every:
+            self.last_progress = now
+            print(self.progress_line(), file=self.out, flush=True)
+
+    def progress_line(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        pages = self.counters["pages"]
+        total = sum(self.times.values()) or 1.0
+        shares = " ".join(
+            f"{name} {100 * spent / total:.0f}%"
+            for name, spent in self.times.most_common()
+        )
+        return (
+            f"[{elapsed:7.1f}s] pages {pages} "
+            f"({pages / elapsed if elapsed else 0:.2f}/s), "
+            f"{self.counters['bytes'] / 2 ** 20:.1f} MB fetched | {shares}"
+        )
+
+    def report(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.times.values()) or 1.0
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "pages_per_s": round(self.counters["pages"] / elapsed, 3) if elapsed else 0.0,
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "stages": {
+                name: {
+                    "calls": self.calls[name],
+                    "total_s": round(spent, 4),
+                    "mean_ms": round(1000 * spent / self.calls[name], 3),
+                    "share": round(spent / total, 4),
+                }
+                for name, spent in self.times.most_common()
+            },
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def timed(stats: CrawlStats | None, name: str):
+    """Stage timer of `stats`, or a no-op when statistics are off."""
+    return stats.stage(name) if stats is not None else nullcontext()
@@ -3,9 +3,13 @@
 import json
 import re
 from collections import Counter
+from collections.abc import Iterable
 
+import numpy as np
 import pandas as pd
-from wordfreq import zipf_frequency
+
+from utils.count_store import CountStore, JsonCountStore
+from utils.lang_tables import get_language_table
 
 _WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
 
@@ -45,17 +49,22 @@ def __process_json_file(path: str) -> Counter:
         return counter
 
 
-def __collect_graph_data(lang: str = "en") -> pd.DataFrame:
-    result = []
-
-    with open("word-counts.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
-        for word, wiki_count in data.items():
-            rel = zipf_frequency(word, lang)
-            rel_count = rel if rel > 0 else 0
-            result.append((word, rel_count, round(wiki_count / 1000, 2)))
+def __collect_graph_data(
+    lang: str = "en",
+    store: CountStore | None = None
+) -> pd.DataFrame:
+    store = store or JsonCountStore()
+    data = dict(store.items())
+    if not data:
+        where = getattr(store, "path", type(store).__name__)
+        raise FileNotFoundError(f"No word counts stored in '{where}'")
 
-    return pd.DataFrame(result, columns=["word", "rel_freq", "wiki_freq"])
+    words = list(data)
+    return pd.DataFrame({
+        "word": words,
+        "rel_freq": get_language_table(lang).lookup(words),
+        "wiki_freq": [round(count / 1000, 2) for count in data.values()],
+    })
 
 
 def __sort_by_wiki_count(
@@ -88,33 +97,106 @@ def __sort_by_rel_count(
     )
 
 
-def article_analysis(count: int) -> pd.DataFrame:
+def article_analysis(
+    count: int,
+    lang: str = "en",
+    store: CountStore | None = None
+) -> pd.DataFrame:
     return (
-        __sort_by_wiki_count(__collect_graph_data())
+        __sort_by_wiki_count(__collect_graph_data(lang, store))
         .iloc[:count]
         .fillna(0)
         .reset_index(drop=True)
     )
 
 
-def language_analysis(count: int) -> pd.DataFrame:
+def language_analysis(
+    count: int,
+    lang: str = "en",
+    store: CountStore | None = None
+) -> pd.DataFrame:
     return (
-        __sort_by_rel_count(__collect_graph_data())
+        __sort_by_rel_count(__collect_graph_data(lang, store))
         .iloc[:count]
         .fillna(0)
         .reset_index(drop=True)
     )
 
 
-def update_wiki_dict(counts: Counter) -> None:
-    file_path = "word-counts.json"
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            stored_counts = Counter(json.load(f))
-    except (FileNotFoundError, IOError):
-        stored_counts = Counter()
+def lang_confidence_score(word_data: pd.DataFrame) -> float:
+    """
+    Percentage (0-100) of the wiki frequency mass covered by the language:
+    100 * sum(min(rel_freq, wiki_freq)) / sum(wiki_freq).
+    """
+
+    if word_data.empty:
+        return 0.0
+
+    matched_freq = word_data[["rel_freq", "wiki_freq"]].min(axis=1).sum()
+    total_possible = word_data["wiki_freq"].sum()
+
+    if total_possible <= 1e-11:
+        return 0.0
+
+    return float(100.0 * matched_freq / total_possible)
+
+
+def lang_confidence_scores(
+    ks: Iterable[int],
+    mode: str = "article",
+    data: pd.DataFrame | None = None,
+    lang: str = "en",
+    store: CountStore | None = None
+) -> dict[int, float]:
+    """
+    lang_confidence_score of the top k words for every k in `ks` at once.
+    Words are sorted once, by wiki frequency ('article') or by language
+    frequency ('language'), and every score is read from cumulative sums
+    of min(rel_freq, wiki_freq) and wiki_freq over the sorted arrays.
+    Without `data`, the word counts of `store` (default word-counts.json)
+    are compared against `lang`.
+    """
+
+    if mode == "article":
+        key = "wiki_freq"
+    elif mode == "language":
+        key = "rel_freq"
+    else:
+        raise ValueError(
+            "The only supported analysis modes are 'article' and 'language'")
+
+    if data is None:
+        data = __collect_graph_data(lang, store)
+
+    data = data.fillna(0)
+    order = np.argsort(-data[key].to_numpy(), kind="stable")
+    rel = data["rel_freq"].to_numpy(dtype=np.float64)[order]
+    wiki = data["wiki_freq"].to_numpy(dtype=np.float64)[order]
+
+    matched = np.cumsum(np.minimum(rel, wiki))
+    total = np.cumsum(wiki)
+
+    scores = {}
+    for k in ks:
+        n = min(k, len(order))
+        if n < 1 or total[n - 1] <= 1e-11:
+            scores[k] = 0.0
+        else:
+            scores[k] = float(100.0 * matched[n - 1] / total[n - 1])
+
+    return scores
+
+
+def update_wiki_dict(counts: Counter, store: CountStore | None = None) -> None:
+    """
+    Adds `counts` to the stored word counts, word-counts.json by default.
+    Negative counts subtract, words dropping to zero are removed.
+    The default store is written right away, `store` whenever it writes.
+    """
 
-    stored_counts.update(counts)
+    if store is not None:
+        store.update(counts)
+        return
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(dict(stored_counts), f, ensure_ascii=False, indent=2)
+    with JsonCountStore() as default_store:
+        default_store.update(counts)
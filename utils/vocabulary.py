@@ -0,0 +1,240 @@
+# utils/vocabulary.py
+
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+
+import numpy as np
+
+
+class Vocabulary:
+    """
+    Term -> dense integer ID map with a uint64 count per term.
+
+    No Python object is kept per term: terms are stored back to back in
+    one UTF-8 buffer with int64 offsets, counts in a growable NumPy array,
+    and the term index is an open-addressing table of 64-bit term hashes
+    and IDs in NumPy arrays. That's roughly 50 bytes per term instead of
+    the 150+ of a Counter entry. Lookups and count merges are done for
+    whole batches of terms at once.
+
+    Python's str hash is salted per process, so the index is rebuilt
+    when a saved vocabulary is loaded. IDs never change; terms whose count
+    drops to zero keep their ID and are left out of `items`.
+    """
+
+    __EMPTY = np.uint64(0)
+
+    # the index grows once more than 70% of its slots are taken
+    __MAX_LOAD = 0.7
+
+    def __init__(self, capacity: int = 1024):
+        self._blob = bytearray()
+        self._offsets = array("q", [0])
+        self._counts = np.zeros(max(capacity, 1), dtype=np.uint64)
+
+        slots = 1 << int(max(capacity, 1) / self.__MAX_LOAD).bit_length()
+        self._slot_hashes = np.zeros(slots, dtype=np.uint64)
+        self._slot_ids = np.zeros(slots, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __contains__(self, term: str) -> bool:
+        return self.ids([term], add=False)[0] >= 0
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Counts indexed by term ID (a view, valid until the next insert)."""
+        return self._counts[:len(self)]
+
+    def term(self, term_id: int) -> str:
+        start, end = self._offsets[term_id], self._offsets[term_id + 1]
+        return self._blob[start:end].decode("utf-8")
+
+    def terms(self) -> list[str]:
+        return [self.term(i) for i in range(len(self))]
+
+    def count(self, term: str) -> int:
+        term_id = self.ids([term], add=False)[0]
+        return int(self._counts[term_id]) if term_id >= 0 else 0
+
+    def ids(self, terms: Sequence[str], add: bool = True) -> np.ndarray:
+        """
+        IDs of `terms` as int64. Unknown terms get new IDs with `add`,
+        otherwise -1.
+        """
+
+        hashes = self.__hashes(terms)
+        found = self.__probe(terms, hashes)
+
+        missing = np.flatnonzero(found < 0) if add else []
+        if len(missing):
+            added: dict[str, int] = {}
+            first = []
+            for i in missing.tolist():
+                term_id = added.setdefault(terms[i], len(self) + len(added))
+                if term_id == len(self) + len(first):
+                    first.append(i)
+                found[i] = term_id
+
+            self.__append(list(added), hashes[first])
+
+        return found
+
+    def merge(self, ids: np.ndarray, values: np.ndarray) -> None:
+        """
+        Adds `values` to the counts of term `ids`, vectorized. IDs may
+        repeat and values may be negative; counts don't go below zero.
+        """
+
+        ids = np.asarray(ids, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64)
+        if not len(ids):
+            return
+
+        unique, inverse = np.unique(ids, return_inverse=True)
+        deltas = np.zeros(len(unique), dtype=np.int64)
+        np.add.at(deltas, inverse, values)
+
+        current = self._counts[unique].astype(np.int64)
+        self._counts[unique] = np.maximum(current + deltas, 0).astype(np.uint64)
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        """Merges per-page counts, term -> count."""
+
+        terms = list(counts)
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(terms))
+        self.merge(self.ids(terms), values)
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        """(term, count) of terms with a positive count, in ID order."""
+        for term_id in np.flatnonzero(self.counts).tolist():
+            yield self.term(term_id), int(self._counts[term_id])
+
+    def to_dict(self) -> dict[str, int]:
+        return dict(self.items())
+
+    @classmethod
+    def from_dict(cls, counts: Mapping[str, int]) -> "Vocabulary":
+        vocabulary = cls(capacity=len(counts))
+        vocabulary.update(counts)
+        return vocabulary
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path,
+            blob=np.frombuffer(bytes(self._blob), dtype=np.uint8),
+            offsets=np.array(self._offsets, dtype=np.int64),
+            counts=self.counts
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "Vocabulary":
+        with np.load(path) as stored:
+            blob = stored["blob"].tobytes()
+            offsets = stored["offsets"]
+            counts = stored["counts"]
+
+        vocabulary = cls(capacity=len(counts))
+        vocabulary._blob = bytearray(blob)
+        vocabulary._offsets = array("q", offsets.astype(np.int64).tobytes())
+        vocabulary._counts[:len(counts)] = counts
+
+        terms = vocabulary.terms()
+        vocabulary.__index(np.arange(len(terms)), vocabulary.__hashes(terms))
+        return vocabulary
+
+    # ========================
+    # Private helper methods
+    #   - hash index
+    # ========================
+
+    @staticmethod
+    def __hashes(terms: Sequence[str]) -> np.ndarray:
+        """Non-zero 64-bit hashes, 0 marks an empty slot."""
+        hashes = np.fromiter(
+            (hash(term) for term in terms), dtype=np.int64, count=len(terms)
+        ).view(np.uint64)
+        hashes[hashes == 0] = 1
+        return hashes
+
+    def __probe(self, terms: Sequence[str], hashes: np.ndarray) -> np.ndarray:
+        """Linear probing of all terms at once, -1 for unknown terms."""
+
+        mask = np.uint64(len(self._slot_hashes) - 1)
+        found = np.full(len(terms), -1, dtype=np.int64)
+        active = np.arange(len(terms))
+        slots = hashes & mask
+
+        while len(active):
+            slot_hashes = self._slot_hashes[slots]
+            empty = slot_hashes == self.__EMPTY
+            hits = np.flatnonzero(slot_hashes == hashes[active])
+
+            # equal hashes of different terms are possible, so hits are verified
+            matched = np.zeros(len(active), dtype=bool)
+            for i in hits.tolist():
+                term_id = int(self._slot_ids[slots[i]])
+                if self.term(term_id) == terms[active[i]]:
+                    found[active[i]] = term_id
+                    matched[i] = True
+
+            more = ~(empty | matched)
+            active = active[more]
+            slots = (slots[more] + np.uint64(1)) & mask
+
+        return found
+
+    def __append(self, terms: list[str], hashes: np.ndarray) -> None:
+        """Stores new terms, all at once, under the next IDs."""
+
+        start = len(self)
+        size = start + len(terms)
+
+        encoded = [term.encode("utf-8") for term in terms]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(terms))
+        offsets = len(self._blob) + np.cumsum(lengths)
+        self._blob += b"".join(encoded)
+        self._offsets.frombytes(offsets.tobytes())
+
+        if size > len(self._counts):
+            grown = np.zeros(max(size, 2 * len(self._counts)), dtype=np.uint64)
+            grown[:start] = self._counts[:start]
+            self._counts = grown
+
+        while size > self.__MAX_LOAD * len(self._slot_hashes):
+            self.__grow_index()
+
+        self.__index(np.arange(start, size), hashes)
+
+    def __index(self, ids: np.ndarray, hashes: np.ndarray) -> None:
+        """Puts `ids` into free slots; only free slots are ever written."""
+
+        mask = np.uint64(len(self._slot_hashes) - 1)
+        slots = hashes & mask
+        pending = np.arange(len(ids))
+
+        while len(pending):
+            # of several pending ids aiming at one free slot, the first wins
+            free = self._slot_hashes[slots[pending]] == self.__EMPTY
+            candidates = pending[free]
+            _, first = np.unique(slots[candidates], return_index=True)
+            winners = candidates[first]
+
+            self._slot_hashes[slots[winners]] = hashes[winners]
+            self._slot_ids[slots[winners]] = ids[winners]
+
+            pending = pending[~np.isin(pending, winners)]
+            slots[pending] = (slots[pending] + np.uint64(1)) & mask
+
+    def __grow_index(self) -> None:
+        """Doubles the table, re-placing stored hashes without rehashing terms."""
+
+        occupied = self._slot_hashes != self.__EMPTY
+        hashes = self._slot_hashes[occupied]
+        ids = self._slot_ids[occupied]
+
+        size = 2 * len(self._slot_hashes)
+        self._slot_hashes = np.zeros(size, dtype=np.uint64)
+        self._slot_ids = np.zeros(size, dtype=np.int32)
+        self.__index(ids, hashes)
@@ -0,0 +1,167 @@
+# wiki/archive.py
+
+import gzip
+import json
+import os
+import threading
+import time
+
+
+class PageArchive:
+    """
+    Append-only archive of raw article HTML.
+
+    Every page is stored as an independent compressed member appended to a
+    single data file, so the whole archive stays readable with standard
+    tools (e.g. `zcat` for gzip). A JSON index next to the data file maps
+    article URL to (offset, length, fetch time) for random access.
+
+    The index is rewritten only on flush; until then every written page
+    is also appended to a JSON Lines log of index records, so an archive
+    of a crawl that crashed or was interrupted can still be replayed.
+    Writes are serialized, so one archive can be shared by threads.
+    """
+
+    _COMPRESSIONS = ("gzip", "zstd")
+
+    def __init__(self, path: str, mode: str = "a", compression: str = "gzip"):
+        if mode not in ("a", "r"):
+            raise ValueError("Archive mode must be 'a' (append) or 'r' (read)")
+
+        if compression not in self._COMPRESSIONS:
+            raise ValueError(
+                f"Unsupported archive compression: {compression}")
+
+        self.path = path
+        self.index_path = f"{path}.idx.json"
+        self.log_path = f"{path}.idx.log"
+        self.mode = mode
+        self.index: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            compression = stored.get("compression", compression)
+            self.index = stored.get("pages", {})
+        elif mode == "r" and not os.path.exists(self.log_path):
+            raise FileNotFoundError(f"Archive index not found: {self.index_path}")
+
+        if os.path.exists(self.log_path):
+            self.__replay_log()
+
+        self.compression = compression
+        self._compressor, self._decompressor = self.__codec(compression)
+        self._file = open(path, "ab" if mode == "a" else "rb")
+        self._log = open(self.log_path, "a", encoding="utf-8") if mode == "a" else None
+
+    def write(self, url: str, html: str) -> None:
+        """Appends raw page HTML; a re-fetched URL points to its newest copy."""
+
+        if self.mode != "a":
+            raise IOError("Archive opened read-only")
+
+        data = self._compressor(html.encode("utf-8"))
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+            self.index[url] = [offset, len(data), round(time.time(), 3)]
+
+            # the page is recoverable once its record is in the log
+            self._log.write(
+                json.dumps([url, *self.index[url]], ensure_ascii=False) + "\n")
+            self._log.flush()
+
+    def read(self, url: str) -> str:
+        if url not in self.index:
+            raise KeyError(url)
+
+        # written pages are flushed right away
+        offset, length, _ = self.index[url]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+
+        return self._decompressor(data).decode("utf-8")
+
+    def urls(self) -> list[str]:
+        return list(self.index)
+
+    def flush(self) -> None:
+        """Persists the data file and the index, emptying the index log."""
+
+        if self.mode != "a":
+            return
+
+        with self._lock:
+            self._file.flush()
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"compression": self.compression, "pages": self.index},
+                    f,
+                    ensure_ascii=False
+                )
+            os.replace(tmp_path, self.index_path)
+            self._log.truncate(0)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+
+        self.flush()
+        self._file.close()
+        if self._log is not None:
+            self._log.close()
+            os.remove(self.log_path)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __replay_log(self) -> None:
+        """Adds index records logged after the last flush."""
+
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    url, offset, length, fetched = json.loads(line)
+                except ValueError:
+                    break   # record cut short by a crash
+                self.index[url] = [offset, length, fetched]
+
+    @staticmethod
+    def __codec(compression: str):
+        if compression == "gzip":
+            return gzip.compress, gzip.decompress
+
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ImportError(
+                "zstd archives require the 'zstandard' package"
+            ) from exc
+
+        return (
+            zstandard.ZstdCompressor().compress,
+            zstandard.ZstdDecompressor().decompress
+        )
+
+    # ========================
+    # support for java-style
+    # "try with resources"
+    # ========================
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __enter__(self):
+        return self
@@ -0,0 +1,227 @@
+# wiki/async_bulbapedia.py
+
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from importlib.util import find_spec
+
+import pandas as pd
+from bs4 import BeautifulSoup
+from requests.exceptions import RequestException
+
+from utils.stats import CrawlStats, timed
+from wiki.archive import PageArchive
+from wiki.bulbapedia import BulbapediaClient
+from wiki.client import AsyncWikiClient
+
+BACKENDS = ("aiohttp", "httpx", "requests")
+
+
+class AsyncBulbapediaClient(AsyncWikiClient):
+    """
+    Asyncio Bulbapedia client on aiohttp (a requirement of the project),
+    or on httpx or requests when aiohttp isn't installed or `backend`
+    picks one.
+
+    Pages are parsed and extracted by the same code as `BulbapediaClient`.
+    One connection pool of up to `max_connections` is shared by every
+    search, so hundreds of searches can be awaited together, e.g. with
+    asyncio.gather, without a thread per request. The requests backend
+    is the exception: it blocks a thread of a pool of `max_connections`
+    per request in flight, using the session of the parsing client.
+    """
+
+    def __init__(
+        self,
+        archive: PageArchive | None = None,
+        base_url: str = "https://bulbapedia.bulbagarden.net",
+        max_connections: int = 100,
+        timeout: float = 10,
+        backend: str | None = None
+    ):
+        if max_connections < 1:
+            raise ValueError(
+                f"Connection limit must be positive: {max_connections}")
+
+        self.backend = backend or self.__available_backend()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unsupported HTTP backend: {self.backend}")
+
+        # parsing helpers; its HTTP session is only opened by the requests backend
+        self.pages = BulbapediaClient(base_url=base_url, pool_size=max_connections)
+        self.archive = archive
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def stats(self) -> CrawlStats | None:
+        return self.pages.stats
+
+    @stats.setter
+    def stats(self, stats: CrawlStats | None) -> None:
+        self.pages.stats = stats
+
+    async def search(self, query: str) -> BeautifulSoup:
+        """
+        Searches Bulbapedia for a given query.
+        Returns BeautifulSoup object with page HTML.
+        """
+
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty")
+
+        url = self.pages.article_url(query)
+        with timed(self.stats, "network"):
+            html = await self._fetch(url, query)
+
+        return self.pages._parse(html, query)
+
+    async def close(self) -> None:
+        """Closes the connection pool and the raw page archive."""
+
+        if self._session is not None:
+            if self.backend == "aiohttp":
+                await self._session.close()
+            else:
+                await self._session.aclose()
+            self._session = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        self.pages.close()
+        if self.archive is not None:
+            self.archive.close()
+
+    def get_summary(self, soup: BeautifulSoup) -> str:
+        return self.pages.get_summary(soup)
+
+    def get_page_text(self, soup: BeautifulSoup) -> str:
+        return self.pages.get_page_text(soup)
+
+    def get_tables(
+        self,
+        soup: BeautifulSoup,
+        table_index: int = 0,
+        header: bool = True
+    ) -> pd.DataFrame:
+        return self.pages.get_tables(soup, table_index, header)
+
+    def get_links(self, soup: BeautifulSoup) -> list[str]:
+        return self.pages.get_links(soup)
+
+    def iter_links(self, soup: BeautifulSoup) -> Iterator[str]:
+        return self.pages.iter_links(soup)
+
+    def get_revision(self, soup: BeautifulSoup) -> int | None:
+        return self.pages.get_revision(soup)
+
+    def article_url(self, query: str) -> str:
+        return self.pages.article_url(query)
+
+    async def _fetch(self, url: str, query: str) -> str:
+        """
+        Downloads raw article HTML.
+        Every fetched page is appended to the archive sink, if configured.
+        """
+
+        try:
+            if self.backend == "aiohttp":
+                status, body = await self.__get_aiohttp(url)
+            elif self.backend == "httpx":
+                status, body = await self.__get_httpx(url)
+            else:
+                status, body = await self.__get_requests(url)
+        except Exception as exc:
+            if not self.__is_request_error(exc):
+                raise
+            raise ConnectionError(
+                f"Request to Bulbapedia failed: {exc}"
+            ) from exc
+
+        if self.stats is not None:
+            self.stats.status(status)
+
+        if status != 200:
+            raise LookupError(
+                f"Bulbapedia article not found for query: '{query}'"
+            )
+
+        if self.stats is not None:
+            self.stats.count("bytes", len(body))
+
+        html = body.decode("utf-8", errors="replace")
+        if self.archive is not None:
+            self.archive.write(url, html)
+
+        return html
+
+    # ========================
+    # Private helper methods
+    #   - HTTP backends
+    # ========================
+
+    @staticmethod
+    def __available_backend() -> str:
+        for backend in BACKENDS:
+            if find_spec(backend) is not None:
+                return backend
+
+        return "requests"
+
+    async def __get_aiohttp(self, url: str) -> tuple[int, bytes]:
+        import aiohttp
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": "WikiScrapper/AsyncBulbapediaClient"}
+            )
+
+        async with self._session.get(url) as response:
+            return response.status, await response.read()
+
+    async def __get_httpx(self, url: str) -> tuple[int, bytes]:
+        import httpx
+
+        if self._session is None:
+            self._session = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections),
+                timeout=self.timeout,
+                headers={"User-Agent": "WikiScrapper/AsyncBulbapediaClient"}
+            )
+
+        response = await self._session.get(url)
+        return response.status_code, response.content
+
+    async def __get_requests(self, url: str) -> tuple[int, bytes]:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_connections,
+                thread_name_prefix="AsyncBulbapediaClient"
+            )
+
+        response = await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            partial(self.pages.session.get, url, timeout=self.timeout)
+        )
+        return response.status_code, response.content
+
+    def __is_request_error(self, exc: Exception) -> bool:
+        if isinstance(exc, (OSError, TimeoutError, RequestException)):
+            return True
+
+        if self.backend == "aiohttp":
+            import aiohttp
+            return isinstance(exc, aiohttp.ClientError)
+
+        if self.backend == "httpx":
+            import httpx
+            return isinstance(exc, httpx.HTTPError)
+
+        return False
@@ -30,3 +30,46 @@ class WikiClient(ABC):
     @abstractmethod
     def close(self) -> None:
         pass
+
+
+class AsyncWikiClient(ABC):
+    """
+    Wiki client for asyncio code: pages are fetched with coroutines, so
+    many searches can be in flight on one event loop. Extraction from
+    downloaded pages is CPU-bound and stays synchronous.
+    """
+
+    @abstractmethod
+    def get_summary(self, soup: BeautifulSoup) -> str:
+        pass
+
+    @abstractmethod
+    def get_page_text(self, soup: BeautifulSoup) -> str:
+        pass
+
+    @abstractmethod
+    def get_tables(self, soup: BeautifulSoup) -> list[str]:
+        pass
+
+    @abstractmethod
+    def get_links(self, soup: BeautifulSoup) -> list[str]:
+        pass
+
+    @abstractmethod
+    async def search(self, phrase: str) -> BeautifulSoup:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+    # ========================
+    # support for
+    # "async with" blocks
+    # ========================
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def __aenter__(self):
+        return self
@@ -1,10 +1,77 @@
 # wiki/factory.py
 
+from wiki.archive import PageArchive
+from wiki.async_bulbapedia import AsyncBulbapediaClient
 from wiki.bulbapedia import *
+from wiki.mediawiki import MediaWikiClient
+from wiki.replay import ReplayClient
+from wiki.title_cache import DEFAULT_MISSING_TTL, TitleCache
 
 
-def get_wiki_client(wiki: str = "bulbapedia"):
-    if wiki == "bulbapedia":
-        return BulbapediaClient()
-    else:
+def get_wiki_client(
+    wiki: str = "bulbapedia",
+    archive: str | None = None,
+    replay: str | None = None,
+    asynchronous: bool = False,
+    title_cache: str | None = None,
+    missing_ttl: float = DEFAULT_MISSING_TTL,
+    rate_limit: float | None = None,
+    article_path: str = "/wiki/",
+    api_path: str = "/w/api.php",
+    skip_namespaces: list[str] | None = None
+):
+    """
+    Creates a wiki client.
+    `wiki` - "bulbapedia" or the base URL of any MediaWiki site
+    ("https://en.wikipedia.org"), with articles under `article_path`,
+    the API at `api_path` and links into `skip_namespaces` skipped,
+    see `MediaWikiClient`,
+    `archive` - path of a raw page archive written by every search,
+    `replay` - path of an archive to serve searches from, without network,
+    `asynchronous` - creates an asyncio client (AsyncWikiClient),
+    `title_cache` - path of a cache of missing articles (kept for
+    `missing_ttl` seconds) and redirects, consulted before any request,
+    `rate_limit` - maximal number of requests per second to the wiki.
+    """
+
+    if wiki != "bulbapedia" and not wiki.startswith(("http://", "https://")):
         raise ValueError("Wiki client not supported")
+
+    if asynchronous:
+        if wiki != "bulbapedia":
+            raise ValueError("Asynchronous clients only support Bulbapedia")
+        if replay:
+            raise ValueError("Replay is not supported by asynchronous clients")
+        if title_cache or rate_limit is not None:
+            raise ValueError(
+                "Title caches and rate limits are not supported by asynchronous clients")
+        return AsyncBulbapediaClient(
+            archive=PageArchive(archive) if archive else None
+        )
+
+    if replay:
+        if wiki == "bulbapedia":
+            return ReplayClient(replay)
+        return ReplayClient(
+            replay,
+            base_url=wiki,
+            name=None,
+            article_path=article_path,
+            skip_namespaces=skip_namespaces
+        )
+
+    archive = PageArchive(archive) if archive else None
+    cache = TitleCache(title_cache, missing_ttl) if title_cache else None
+
+    if wiki == "bulbapedia":
+        return BulbapediaClient(archive=archive, cache=cache, rate_limit=rate_limit)
+
+    return MediaWikiClient(
+        wiki,
+        archive=archive,
+        cache=cache,
+        article_path=article_path,
+        api_path=api_path,
+        skip_namespaces=skip_namespaces,
+        rate_limit=rate_limit
+    )
@@ -0,0 +1,771 @@
+# wiki/mediawiki.py
+
+import codecs
+import threading
+import time
+from abc import ABC
+from collections.abc import Iterator
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from re import sub, compile, escape, IGNORECASE
+from itertools import islice
+from sys import intern
+from urllib.parse import unquote, urlsplit
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup, Tag
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from utils.stats import CrawlStats, timed
+from wiki.archive import PageArchive
+from wiki.client import WikiClient
+from wiki.title_cache import TitleCache
+
+
+@dataclass
+class Cell:
+    value: str | None
+    merged: bool
+    merge_id: int | None
+
+
+class SummaryParser(HTMLParser):
+    """
+    Incremental parser of the first non-empty <p> of #mw-content-text,
+    the paragraph `MediaWikiClient.get_summary` returns.
+    Fed chunk by chunk; `done` is set once the paragraph is complete,
+    so the rest of the page never has to be read.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.content_found = False
+        self.done = False
+        self.parts: list[str] = []
+        self.canonical_url: str | None = None
+
+        self._div_depth = 0     # open <div>s inside #mw-content-text
+        self._in_paragraph = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+
+        if tag == "link":
+            attrs = dict(attrs)
+            if attrs.get("rel") == "canonical":
+                self.canonical_url = attrs.get("href")
+
+        elif tag == "div":
+            if self._div_depth:
+                self._div_depth += 1
+            elif dict(attrs).get("id") == "mw-content-text":
+                self.content_found = True
+                self._div_depth = 1
+
+        elif tag == "p" and self._div_depth:
+            self.__end_paragraph()
+            self._in_paragraph = True
+
+    def handle_endtag(self, tag):
+        if self.done or not self._div_depth:
+            return
+
+        if tag == "p":
+            self.__end_paragraph()
+        elif tag == "div":
+            self._div_depth -= 1
+            if not self._div_depth:
+                self.__end_paragraph()
+                self.done = True
+
+    def handle_data(self, data):
+        if self._in_paragraph and not self.done:
+            self.parts.append(data)
+
+    def __end_paragraph(self):
+        if self._in_paragraph:
+            self._in_paragraph = False
+            self.done = bool(self.parts)
+
+
+class MediaWikiClient(WikiClient, ABC):
+    """
+    Client of any MediaWiki site at `base_url`, with articles under
+    `article_path` ("/wiki/Title") and the API at `api_path`.
+
+    Links to other namespaces are skipped: any title with a colon, or,
+    when `skip_namespaces` is given, only titles prefixed by one of these
+    namespaces, so main-namespace titles with a colon are followed.
+    Every client has its own HTTP session, opened on first use and
+    pooling up to `pool_size` connections to its host, and with `rate_limit` sends at most that many
+    requests per second, whichever thread sends them.
+    """
+
+    _REVISION_RE = compile(r'"wgRevisionId"\s*:\s*(\d+)')
+
+    # titles per MediaWiki API query, the limit for anonymous clients
+    _API_BATCH = 50
+
+    # content of 'page does not exist' articles
+    _MISSING_PHRASES = (
+        "There is currently no text in this page",
+        "You can search for this page title"
+    )
+
+    def __init__(
+        self,
+        base_url: str,
+        archive: PageArchive | None = None,
+        cache: TitleCache | None = None,
+        article_path: str = "/wiki/",
+        api_path: str = "/w/api.php",
+        skip_namespaces: tuple[str, ...] | None = None,
+        name: str | None = None,
+        pool_size: int = 10,
+        rate_limit: float | None = None
+    ):
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError(f"Rate limit must be positive: {rate_limit}")
+
+        self.base_url = base_url.rstrip("/")
+        self.host = urlsplit(self.base_url).netloc.lower()
+        self.name = name or self.host
+        self.article_path = "/" + article_path.strip("/") + "/"
+        self.article_base = f"{self.base_url}{self.article_path}"
+        self.api_url = f"{self.base_url}/{api_path.lstrip('/')}"
+        self.skip_namespaces = (
+            None if skip_namespaces is None
+            else {self._canonical_title(ns) for ns in skip_namespaces}
+        )
+        self.archive = archive
+        self.cache = cache
+        self.stats: CrawlStats | None = None
+
+        # article URLs of this host, with or without "www."
+        host = escape(self.host.removeprefix("www."))
+        path = escape(self.article_path)
+        self._article_re = compile(
+            rf'^https?://(?:www\.)?{host}{path}(?P<title>[^#?\s]+)$', IGNORECASE
+        )
+
+        # article links: relative "/wiki/Title" or absolute URLs of this
+        # host, no queries or fragments
+        self._link_re = compile(
+            rf'^(?:(?i:https?://(?:www\.)?{host}))?{path}(?P<title>[^#?\s]+)$'
+        )
+
+        self._min_interval = 1 / rate_limit if rate_limit else 0.0
+        self._next_request = 0.0
+        self._throttle_lock = threading.Lock()
+
+        self.pool_size = pool_size
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session of this client; clients that never request don't open one."""
+
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                session.headers.update({
+                    "User-Agent": f"WikiScrapper/{type(self).__name__}"
+                })
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+
+        return self._session
+
+    def search(self, query: str) -> BeautifulSoup:
+        """
+        Searches the wiki for a given query.
+        Returns BeautifulSoup object with page HTML.
+        """
+
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty")
+
+        url = self.__build_article_url(query)
+        self.__check_known_missing(url, query)
+
+        try:
+            with timed(self.stats, "network"):
+                html = self._fetch(url, query)
+            soup = self._parse(html, query)
+        except LookupError:
+            self.__remember_missing(url)
+            raise
+
+        link = soup.find("link", rel="canonical", href=True)
+        self.__remember_redirect(url, link["href"] if link else None)
+        return soup
+
+    def close(self):
+        """Closes underlying HTTP session, the raw page archive and the title cache."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self.archive is not None:
+            self.archive.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def get_summary(self, soup: BeautifulSoup) -> str:
+        """Returns the first summary paragraphs of an article as plain text."""
+
+        content_div = soup.find("div", id="mw-content-text")
+        if not content_div:
+            return ""
+
+        # Get all <p> in div, ignoring empty and const tags
+        paragraphs = content_div.find_all("p", recursive=True)
+        summary_texts = []
+        for p in paragraphs:
+            text = p.get_text(strip=False)
+            if text:
+                summary_texts.append(text)
+
+            # End after first text block
+            if summary_texts:
+                break
+
+        return self._format_summary(" ".join(summary_texts))
+
+    def search_summary(self, query: str, chunk_size: int = 8192) -> str:
+        """
+        Returns the summary `get_summary(search(query))` would, streaming
+        the page and stopping the download once the first content
+        paragraph is complete. Time and bytes don't depend on the length
+        of the article. Pages are only archived whole, so with an archive
+        sink the full page is downloaded.
+        """
+
+        if self.archive is not None:
+            return self.get_summary(self.search(query))
+
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty")
+
+        url = self.__build_article_url(query)
+        self.__check_known_missing(url, query)
+
+        parser = SummaryParser()
+        try:
+            with timed(self.stats, "network"):
+                self._stream(url, query, parser, chunk_size)
+
+            if not parser.content_found or \
+                    any(phrase in parser.text for phrase in self._MISSING_PHRASES):
+                self.__query_not_found(query)
+        except LookupError:
+            self.__remember_missing(url)
+            raise
+
+        self.__remember_redirect(url, parser.canonical_url)
+        return self._format_summary(parser.text)
+
+    @staticmethod
+    def _format_summary(summary_text: str) -> str:
+        # Delete redundant whitespace characters
+        summary_text = sub(r'\s+([.,;:!?%)])', r'\1', summary_text)
+        summary_text = sub(r'([(\[¿¡])\s+', r'\1', summary_text)
+
+        return summary_text.replace(". ", ".\n").strip()
+
+    def _cleanup_df(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.dropna(axis=0, how="all")
+        df = df.dropna(axis=1, how="all")
+        return df.reset_index(drop=True)
+
+    def _collapse_ul_corner(grid: list[list[Cell]]) -> None:
+        ul = grid[0][0]
+        if not ul.merged:
+            return
+
+        mid = ul.merge_id
+        max_r = max(i for i, row in enumerate(grid) if
+                    any(c.merge_id == mid for c in row))
+        max_c = max(j for j in range(len(grid[0])) if
+                    any(row[j].merge_id == mid for row in grid))
+
+        # keep only bottom-right
+        for i in range(len(grid)):
+            for j in range(len(grid[0])):
+                if grid[i][j].merge_id == mid and (i, j) != (max_r, max_c):
+                    grid[i][j] = Cell(None, False, None)
+
+    def _drop_merged_axes(grid: list[list[Cell]]) -> list[list[Cell]]:
+        rows_to_keep = [
+            i for i, row in enumerate(grid)
+            if not all(c.merged for c in row if c.value is not None)
+        ]
+
+        cols_to_keep = [
+            j for j in range(len(grid[0]))
+            if not all(grid[i][j].merged for i in range(len(grid)) if
+                       grid[i][j].value is not None)
+        ]
+
+        return [
+            [grid[i][j] for j in cols_to_keep]
+            for i in rows_to_keep
+        ]
+
+    def _grid_to_df(grid: list[list[Cell]]) -> pd.DataFrame:
+        return pd.DataFrame([[c.value for c in row] for row in grid])
+
+    @staticmethod
+    def _expand_table(table: Tag) -> list[list[Cell]]:
+        grid: list[list[Cell]] = []
+        spans: dict[tuple[int, int], tuple[int, Cell]] = {}
+        merge_counter = 0
+
+        rows = table.find_all("tr")
+
+        for r_idx, row in enumerate(rows):
+            grid.append([])
+            c_idx = 0
+
+            while (r_idx, c_idx) in spans:
+                cell, rows_left = spans.pop((r_idx, c_idx))
+                grid[r_idx].append(cell)
+                if rows_left > 1:
+                    spans[(r_idx + 1, c_idx)] = (cell, rows_left - 1)
+                c_idx += 1
+
+            for tag in row.find_all(["td", "th"]):
+                rowspan = int(tag.get("rowspan", 1))
+                colspan = int(tag.get("colspan", 1))
+                text = tag.get_text(strip=True) or None
+
+                merged = rowspan > 1 or colspan > 1
+                merge_id = merge_counter if merged else None
+                if merged:
+                    merge_counter += 1
+
+                cell = Cell(text, merged, merge_id)
+
+                for _ in range(colspan):
+                    grid[r_idx].append(cell)
+                    if rowspan > 1:
+                        spans[(r_idx + 1, c_idx)] = (cell, rowspan - 1)
+                    c_idx += 1
+
+        max_cols = max(len(r) for r in grid)
+        for r in grid:
+            r.extend([Cell(None, False, None)] * (max_cols - len(r)))
+
+        return grid
+
+    def get_tables(
+        self,
+        soup: BeautifulSoup,
+        table_index: int = 0,
+        header: bool = True
+    ) -> pd.DataFrame:
+
+        content_div = soup.find("div", id="mw-content-text")
+        if not content_div:
+            raise LookupError("Content not found on the page.")
+
+        tables = [
+            t for t in content_div.find_all("table")
+            if not set(t.get("class", [])) & {"toc", "navbox"}
+        ]
+
+        if table_index >= len(tables):
+            raise IndexError(
+                f"Requested table index {table_index} out of range. Only {len(tables)} tables found."
+            )
+
+        grid = self._expand_table(tables[table_index])
+        if header:
+            MediaWikiClient._collapse_ul_corner(grid)
+            grid = MediaWikiClient._drop_merged_axes(grid)
+
+        df = MediaWikiClient._grid_to_df(grid)
+        df = df.dropna(axis=0, how="all").dropna(axis=1,
+                                                 how="all").reset_index(
+            drop=True)
+        df = MediaWikiClient._cleanup_df(df)
+
+        return df
+
+    def get_page_text(self, soup: BeautifulSoup) -> str:
+        """
+        Returns full page text as plain text, ignoring constant page elements
+        and removing embedded URLs and HTML tags.
+        """
+
+        content_div = soup.find("div", id="mw-content-text")
+        if not content_div:
+            return ""
+
+        # Remove constant elements: navboxes, infoboxes, tables of contents, and scripts/styles
+        for selector in ['table.navbox', 'table.infobox', 'div.toc', 'style',
+                         'script', 'table.metadata']:
+            for el in content_div.select(selector):
+                el.decompose()
+
+        # Remove embedded links but keep text
+        for a in content_div.find_all("a", recursive=True):
+            a.unwrap()  # keeps text, removes <a> tag
+
+        # Remove images, spans, references
+        for selector in ['sup', 'span', 'img', 'table']:
+            for el in content_div.select(selector):
+                el.decompose()
+
+        # Get all remaining text
+        text = content_div.get_text()
+
+        return text.lower()
+
+    def get_links(self, soup: BeautifulSoup) -> list[str]:
+        return list(self.iter_links(soup))
+
+    def iter_links(self, soup: BeautifulSoup) -> Iterator[str]:
+        """
+        Lazily yields article URLs linked from the page content.
+        Every href is checked by one combined pattern and converted to
+        the canonical title URL, so "/wiki/Mr._Mime", "/wiki/mr._Mime"
+        and the absolute URL yield one article.
+        """
+
+        content = soup.find("div", id="mw-content-text") or soup
+        seen: set[str] = set()
+
+        for a_tag in content.find_all("a", href=True):
+            match = self._link_re.match(a_tag["href"].strip())
+            if not match:
+                continue
+
+            key = self._canonical_title(match.group("title"))
+            if key in seen or key == "Main_Page" or self.__other_namespace(key):
+                continue
+
+            seen.add(key)
+            yield intern(f"{self.article_base}{key}")
+
+    @staticmethod
+    def _canonical_title(title: str) -> str:
+        """MediaWiki title key: decoded, underscored, first letter upper."""
+        title = unquote(title).replace(" ", "_")
+        return title[:1].upper() + title[1:]
+
+    def probe(self, phrases: list[str]) -> dict[str, bool]:
+        """
+        Checks which articles exist without downloading them.
+        Titles are resolved in batches through the MediaWiki API.
+        Returns phrase -> True if the article exists.
+        """
+
+        pages = self._query_pages(phrases)
+        return {phrase: page is not None for phrase, page in pages.items()}
+
+    def get_revisions(self, phrases: list[str]) -> dict[str, int | None]:
+        """
+        Returns phrase -> current revision ID of the article
+        (None for missing articles), without downloading them.
+        Redirects are followed, so an alias reports the revision of
+        its target article.
+        """
+
+        pages = self._query_pages(phrases, prop="revisions", rvprop="ids")
+        return {
+            phrase: page["revisions"][0]["revid"]
+            if page and page.get("revisions") else None
+            for phrase, page in pages.items()
+        }
+
+    def get_revision(self, soup: BeautifulSoup) -> int | None:
+        """Revision ID of a downloaded article, from the page config script."""
+
+        for script in soup.find_all("script"):
+            match = self._REVISION_RE.search(script.get_text())
+            if match:
+                return int(match.group(1))
+
+        return None
+
+    def article_url(self, query: str) -> str:
+        """
+        Canonical article URL of a phrase or an article URL, with the
+        title key of `iter_links` ("pokémon", "Pok%C3%A9mon" -> "Pokémon").
+        Aliases known to redirect are resolved to their target.
+        """
+        return self.__build_article_url(query)
+
+    def _query_pages(self, phrases: list[str], **params) -> dict[str, dict | None]:
+        """
+        Looks up `phrases` in batched MediaWiki API queries, following
+        redirects. Returns phrase -> API page record of the (target)
+        article, or None for missing articles.
+        """
+
+        titles = {phrase: self._title_of(phrase) for phrase in phrases}
+        unique = [
+            title for title in dict.fromkeys(titles.values())
+            if self.cache is None
+            or not self.cache.is_missing(self._canonical_title(title))
+        ]
+        found: dict[str, dict] = {}
+
+        for i in range(0, len(unique), self._API_BATCH):
+            batch = unique[i:i + self._API_BATCH]
+            result = self._api_query(
+                {"titles": "|".join(batch), "redirects": 1, **params})
+
+            # API answers with normalized titles ("Mr_Mime" -> "Mr Mime"),
+            # then redirect targets; several titles of a batch may end at one
+            aliases: dict[str, list[str]] = {}
+            for step in ("normalized", "redirects"):
+                for n in result.get(step, []):
+                    aliases.setdefault(n["to"], []).extend(
+                        [n["from"], *aliases.get(n["from"], [])])
+                    if step == "redirects" and self.cache is not None:
+                        self.cache.add_redirect(
+                            self._canonical_title(n["from"]),
+                            self._canonical_title(n["to"]))
+
+            for page in result.get("pages", {}).values():
+                if "missing" in page or "invalid" in page:
+                    continue
+                title = page["title"]
+                for source in [title, *aliases.get(title, [])]:
+                    found[source] = page
+
+            if self.cache is not None:
+                for title in batch:
+                    if title not in found:
+                        self.cache.add_missing(self._canonical_title(title))
+
+        return {phrase: found.get(title) for phrase, title in titles.items()}
+
+    def _title_of(self, phrase: str) -> str:
+        """Article title of a phrase or an article URL of this wiki."""
+
+        phrase = phrase.strip()
+        if self._article_re.match(phrase):
+            phrase = unquote(phrase.rsplit(self.article_path, 1)[-1])
+
+        return phrase.replace("_", " ")
+
+    def _api_query(self, params: dict) -> dict:
+        self._throttle()
+        try:
+            response = self.session.get(
+                self.api_url,
+                params={"action": "query", "format": "json", **params},
+                timeout=10
+            )
+            response.raise_for_status()
+        except RequestException as exc:
+            self.__request_failed(exc)
+
+        return response.json().get("query", {})
+
+    def _parse(self, html: str, query: str) -> BeautifulSoup:
+        """Parses article HTML, raising LookupError for missing articles."""
+
+        with timed(self.stats, "parse"):
+            soup = BeautifulSoup(html, "html.parser")
+            missing = self.__is_missing_article(soup)
+
+        if missing:
+            self.__query_not_found(query)
+
+        return soup
+
+    def _fetch(self, url: str, query: str) -> str:
+        """
+        Downloads raw article HTML.
+        Every fetched page is appended to the archive sink, if configured.
+        """
+
+        self._throttle()
+        try:
+            response = self.session.get(url, timeout=10)
+        except RequestException as exc:
+            self.__request_failed(exc)
+
+        if self.stats is not None:
+            self.stats.status(response.status_code)
+
+        if response.status_code != 200:
+            self.__query_not_found(query)
+
+        if self.stats is not None:
+            self.stats.count("bytes", len(response.content))
+
+        if self.archive is not None:
+            self.archive.write(url, response.text)
+
+        return response.text
+
+    def _stream(
+        self,
+        url: str,
+        query: str,
+        parser: HTMLParser,
+        chunk_size: int = 8192
+    ) -> None:
+        """
+        Feeds article HTML to `parser` chunk by chunk while downloading,
+        until the parser sets `done` or the page ends.
+        """
+
+        self._throttle()
+        try:
+            response = self.session.get(url, stream=True, timeout=10)
+        except RequestException as exc:
+            self.__request_failed(exc)
+
+        with response:
+            if self.stats is not None:
+                self.stats.status(response.status_code)
+
+            if response.status_code != 200:
+                self.__query_not_found(query)
+
+            decoder = codecs.getincrementaldecoder(
+                response.encoding or "utf-8")(errors="replace")
+            try:
+                for chunk in response.iter_content(chunk_size):
+                    if self.stats is not None:
+                        self.stats.count("bytes", len(chunk))
+                    parser.feed(decoder.decode(chunk))
+                    if parser.done:
+                        break
+            except RequestException as exc:
+                self.__request_failed(exc)
+
+    def _throttle(self) -> None:
+        """Waits for this host's next request slot under `rate_limit`."""
+
+        if not self._min_interval:
+            return
+
+        with self._throttle_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request)
+            self._next_request = slot + self._min_interval
+
+        if slot > now:
+            with timed(self.stats, "throttle"):
+                time.sleep(slot - now)
+
+    # ========================
+    # Private helper methods
+    #   - error handling
+    # ========================
+
+    def __build_article_url(self, query: str) -> str:
+        """
+        Converts query into an article URL of this wiki with the canonical
+        title. An article URL keeps its host.
+        """
+        query = query.strip()
+
+        match = self._article_re.match(query)
+        if match:
+            title = self._canonical_title(match.group("title"))
+            url = f"{query[:match.start('title')]}{title}"
+        else:
+            url = f"{self.article_base}{self._canonical_title(query)}"
+
+        if self.cache is None:
+            return url
+
+        title = self.__title_key(url)
+        canonical = self.cache.resolve(title)
+        return url if canonical == title else f"{self.article_base}{canonical}"
+
+    def __title_key(self, url: str) -> str:
+        return self._canonical_title(url.rsplit(self.article_path, 1)[-1])
+
+    def __other_namespace(self, title: str) -> bool:
+        if ":" not in title:
+            return False
+        if self.skip_namespaces is None:
+            return True
+        return self._canonical_title(title.split(":", 1)[0]) in self.skip_namespaces
+
+    def __is_missing_article(self, soup: BeautifulSoup) -> bool:
+        """
+        Detects MediaWiki 'page does not exist' content.
+        """
+        content = soup.find("div", id="mw-content-text")
+        if not content:
+            return True
+
+        if content.find(class_="noarticletext"):
+            return True
+
+        # the notice opens the content, the rest of the page needn't be read
+        head = " ".join(islice(content.stripped_strings, 20))
+        return any(phrase in head for phrase in self._MISSING_PHRASES)
+
+    # ========================
+    # Private helper methods
+    #   - title cache
+    # ========================
+
+    def __check_known_missing(self, url: str, query: str) -> None:
+        """Fails without any request if the article is a cached miss."""
+
+        if self.cache is not None and self.cache.is_missing(self.__title_key(url)):
+            if self.stats is not None:
+                self.stats.count("cached_misses")
+            self.__query_not_found(query)
+
+    def __remember_missing(self, url: str) -> None:
+        if self.cache is not None:
+            self.cache.add_missing(self.__title_key(url))
+
+    def __remember_redirect(self, url: str, canonical_url: str | None) -> None:
+        """
+        Maps a redirect alias to the title of the page served for it,
+        read from the page's <link rel="canonical">.
+        """
+
+        if self.cache is None or not canonical_url:
+            return
+
+        match = self._link_re.match(canonical_url.strip())
+        if match:
+            self.cache.add_redirect(
+                self.__title_key(url),
+                self._canonical_title(match.group("title"))
+            )
+
+    def __request_failed(self, exc: Exception):
+        raise ConnectionError(
+            f"Request to {self.name} failed: {exc}"
+        ) from exc
+
+    def __query_not_found(self, query: str):
+        raise LookupError(
+            f"{self.name} article not found for query: '{query}'"
+        )
+
+    # ========================
+    # support for java-style
+    # "try with resources"
+    # ========================
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __enter__(self):
+        return self
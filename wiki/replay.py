@@ -0,0 +1,61 @@
+# wiki/replay.py
+
+from wiki.archive import PageArchive
+from wiki.bulbapedia import BULBAPEDIA_URL
+from wiki.mediawiki import MediaWikiClient
+
+
+class ReplayClient(MediaWikiClient):
+    """
+    Wiki client serving `search` from a raw page archive of the wiki at
+    `base_url`, Bulbapedia by default.
+    No network requests are made, so re-processing a crawl with changed
+    cleaning or tokenization rules is purely local.
+    """
+
+    def __init__(
+        self,
+        archive_path: str,
+        base_url: str = BULBAPEDIA_URL,
+        name: str | None = "Bulbapedia",
+        article_path: str = "/wiki/",
+        skip_namespaces: list[str] | None = None
+    ):
+        super().__init__(
+            base_url,
+            article_path=article_path,
+            skip_namespaces=skip_namespaces,
+            name=name
+        )
+        self.replay = PageArchive(archive_path, mode="r")
+
+    def _fetch(self, url: str, query: str) -> str:
+        if url not in self.replay:
+            raise LookupError(
+                f"{self.name} article not found in archive for query: '{query}'"
+            )
+
+        html = self.replay.read(url)
+        if self.stats is not None:
+            self.stats.count("bytes", len(html))
+
+        return html
+
+    def search_summary(self, query: str, chunk_size: int = 8192) -> str:
+        """Archived pages are local, so they're read whole."""
+        return self.get_summary(self.search(query))
+
+    def probe(self, phrases: list[str]) -> dict[str, bool]:
+        """Only archived articles are known to exist when replaying."""
+        return {
+            phrase: self.article_url(phrase) in self.replay
+            for phrase in phrases
+        }
+
+    def get_revisions(self, phrases: list[str]) -> dict[str, int | None]:
+        """Revisions are unknown offline, so every archived page is re-read."""
+        return {phrase: None for phrase in phrases}
+
+    def close(self):
+        super().close()
+        self.replay.close()
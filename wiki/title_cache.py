@@ -0,0 +1,118 @@
+# wiki/title_cache.py
+
+import json
+import os
+import threading
+import time
+
+# missing articles may be created later, so misses are forgotten after a week
+DEFAULT_MISSING_TTL = 7 * 24 * 3600
+
+
+class TitleCache:
+    """
+    Persistent cache of article titles known to be missing and of
+    redirects from alias titles to their canonical title.
+
+    Titles are MediaWiki title keys ("Mr._Mime"). Misses expire after
+    `ttl` seconds, redirects are kept until overwritten. The cache is
+    loaded from `path` (JSON) if it exists and saved there on close;
+    without `path` it lives in memory only. It may be shared by threads.
+    """
+
+    def __init__(self, path: str | None = None, ttl: float = DEFAULT_MISSING_TTL):
+        if ttl < 0:
+            raise ValueError(f"Cache TTL can't be negative: {ttl}")
+
+        self.path = path
+        self.ttl = ttl
+        self.missing: dict[str, float] = {}    # title -> expiry time
+        self.redirects: dict[str, str] = {}    # alias -> canonical title
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            self.__load(path)
+
+    def is_missing(self, title: str) -> bool:
+        with self._lock:
+            expires = self.missing.get(title)
+            if expires is None:
+                return False
+
+            if expires <= time.time():
+                self.missing.pop(title, None)
+                return False
+
+            return True
+
+    def add_missing(self, title: str) -> None:
+        with self._lock:
+            self.missing[title] = time.time() + self.ttl
+
+    def add_redirect(self, alias: str, canonical: str) -> None:
+        if alias != canonical:
+            with self._lock:
+                self.redirects[alias] = canonical
+                self.missing.pop(canonical, None)
+
+    def resolve(self, title: str) -> str:
+        """Canonical title of `title`, following chained redirects."""
+
+        visited = {title}
+        with self._lock:
+            while title in self.redirects:
+                title = self.redirects[title]
+                if title in visited:    # redirect loop
+                    break
+                visited.add(title)
+
+        return title
+
+    def save(self) -> None:
+        """Writes the cache atomically, dropping expired misses."""
+
+        if not self.path:
+            return
+
+        now = time.time()
+        with self._lock:
+            data = {
+                "missing": {
+                    title: expires for title, expires in self.missing.items()
+                    if expires > now
+                },
+                "redirects": dict(self.redirects),
+            }
+
+        temp = f"{self.path}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp, self.path)
+
+    def close(self) -> None:
+        self.save()
+
+    def __len__(self) -> int:
+        return len(self.missing) + len(self.redirects)
+
+    # ========================
+    # Private helper methods
+    # ========================
+
+    def __load(self, path: str) -> None:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.missing = data.get("missing", {})
+        self.redirects = data.get("redirects", {})
+
+    # ========================
+    # support for java-style
+    # "try with resources"
+    # ========================
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __enter__(self):
+        return self
@@ -1,44 +1,163 @@
 # wikiscrapper.py
 
+from contextlib import nullcontext
+
 from config.args_parser import parse_args
 from config.run_modes import *
+from utils.coordinator import get_coordinator
+from utils.count_store import get_count_store
+from utils.profiling import profiled
+from wiki.bulbapedia import BULBAPEDIA_URL
 
 
-def main() -> None:
-    args = parse_args()
+def run_mode(args, store=None) -> None:
+    missing_ttl = args.missing_ttl * 24 * 3600
 
     if args.summary:
-        handle_summary(phrase=args.summary)
+        handle_summary(
+            phrase=args.summary,
+            archive=args.archive,
+            replay=args.replay,
+            title_cache=args.title_cache,
+            missing_ttl=missing_ttl
+        )
 
     elif args.table:
         handle_table(
             phrase=args.table,
             number=args.number,
-            header=args.first_row_is_header
+            header=args.first_row_is_header,
+            archive=args.archive,
+            replay=args.replay,
+            title_cache=args.title_cache,
+            missing_ttl=missing_ttl
         )
 
     elif args.count_words:
-        handle_count_words(args.count_words)
+        handle_count_words(
+            args.count_words,
+            archive=args.archive,
+            replay=args.replay,
+            title_cache=args.title_cache,
+            missing_ttl=missing_ttl,
+            store=store
+        )
 
     elif args.auto_count_words:
         handle_auto_count(
             phrase=args.auto_count_words,
             depth=args.depth,
-            wait=args.wait
+            wait=args.wait,
+            archive=args.archive,
+            replay=args.replay,
+            title_cache=args.title_cache,
+            missing_ttl=missing_ttl,
+            frontier=args.frontier,
+            max_pages=args.max_pages,
+            min_yield=args.min_yield,
+            title_penalties=args.title_penalty,
+            probe=args.probe,
+            link_graph=args.link_graph,
+            stats_path=args.stats,
+            metrics_port=args.metrics_port,
+            pages_out=args.pages_out,
+            pages_top=args.pages_top,
+            doc_term=args.doc_term_matrix,
+            store=store,
+            dedup=args.dedup,
+            near_duplicates=args.near_duplicates,
+            rate_limit=args.rate_limit,
+            article_path=args.article_path,
+            api_path=args.api_path,
+            skip_namespaces=args.skip_namespace
+        )
+
+    elif args.crawl_worker:
+        handle_crawl_worker(
+            phrase=args.crawl_worker,
+            depth=args.depth,
+            wait=args.wait,
+            coordinator=store,
+            archive=args.archive,
+            replay=args.replay,
+            title_cache=args.title_cache,
+            missing_ttl=missing_ttl,
+            max_pages=args.max_pages,
+            stats_path=args.stats
+        )
+
+    elif args.batch:
+        handle_batch(
+            path=args.batch,
+            mode=args.batch_mode,
+            output=args.output,
+            workers=args.workers,
+            number=args.number,
+            header=args.first_row_is_header,
+            table_format=args.table_format,
+            archive=args.archive,
+            replay=args.replay,
+            title_cache=args.title_cache,
+            missing_ttl=missing_ttl,
+            store=store
+        )
+
+    elif args.recrawl:
+        handle_recrawl(
+            link_graph=args.recrawl,
+            wait=args.wait,
+            archive=args.archive,
+            replay=args.replay,
+            title_cache=args.title_cache,
+            missing_ttl=missing_ttl,
+            store=store
         )
 
     elif args.analyze_relative_word_frequency:
         handle_analysis(
             mode=args.mode,
             count=args.count,
-            chart=args.chart
+            chart=args.chart,
+            chart_format=args.chart_format,
+            workers=args.workers,
+            langs=args.lang,
+            store=store
         )
 
     else:
         print("No valid arguments provided")
         exit(1)
 
-    print("All output has been generated from Bulbapedia Wiki at:\n https://bulbapedia.bulbagarden.net")
+
+def main() -> None:
+    args = parse_args()
+
+    if args.profile:
+        profiler = profiled(
+            args.profile,
+            memory=args.profile_memory,
+            top=args.profile_top
+        )
+    else:
+        profiler = nullcontext()
+
+    if args.coordinator:
+        store = get_coordinator(args.coordinator, args.lease_timeout)
+    else:
+        store = get_count_store(
+            args.count_store,
+            epsilon=args.sketch_error,
+            delta=args.sketch_delta,
+            top=args.sketch_top
+        )
+
+    with profiler, store:
+        run_mode(args, store)
+
+    wikis = wiki_urls(args.auto_count_words) if args.auto_count_words else [BULBAPEDIA_URL]
+    print(f"All output has been generated from the wiki{'s' * (len(wikis) > 1)} at:")
+    for url in wikis:
+        print(f" {url}")
     exit(0)
 
 